@@ -2,24 +2,32 @@
 from __future__ import annotations
 
 import json
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, Tuple
+from typing import Iterable, List, Optional, Sequence, Tuple
 
+from connectors.base import FileBackedConnector
 from connectors.registry import load_default_connectors
 from domain import models, serialization
+from domain.templates import ResolvedCatalog
 from infrastructure.audit_logger import AuditLogger
 from infrastructure.catalog_repository import CatalogRepository
 from infrastructure.credential_store import Credential, CredentialStore
+from infrastructure.inventory_store import InventoryStore
+from infrastructure.job_store import JobStore
+from sync.circuit import CircuitBreaker
+from sync.metrics import MetricsRegistry
 from sync.preview import PreviewRuleEngine
 from sync.orchestrator import SyncOrchestrator
+from sync.reconcile import ReconcileQueue
+from .paths import BASE_DIR, DATA_DIR, RUNTIME_DIR, STORE_CONFIG
 
 
-BASE_DIR = Path(__file__).resolve().parents[1]
-DATA_DIR = BASE_DIR / "data"
+def load_store_config(path: Path) -> Tuple[models.Store, Iterable[models.Item]]:
+    return _parse_store_config(json.loads(path.read_text(encoding="utf-8")))
 
 
-def _load_store_config(path: Path) -> Tuple[models.Store, Iterable[models.Item]]:
-    payload = json.loads(path.read_text(encoding="utf-8"))
+def _parse_store_config(payload: dict) -> Tuple[models.Store, Iterable[models.Item]]:
     store_data = payload["store"]
     store = models.Store(
         id=store_data["id"],
@@ -54,23 +62,141 @@ def _ensure_credentials(store: models.Store, credential_store: CredentialStore)
             credential_store.save(cred_id, Credential(username=username, password=password))
 
 
-def build_orchestrator() -> Tuple[SyncOrchestrator, models.Store, Iterable[models.Item]]:
-    store, items = _load_store_config(DATA_DIR / "sample_store.json")
-    catalog = CatalogRepository(BASE_DIR / "runtime" / "catalog.db")
-    credentials = CredentialStore(BASE_DIR / "runtime" / "credentials.json")
-    _ensure_credentials(store, credentials)
-    audit = AuditLogger(BASE_DIR / "runtime" / "audit.log")
-    rules = PreviewRuleEngine(DATA_DIR / "rules" / "preview.rules.json")
-    connectors = load_default_connectors(BASE_DIR)
-    for binding in store.bindings:
-        connector = connectors.get(binding.platform)
-        if connector:
-            connector.register_credentials(binding.shop_id, credentials.load(binding.cred_ref).username)
-    orchestrator = SyncOrchestrator(
+@dataclass(slots=True)
+class Fleet:
+    stores: List[Tuple[models.Store, Iterable[models.Item]]] = field(default_factory=list)
+    templates: List[models.CatalogTemplate] = field(default_factory=list)
+    links: List[models.StoreOverrides] = field(default_factory=list)
+
+
+def load_fleet(path: Path) -> Fleet:
+    """Loads every store of a fleet.
+
+    ``path`` is either a directory of store configs, a file whose ``stores``
+    key lists store configs, or a single store config. A fleet file may also
+    define franchise ``templates``; a store that names one (``"template"``)
+    lists only its ``overrides``, ``extra_items`` and ``removed`` item ids and
+    its menu is the resolved template view rather than a copy.
+    """
+
+    if path.is_dir():
+        return Fleet(stores=[load_store_config(config) for config in sorted(path.glob("*.json"))])
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if "stores" not in payload:
+        return Fleet(stores=[load_store_config(path)])
+    fleet = Fleet(templates=[serialization.load_template(entry) for entry in payload.get("templates", [])])
+    templates = {template.id: template for template in fleet.templates}
+    for entry in payload["stores"]:
+        template_id = entry.get("template")
+        if template_id is None:
+            fleet.stores.append(_parse_store_config(entry))
+            continue
+        store, _ = _parse_store_config({**entry, "items": []})
+        overrides = serialization.load_overrides({**entry, "store_id": store.id, "template_id": template_id})
+        fleet.links.append(overrides)
+        fleet.stores.append((store, ResolvedCatalog(templates[template_id], overrides)))
+    return fleet
+
+
+def _build(
+    stores: Sequence[models.Store],
+    audit_path: Path,
+    session_ttl: float,
+    snapshot_ttl: float,
+    breaker: Optional[CircuitBreaker] = None,
+    reconciler: Optional[ReconcileQueue] = None,
+) -> SyncOrchestrator:
+    catalog = CatalogRepository(RUNTIME_DIR / "catalog.db")
+    credentials = CredentialStore(RUNTIME_DIR / "credentials.json")
+    for store in stores:
+        _ensure_credentials(store, credentials)
+    audit = AuditLogger(audit_path)
+    rules = PreviewRuleEngine(DATA_DIR / "rules" / "preview.rules.json", image_root=BASE_DIR)
+    bindings = [binding for store in stores for binding in store.bindings]
+
+    def register(platform: models.Platform, connector: FileBackedConnector) -> None:
+        for binding in bindings:
+            if binding.platform == platform:
+                connector.register_credentials(binding.shop_id, credentials.load(binding.cred_ref).username)
+
+    # Connectors (and their selector maps) are only built when a command first needs a platform.
+    connectors = load_default_connectors(
+        BASE_DIR,
+        platforms=[binding.platform for binding in bindings],
+        on_build=register,
+    )
+    return SyncOrchestrator(
         catalog=catalog,
         credential_store=credentials,
         audit_logger=audit,
         rule_engine=rules,
         connectors=connectors,
+        session_ttl=session_ttl,
+        metrics=MetricsRegistry(),
+        snapshot_ttl=snapshot_ttl,
+        breaker=breaker,
+        reconciler=reconciler,
     )
+
+
+def build_orchestrator(
+    session_ttl: float = 0.0,
+    snapshot_ttl: float = 0.0,
+    fleet: Optional[Fleet] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    reconciler: Optional[ReconcileQueue] = None,
+) -> Tuple[SyncOrchestrator, models.Store, Iterable[models.Item]]:
+    store, items = load_store_config(STORE_CONFIG)
+    fleet = fleet or Fleet()
+    stores = [store, *(other for other, _ in fleet.stores)]
+    orchestrator = _build(stores, RUNTIME_DIR / "audit.log", session_ttl, snapshot_ttl, breaker, reconciler)
+    # Only the parent seeds templates and links; shard workers share the same catalog database.
+    seed_fleet(orchestrator.catalog, fleet)
     return orchestrator, store, items
+
+
+def seed_fleet(catalog: CatalogRepository, fleet: Fleet) -> None:
+    """Registers the fleet file's templates and links the first time they are seen.
+
+    From then on the catalog is the source of truth: ``template`` rollouts and
+    saved store edits survive a restart, and linked stores are synced from the
+    catalog's view instead of the file's.
+    """
+
+    for template in fleet.templates:
+        if catalog.load_template(template.id) is None:
+            catalog.save_template(template)
+    for overrides in fleet.links:
+        if catalog.load_overrides(overrides.store_id) is None:
+            catalog.link_store(overrides)
+    for index, (store, items) in enumerate(fleet.stores):
+        if not isinstance(items, ResolvedCatalog):
+            continue
+        linked = catalog.load_overrides(store.id)
+        template = catalog.load_template(linked.template_id) if linked is not None else None
+        if template is not None:
+            fleet.stores[index] = (store, ResolvedCatalog(template, linked))
+
+
+def build_shard_orchestrator(
+    shard: int,
+    fleet: Sequence[models.Store] = (),
+    session_ttl: float = 0.0,
+    snapshot_ttl: float = 0.0,
+    breaker: Optional[CircuitBreaker] = None,
+) -> SyncOrchestrator:
+    """Orchestrator owned by one sync worker process (see ``sync.sharding``).
+
+    Each shard writes its own audit segment, ``runtime/audit/shard-<n>.log``.
+    """
+
+    store, _ = load_store_config(STORE_CONFIG)
+    return _build([store, *fleet], RUNTIME_DIR / "audit" / f"shard-{shard}.log", session_ttl, snapshot_ttl, breaker)
+
+
+def build_job_store() -> JobStore:
+    return JobStore(RUNTIME_DIR / "jobs.db")
+
+
+def build_inventory_store() -> InventoryStore:
+    return InventoryStore(RUNTIME_DIR / "inventory.db")
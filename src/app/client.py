@@ -0,0 +1,48 @@
+"""Thin client for a running console daemon."""
+from __future__ import annotations
+
+import http.client
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+ENDPOINT_FILE = "daemon.json"
+
+
+class DaemonUnavailable(Exception):
+    pass
+
+
+class DaemonClient:
+    def __init__(self, host: str, port: int, timeout: float = 300.0) -> None:
+        self.host = host
+        self.port = port
+        self._timeout = timeout
+
+    @classmethod
+    def discover(cls, runtime_dir: Path) -> Optional["DaemonClient"]:
+        """Returns a client for the advertised daemon, or ``None`` when none is running."""
+
+        try:
+            data = json.loads((runtime_dir / ENDPOINT_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return cls(data["host"], int(data["port"]))
+
+    def call(self, command: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self._timeout)
+        try:
+            try:
+                conn.connect()
+            except OSError as exc:
+                # Only a refused/failed connect means "no daemon"; later errors must not trigger a local re-run.
+                raise DaemonUnavailable(str(exc)) from exc
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            conn.request("POST", f"/commands/{command}", body=body, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            data = json.loads(response.read() or b"{}")
+        finally:
+            conn.close()
+        if response.status != 200:
+            raise RuntimeError(data.get("error", f"daemon returned HTTP {response.status}"))
+        return data
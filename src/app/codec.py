@@ -0,0 +1,74 @@
+"""JSON codec for console command responses shared by the daemon and its clients."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from domain import models, serialization
+from sync import diff
+from sync.normalize import NormalizationReport, PriceAdjustment
+from sync.outcome import SyncOutcome
+from sync.preview import ValidationIssue
+
+
+def dump_report(report: Optional[NormalizationReport]) -> Optional[Dict[str, Any]]:
+    if report is None:
+        return None
+    return {"platform": report.platform.value, "adjustments": [asdict(a) for a in report.adjustments]}
+
+
+def load_report(data: Optional[Dict[str, Any]]) -> Optional[NormalizationReport]:
+    if data is None:
+        return None
+    return NormalizationReport(
+        platform=models.Platform(data["platform"]),
+        adjustments=[PriceAdjustment(**a) for a in data["adjustments"]],
+    )
+
+
+def dump_outcome(outcome: SyncOutcome) -> Dict[str, Any]:
+    return {
+        "platform": outcome.platform.value,
+        "applied": outcome.applied,
+        "summary": asdict(outcome.summary),
+        "result": serialization.dump_apply_result(outcome.result),
+        "validation_issues": [asdict(issue) for issue in outcome.validation_issues],
+        "normalization": dump_report(outcome.normalization),
+        "timings": dict(outcome.timings),
+    }
+
+
+def load_outcome(data: Dict[str, Any]) -> SyncOutcome:
+    summary = data["summary"]
+    return SyncOutcome(
+        platform=models.Platform(data["platform"]),
+        applied=data["applied"],
+        summary=diff.DiffSummary(
+            updated=list(summary["updated"]),
+            price_changed=[tuple(entry) for entry in summary["price_changed"]],  # type: ignore[misc]
+            availability_changed=[tuple(entry) for entry in summary["availability_changed"]],  # type: ignore[misc]
+        ),
+        result=serialization.load_apply_result(data["result"]),
+        validation_issues=[ValidationIssue(**issue) for issue in data["validation_issues"]],
+        normalization=load_report(data.get("normalization")),
+        timings=dict(data.get("timings", {})),
+    )
+
+
+def load_previews(
+    data: Dict[str, Any]
+) -> Dict[models.Platform, Tuple[NormalizationReport, List[ValidationIssue]]]:
+    previews: Dict[models.Platform, Tuple[NormalizationReport, List[ValidationIssue]]] = {}
+    for entry in data["previews"]:
+        report = load_report(entry["report"])
+        assert report is not None
+        previews[report.platform] = (report, [ValidationIssue(**issue) for issue in entry["issues"]])
+    return previews
+
+
+def load_results(data: Dict[str, Any]) -> List[models.ApplyResult]:
+    return [serialization.load_apply_result(result) for result in data["results"]]
+
+
+def load_jobs(data: Dict[str, Any]) -> List[models.ScheduledJob]:
+    return [serialization.load_job(job) for job in data.get("jobs", [])]
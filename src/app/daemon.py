@@ -0,0 +1,118 @@
+"""Long-running console daemon that keeps a warm orchestrator behind a localhost API."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .client import ENDPOINT_FILE
+from .service import CommandService
+
+
+class DaemonServer:
+    """Serves ``CommandService`` on localhost and advertises itself in ``runtime/daemon.json``."""
+
+    def __init__(self, service: CommandService, runtime_dir: Path, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._service = service
+        self._endpoint = runtime_dir / ENDPOINT_FILE
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(service))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        host, port = self._httpd.server_address[:2]
+        return str(host), int(port)
+
+    def _advertise(self) -> None:
+        host, port = self.address
+        self._endpoint.parent.mkdir(parents=True, exist_ok=True)
+        self._endpoint.write_text(json.dumps({"host": host, "port": port, "pid": os.getpid()}), encoding="utf-8")
+
+    def start(self) -> "DaemonServer":
+        self._advertise()
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="console-daemon", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._advertise()
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._withdraw()
+            self._httpd.server_close()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._withdraw()
+
+    def _withdraw(self) -> None:
+        try:
+            data = json.loads(self._endpoint.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("pid") == os.getpid() and data.get("port") == self.address[1]:
+            self._endpoint.unlink(missing_ok=True)
+
+
+def _make_handler(service: CommandService) -> type:
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path == "/health":
+                self._reply(200, {"status": "ok"})
+            elif self.path == "/metrics":
+                data = (service.metrics.render() if service.metrics is not None else "").encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            else:
+                self._reply(404, {"error": f"No route for GET {self.path}"})
+
+        def do_POST(self) -> None:  # noqa: N802 - http.server naming
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            parts = [part for part in self.path.split("/") if part]
+            if len(parts) != 2 or parts[0] != "commands":
+                self._reply(404, {"error": f"No route for POST {self.path}"})
+                return
+            command = parts[1]
+            if not service.handles(command):
+                self._reply(404, {"error": f"Unknown command {command}"})
+                return
+            try:
+                payload = json.loads(raw) if raw else {}
+            except ValueError as exc:
+                self._reply(400, {"error": f"Invalid JSON payload: {exc}"})
+                return
+            if not isinstance(payload, dict):
+                self._reply(400, {"error": "Payload must be a JSON object"})
+                return
+            try:
+                self._reply(200, service.execute(command, payload))
+            except Exception as exc:  # report failures to the client instead of dropping the connection
+                self._reply(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    return _Handler
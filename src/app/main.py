@@ -1,103 +1,518 @@
 """Command line entrypoint emulating the integrated operations console."""
 from __future__ import annotations
 
-import argparse
-from datetime import datetime, time
-from typing import List
+import sys
+import time
 
-from domain import models
-from sync.orchestrator import SyncOutcome
-from .bootstrap import build_orchestrator
+_STARTED_AT = time.perf_counter()
+_MODULES_AT_START = len(sys.modules)
+
+import argparse  # noqa: E402 - the timer above must start before any other import
+from pathlib import Path  # noqa: E402
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple  # noqa: E402
+
+from .paths import RUNTIME_DIR, STORE_CONFIG  # noqa: E402
+from .startup import StartupProfile  # noqa: E402
+
+# Subsystems are imported inside the commands that use them so that e.g. a
+# thin-client ``pause`` never loads connectors, SQLite or the rule engine.
+if TYPE_CHECKING:
+    from domain import models
+    from sync.normalize import NormalizationReport
+    from sync.outcome import SyncOutcome
+    from sync.preview import ValidationIssue
+    from .service import CommandService
 
 
 class ConsolePrinter:
     def sync_outcome(self, outcomes: List[SyncOutcome]) -> None:
         for outcome in outcomes:
             print(f"[{outcome.platform.value}] 적용 성공 여부: {outcome.result.success}")
+            if outcome.normalization and outcome.normalization.adjustments:
+                print(f"  - 자동 보정: {len(outcome.normalization.adjustments)}건")
             if outcome.validation_issues:
                 print("  - 사전 검증 실패:")
                 for issue in outcome.validation_issues:
                     print(f"    • {issue.item_id} - {issue.field}: {issue.message}")
             print(f"  - 가격 변경: {outcome.summary.price_changed}")
             print(f"  - 품절 변경: {outcome.summary.availability_changed}")
+            if outcome.timings:
+                stages = ", ".join(f"{stage} {seconds * 1000:.1f}ms" for stage, seconds in outcome.timings.items())
+                print(f"  - 단계별 소요: {stages}")
             if outcome.result.errors:
                 print("  - 오류:")
                 for error in outcome.result.errors:
                     print(f"    • {error}")
 
+    def preview(self, previews: Dict[models.Platform, Tuple[NormalizationReport, List[ValidationIssue]]]) -> None:
+        for platform, (report, issues) in previews.items():
+            print(f"[{platform.value}] 자동 보정 {len(report.adjustments)}건, 남은 검증 오류 {len(issues)}건")
+            for adjustment in report.adjustments:
+                print(f"    • {adjustment.item_id} - {adjustment.field}: {adjustment.before} → {adjustment.after}")
+            for issue in issues:
+                print(f"    ! {issue.item_id} - {issue.field}: {issue.message}")
+
     def pause_result(self, results: List[models.ApplyResult]) -> None:
         for result in results:
-            status = "성공" if result.success else "실패"
+            status = "건너뜀(변경 없음)" if result.skipped else ("성공" if result.success else "실패")
             print(f"- {status}: {result.message}")
+        skipped = sum(1 for result in results if result.skipped)
+        if skipped:
+            print(f"  이미 요청한 상태인 플랫폼 {skipped}곳은 쓰기를 생략했습니다.")
+
+    def scheduled(self, jobs: List[models.ScheduledJob]) -> None:
+        for job in jobs:
+            target = job.platform.value if job.platform else "전체"
+            items = f" ({', '.join(job.item_ids)})" if job.item_ids else ""
+            print(f"- 예약됨 [{target}] {job.action.value}{items} @ {job.due_at.isoformat()} (id={job.id})")
+
+
+def _build_service(args: argparse.Namespace, **options: Any) -> "CommandService":
+    """Bootstraps the orchestrator, the primary store and any ``--fleet`` stores into a service."""
+
+    from functools import partial
+
+    from .bootstrap import (
+        build_inventory_store,
+        build_job_store,
+        build_orchestrator,
+        build_shard_orchestrator,
+        load_fleet,
+    )
+    from .service import CommandService
+
+    from sync.circuit import CircuitBreaker
+    from sync.reconcile import ReconcileQueue
+
+    fleet = load_fleet(args.fleet) if args.fleet else None
+    fleet_stores = [store for store, _ in fleet.stores] if fleet else []
+    session_ttl = getattr(args, "session_ttl", 0.0)
+    snapshot_ttl = getattr(args, "snapshot_ttl", 0.0)
+    breaker = CircuitBreaker(
+        threshold=getattr(args, "breaker_threshold", 3),
+        cooldown=getattr(args, "breaker_cooldown", 120.0),
+        per_selector_version=getattr(args, "breaker_per_selector", False),
+    )
+    reconcile_delay = getattr(args, "reconcile_delay", 0.0)
+    orchestrator, store, items = build_orchestrator(
+        session_ttl=session_ttl,
+        snapshot_ttl=snapshot_ttl,
+        fleet=fleet,
+        breaker=breaker,
+        reconciler=ReconcileQueue(settle_delay=reconcile_delay) if reconcile_delay > 0 else None,
+    )
+    service = CommandService(
+        orchestrator,
+        store,
+        items,
+        jobs=build_job_store(),
+        inventory=build_inventory_store(),
+        metrics_file=args.metrics_file,
+        shard_factory=partial(
+            build_shard_orchestrator,
+            fleet=fleet_stores,
+            session_ttl=session_ttl,
+            snapshot_ttl=snapshot_ttl,
+            breaker=breaker,
+        ),
+        **options,
+    )
+    if fleet is not None:
+        service.add_stores(fleet.stores)
+    return service
+
+
+def _execute(args: argparse.Namespace, command: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Sends the command to a running daemon, or runs it in-process when there is none."""
+
+    profile: StartupProfile = args.profile
+    if not args.local:
+        from .client import DaemonClient, DaemonUnavailable
+
+        client = DaemonClient.discover(RUNTIME_DIR)
+        if client is not None:
+            try:
+                response = client.call(command, payload)
+                profile.mark("daemon call")
+                return response
+            except DaemonUnavailable:
+                pass
+    service = getattr(args, "local_service", None)
+    if service is None:
+        from sync.metrics import observed_stage
+
+        profile.mark("imports (local)")
+        with observed_stage("load"):
+            # Kept on ``args`` so commands that call ``_execute`` repeatedly bootstrap only once.
+            service = args.local_service = _build_service(args)
+        profile.mark("bootstrap")
+    response = service.execute(command, payload)
+    profile.mark("execute")
+    return response
 
 
 def cmd_sync(args: argparse.Namespace) -> None:
-    orchestrator, store, items = build_orchestrator()
-    printer = ConsolePrinter()
-    outcomes = orchestrator.sync_store(store, items, actor="console")
-    printer.sync_outcome(outcomes)
+    response = _execute(
+        args, "sync", {"actor": "console", "auto_fix": args.auto_fix, "workers": args.workers, "changed_only": args.changed}
+    )
+    from .codec import load_outcome
+
+    by_store: Dict[str, List[Dict[str, Any]]] = {}
+    for outcome in response["outcomes"]:
+        by_store.setdefault(outcome.get("store_id", ""), []).append(outcome)
+    for store_id, outcomes in by_store.items():
+        if len(by_store) > 1:
+            print(f"== 매장 {store_id} ==")
+        ConsolePrinter().sync_outcome([load_outcome(outcome) for outcome in outcomes])
+    if args.changed and not by_store:
+        print("마지막 동기화 이후 변경된 매장이 없습니다.")
+    for entry in response.get("dead_letters", []):
+        print(f"- 재시도 중단: 매장 {entry['store_id']} ({entry['attempts']}회 실패, 다음 변경 시 다시 시도): {entry['error']}")
+    for shard in response.get("shards", []):
+        print(f"- 워커 {shard['shard']} (pid {shard['pid']}): 매장 {shard['stores']}곳, {shard['elapsed']:.2f}초")
+
+
+def cmd_preview(args: argparse.Namespace) -> None:
+    response = _execute(args, "preview", {})
+    from .codec import load_previews
+
+    ConsolePrinter().preview(load_previews(response))
 
 
 def cmd_pause(args: argparse.Namespace) -> None:
-    orchestrator, store, _ = build_orchestrator()
+    payload = {"actor": "console", "paused": args.action == "pause", "reason": args.reason, "until": args.until}
+    response = _execute(args, "pause", payload)
+    from .codec import load_jobs, load_results
+
     printer = ConsolePrinter()
-    command = models.PauseCommand(
-        store_id=store.id,
-        paused=args.action == "pause",
-        reason=args.reason,
-        until=datetime.fromisoformat(args.until) if args.until else None,
-    )
-    results = orchestrator.toggle_pause(store, command, actor="console")
-    printer.pause_result(results)
+    printer.pause_result(load_results(response))
+    printer.scheduled(load_jobs(response))
 
 
 def cmd_hours(args: argparse.Namespace) -> None:
-    orchestrator, store, _ = build_orchestrator()
-    printer = ConsolePrinter()
-    hours = [
-        models.OperatingHours(
-            store_id=store.id,
-            dow=i,
-            open=time.fromisoformat(args.open_time),
-            close=time.fromisoformat(args.close_time),
-            break_times=[],
-            holiday=False,
-        )
-        for i in range(1, 8)
-    ]
-    command = models.HoursCommand(store_id=store.id, hours=hours)
-    results = orchestrator.update_hours(store, command, actor="console")
-    printer.pause_result(results)
+    payload = {"actor": "console", "open": args.open_time, "close": args.close_time}
+    response = _execute(args, "hours", payload)
+    from .codec import load_results
+
+    ConsolePrinter().pause_result(load_results(response))
+
+
+def cmd_soldout(args: argparse.Namespace) -> None:
+    payload = {"actor": "console", "item_ids": args.item_ids, "sold_out": args.command == "soldout"}
+    response = _execute(args, "soldout", payload)
+    from .codec import load_outcome
+
+    ConsolePrinter().sync_outcome([load_outcome(outcome) for outcome in response["outcomes"]])
+
+
+_JOB_ACTIONS = {"pause": "PAUSE", "resume": "RESUME", "soldout": "SOLD_OUT", "restock": "RESTOCK"}
+
+
+def cmd_schedule(args: argparse.Namespace) -> None:
+    if args.action in ("soldout", "restock") and not args.item_ids:
+        raise SystemExit("품절/재입고 예약에는 메뉴 ID가 필요합니다")
+    payload = {
+        "action": _JOB_ACTIONS[args.action],
+        "at": args.at,
+        "platform": args.platform,
+        "item_ids": args.item_ids,
+        "reason": args.reason,
+    }
+    response = _execute(args, "schedule", payload)
+    from .codec import load_jobs
+
+    ConsolePrinter().scheduled(load_jobs(response))
+
+
+def _timed_lines(fd: int, timeout: float) -> Iterator[Optional[str]]:
+    """Yields lines read from ``fd``, and None whenever nothing arrived for ``timeout`` seconds."""
+
+    import os
+    import select
+
+    pending = b""
+    while True:
+        ready, _, _ = select.select([fd], [], [], timeout)
+        if not ready:
+            yield None
+            continue
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            break
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8", errors="replace")
+    if pending:
+        yield pending.decode("utf-8", errors="replace")
+
+
+def cmd_stock(args: argparse.Namespace) -> None:
+    import json
+
+    stream = sys.stdin.buffer if args.source == "-" else open(args.source, "rb")
+    accepted = transitions = skipped = 0
+    sold_out: Dict[str, List[str]] = {}
+
+    def send(events: List[Dict[str, Any]]) -> None:
+        nonlocal accepted, transitions
+        response = _execute(args, "stock", {"events": events, "store_id": args.store})
+        accepted += response["accepted"]
+        transitions += response["transitions"]
+        sold_out.update(response["sold_out"])
+
+    with stream:
+        batch: List[Dict[str, Any]] = []
+        # Quiet periods flush what has arrived, so `tail -f` never holds back a sold-out.
+        for number, line in enumerate(_timed_lines(stream.fileno(), args.flush_after), start=1):
+            if line is None:
+                if batch:
+                    send(batch)
+                    batch = []
+                continue
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                event = None
+            if not isinstance(event, dict) or "item_id" not in event:
+                skipped += 1
+                print(f"잘못된 재고 이벤트 건너뜀 ({number}번째 줄): {line.strip()[:80]}", file=sys.stderr)
+                continue
+            batch.append(event)
+            if len(batch) >= args.batch:
+                send(batch)
+                batch = []
+        if batch:
+            send(batch)
+    print(f"재고 이벤트 {accepted}건 처리, 품절/재입고 전환 {transitions}건" + (f", 잘못된 줄 {skipped}건 건너뜀" if skipped else ""))
+    for store_id, item_ids in sold_out.items():
+        print(f"- [{store_id}] 품절: {', '.join(item_ids) or '없음'}")
+
+
+def cmd_run_jobs(args: argparse.Namespace) -> None:
+    response = _execute(args, "run_jobs", {})
+    from .codec import load_results
+
+    print(f"실행된 예약 작업 묶음: {len(response['fired'])}건")
+    ConsolePrinter().pause_result(load_results(response))
+
+
+def cmd_template(args: argparse.Namespace) -> None:
+    import json
+
+    payload = json.loads(Path(args.source).read_text(encoding="utf-8"))
+    response = _execute(args, "template", {"template": payload.get("template", payload), "actor": "console"})
+    from .codec import load_outcome
+
+    print(
+        f"템플릿 {response['template_id']}: 변경 메뉴 {len(response['changed_items'])}개, "
+        f"고유 카탈로그 {response['groups']}개 (diff {response['diffs']}회), 반영 매장 {len(response['results'])}곳"
+    )
+    for entry in response["results"]:
+        outcomes = [load_outcome(outcome) for outcome in entry["outcomes"]]
+        failed = [outcome.platform.value for outcome in outcomes if not outcome.applied]
+        status = f"실패 {', '.join(failed)}" if failed else "성공"
+        print(f"- 매장 {entry['store_id']}: 플랫폼 {len(outcomes)}곳 {status}")
+
+
+def cmd_breakers(args: argparse.Namespace) -> None:
+    response = _execute(args, "breakers", {"reset": args.reset, "platform": args.platform})
+    if not response["enabled"]:
+        print("서킷 브레이커가 비활성화되어 있습니다.")
+        return
+    if args.reset:
+        print(f"초기화한 브레이커: {response['reset']}개")
+    print(f"기준: 심각도 High 연속 {response['threshold']}회 실패 시 차단, {response['cooldown']:.0f}초 후 시험 호출")
+    labels = {"closed": "정상", "open": "차단", "half_open": "시험 호출 대기"}
+    for breaker in response["breakers"]:
+        version = f" (셀렉터 {breaker['selector_version']})" if breaker["selector_version"] else ""
+        last = f", 최근 오류 {breaker['last_code']}" if breaker["last_code"] else ""
+        print(f"- [{breaker['platform']}]{version} {labels[breaker['state']]}: 연속 실패 {breaker['failures']}회{last}")
+    if not response["breakers"]:
+        print("- 기록된 플랫폼 호출이 없습니다.")
+
+
+def cmd_reconcile(args: argparse.Namespace) -> None:
+    response = _execute(args, "reconcile", {"now": args.now})
+    if not response["enabled"]:
+        print("반영 확인이 꺼져 있습니다. serve --reconcile-delay 로 실행한 데몬에서만 동작합니다.")
+        return
+    for result in response["results"]:
+        target = f"[{result['platform']}] {result['shop_id']}"
+        if result["error"] and not result["requeued"]:
+            print(f"{target} 반영 불일치 {len(result['mismatches'])}건, 재확인 중단: {result['error']}")
+        elif result["error"]:
+            print(f"{target} 확인 보류 (다시 대기열에 추가): {result['error']}")
+        elif result["mismatches"]:
+            print(f"{target} 반영 불일치 {len(result['mismatches'])}건, 잠시 후 다시 확인")
+        else:
+            print(f"{target} 항목 {result['checked']}개 반영 확인")
+        for mismatch in result["mismatches"]:
+            print(f"    • {mismatch['item_id']} - {mismatch['field']}: 기대 {mismatch['expected']!r}, 포털 {mismatch['actual']!r}")
+    if not response["results"]:
+        print("확인 시점이 된 매장이 없습니다.")
+    print(f"대기 중인 확인: 매장 {response['pending']}곳")
+
+
+def cmd_serve(args: argparse.Namespace) -> None:
+    import signal
+
+    from .bootstrap import load_store_config
+    from .daemon import DaemonServer
+
+    service = _build_service(
+        args,
+        store_config=STORE_CONFIG,
+        loader=load_store_config,
+        stock_window=args.stock_window,
+        priority_lanes=True,
+        lane_max_skips=args.lane_max_skips,
+    )
+    server = DaemonServer(service, RUNTIME_DIR, port=args.port)
+    service.start()
+    args.profile.mark("bootstrap")
+    args.profile.report()
+    host, port = server.address
+    pending = len(service.scheduler) if service.scheduler is not None else 0
+    print(f"데몬 실행 중: http://{host}:{port} (예약 작업 {pending}건 대기, Ctrl+C로 종료)")
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="배달앱 통합관리 콘솔 (시뮬레이터)")
+    parser.add_argument("--local", action="store_true", help="실행 중인 데몬이 있어도 현재 프로세스에서 직접 실행")
+    parser.add_argument("--startup-profile", action="store_true", help="import/부트스트랩 단계별 소요 시간을 stderr로 출력")
+    parser.add_argument(
+        "--profile",
+        dest="profile_mode",
+        choices=["cpu", "mem"],
+        help="명령을 cProfile(cpu) 또는 tracemalloc(mem)으로 프로파일링해 runtime/profiles/에 보고서 저장 (항상 직접 실행)",
+    )
+    parser.add_argument("--metrics-file", type=Path, help="명령 실행 후 Prometheus 텍스트 형식 지표를 기록할 파일 (직접 실행/데몬)")
+    parser.add_argument("--fleet", type=Path, help="추가로 관리할 매장 설정 (매장 JSON 디렉터리 또는 stores/templates 목록 파일, 직접 실행/데몬)")
     sub = parser.add_subparsers(dest="command")
 
     sync_parser = sub.add_parser("sync", help="통합 카탈로그를 3사에 동기화")
+    sync_parser.add_argument("--auto-fix", action="store_true", help="플랫폼 가격 단위에 맞게 가격/추가금 자동 보정 후 반영")
+    sync_parser.add_argument("--workers", type=int, default=1, help="매장을 N개 프로세스에 나눠 동기화 (매장 ID 해시 기준)")
+    sync_parser.add_argument("--changed", action="store_true", help="마지막 변경분 동기화 이후 카탈로그가 바뀐 매장/메뉴만 동기화")
     sync_parser.set_defaults(func=cmd_sync)
 
+    preview_parser = sub.add_parser("preview", help="플랫폼별 자동 보정 내역과 검증 결과 미리보기")
+    preview_parser.set_defaults(func=cmd_preview)
+
     pause_parser = sub.add_parser("pause", help="영업 상태를 일시중지 또는 해제")
     pause_parser.add_argument("action", choices=["pause", "resume"], help="pause=중지, resume=해제")
     pause_parser.add_argument("--reason", default="자동화 유지보수", help="중지 사유")
     pause_parser.add_argument("--until", help="재개 예정 시각(ISO8601)")
     pause_parser.set_defaults(func=cmd_pause)
 
+    for name, help_text in (("soldout", "지정 메뉴를 전 플랫폼에 즉시 품절 처리"), ("restock", "지정 메뉴의 품절을 전 플랫폼에서 즉시 해제")):
+        soldout_parser = sub.add_parser(name, help=help_text)
+        soldout_parser.add_argument("item_ids", nargs="+", help="메뉴 ID")
+        soldout_parser.set_defaults(func=cmd_soldout)
+
     hours_parser = sub.add_parser("hours", help="영업 시간을 일괄 설정")
     hours_parser.add_argument("open_time", help="오픈 시간(HH:MM)")
     hours_parser.add_argument("close_time", help="마감 시간(HH:MM)")
     hours_parser.set_defaults(func=cmd_hours)
 
+    schedule_parser = sub.add_parser("schedule", help="영업 재개/중지, 품절/재입고를 지정 시각에 예약")
+    schedule_parser.add_argument("action", choices=list(_JOB_ACTIONS), help="예약할 작업")
+    schedule_parser.add_argument("item_ids", nargs="*", help="품절/재입고 대상 메뉴 ID")
+    schedule_parser.add_argument("--at", required=True, help="실행 시각(ISO8601)")
+    schedule_parser.add_argument("--platform", help="특정 플랫폼만 대상으로 지정")
+    schedule_parser.add_argument("--reason", help="중지 사유")
+    schedule_parser.set_defaults(func=cmd_schedule)
+
+    stock_parser = sub.add_parser("stock", help="재고 증감 이벤트(JSONL)를 반영하고 소진 메뉴를 자동 품절 처리")
+    stock_parser.add_argument("source", nargs="?", default="-", help="JSONL 파일 경로 (-=표준입력)")
+    stock_parser.add_argument("--store", help="store_id가 없는 이벤트에 적용할 매장")
+    stock_parser.add_argument("--batch", type=int, default=500, help="한 번에 전송할 이벤트 수")
+    stock_parser.add_argument("--flush-after", type=float, default=1.0, help="새 이벤트가 이 시간(초) 동안 없으면 모인 이벤트를 바로 전송")
+    stock_parser.set_defaults(func=cmd_stock)
+
+    run_jobs_parser = sub.add_parser("run-jobs", help="실행 시각이 지난 예약 작업을 즉시 처리 (cron 용)")
+    run_jobs_parser.set_defaults(func=cmd_run_jobs)
+
+    template_parser = sub.add_parser("template", help="프랜차이즈 템플릿 메뉴 변경을 연결된 전 매장에 반영")
+    template_parser.add_argument("source", help="템플릿 JSON 파일 ({id, name, items})")
+    template_parser.set_defaults(func=cmd_template)
+
+    breakers_parser = sub.add_parser("breakers", help="플랫폼별 서킷 브레이커 상태 조회/초기화")
+    breakers_parser.add_argument("--reset", action="store_true", help="차단 상태를 즉시 해제")
+    breakers_parser.add_argument("--platform", choices=["BAEMIN", "YOGIYO", "CEATS"], help="초기화할 플랫폼 (기본: 전체)")
+    breakers_parser.set_defaults(func=cmd_breakers)
+
+    reconcile_parser = sub.add_parser("reconcile", help="반영한 변경이 포털에 실제로 적용됐는지 확인")
+    reconcile_parser.add_argument("--now", action="store_true", help="대기 시간이 지나지 않은 확인도 즉시 실행")
+    reconcile_parser.set_defaults(func=cmd_reconcile)
+
+    serve_parser = sub.add_parser("serve", help="오케스트레이터를 상주시키는 데몬 실행 (localhost HTTP)")
+    serve_parser.add_argument("--port", type=int, default=0, help="수신 포트 (0=자동 할당)")
+    serve_parser.add_argument("--session-ttl", type=float, default=600.0, help="포털 세션 재사용 시간(초)")
+    serve_parser.add_argument(
+        "--snapshot-ttl",
+        "--state-ttl",
+        dest="snapshot_ttl",
+        type=float,
+        default=60.0,
+        help="포털 메뉴/영업 상태 스냅샷 캐시 유지 시간(초). 버전 표식이 바뀌면 즉시 다시 읽음",
+    )
+    serve_parser.add_argument("--stock-window", type=float, default=2.0, help="자동 품절 변경을 모아 보내는 간격(초)")
+    serve_parser.add_argument("--breaker-threshold", type=int, default=3, help="플랫폼을 차단하기까지의 심각도 High 연속 실패 횟수")
+    serve_parser.add_argument("--breaker-cooldown", type=float, default=120.0, help="차단 후 시험 호출까지 대기 시간(초)")
+    serve_parser.add_argument("--breaker-per-selector", action="store_true", help="셀렉터 버전별로 브레이커를 따로 운용")
+    serve_parser.add_argument(
+        "--reconcile-delay",
+        type=float,
+        default=30.0,
+        help="반영 후 포털을 다시 읽어 확인하기까지 대기 시간(초). 같은 매장의 확인은 한 번의 조회로 묶음, 0이면 끔",
+    )
+    serve_parser.add_argument(
+        "--lane-max-skips",
+        type=int,
+        default=8,
+        help="긴급 작업(영업 중지/품절)에 밀린 대량 동기화 청크가 이 횟수만큼 양보하면 먼저 실행",
+    )
+    serve_parser.set_defaults(func=cmd_serve)
+
     return parser
 
 
 def main(argv: List[str] | None = None) -> None:
+    profile = StartupProfile(enabled=False, started_at=_STARTED_AT, modules_at_start=_MODULES_AT_START)
+    profile.mark("imports (cli)")
     parser = build_parser()
     args = parser.parse_args(argv)
     if not hasattr(args, "func"):
         parser.print_help()
         return
-    args.func(args)
+    profile.enabled = args.startup_profile
+    profile.mark("parse args")
+    args.profile = profile
+    if args.profile_mode:
+        # Profiling only sees this process, so never hand the command to a daemon.
+        args.local = True
+    try:
+        if args.profile_mode:
+            from .profiling import profiled
+
+            with profiled(args.profile_mode, RUNTIME_DIR / "profiles", args.command):
+                args.func(args)
+        else:
+            args.func(args)
+    finally:
+        if args.func is not cmd_serve:
+            profile.mark("output")
+            profile.report()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,9 @@
+"""Filesystem locations shared by the CLI, bootstrap and daemon."""
+from __future__ import annotations
+
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DATA_DIR = BASE_DIR / "data"
+RUNTIME_DIR = BASE_DIR / "runtime"
+STORE_CONFIG = DATA_DIR / "sample_store.json"
@@ -0,0 +1,152 @@
+"""Opt-in CPU (cProfile) and memory (tracemalloc) profiling for ``--profile``."""
+from __future__ import annotations
+
+import io
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from sync.metrics import add_stage_observer, remove_stage_observer
+
+TOP_SITES = 10
+
+
+@dataclass(slots=True)
+class StageMemory:
+    stage: str
+    calls: int = 0
+    peak: int = 0
+    net: int = 0
+    sites: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class _Frame:
+    stage: str
+    before: tracemalloc.Snapshot
+    # Highest traced memory seen by this stage before the peak counter was last reset.
+    peak: int = 0
+
+
+class MemoryStageObserver:
+    """Tracks peak memory and the top allocation sites of every pipeline stage.
+
+    Each stage compares a tracemalloc snapshot taken on entry with one taken on
+    exit; repeated stages (e.g. ``fetch`` once per platform) are aggregated.
+    The peak counter is reset when a stage starts, so the enclosing stage's
+    peak so far is saved on its frame first, and a finished stage hands its
+    peak back to the enclosing one.
+    """
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, StageMemory] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> List[_Frame]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def enter(self, stage: str) -> None:
+        stack = self._stack()
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        stack.append(_Frame(stage, _snapshot()))
+
+    def exit(self, stage: str) -> None:
+        stack = self._stack()
+        if not stack or stack[-1].stage != stage:
+            return
+        current = stack.pop()
+        peak = max(current.peak, tracemalloc.get_traced_memory()[1])
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, peak)
+        diff = _snapshot().compare_to(current.before, "lineno")
+        with self._lock:
+            entry = self.stages.setdefault(stage, StageMemory(stage))
+            entry.calls += 1
+            entry.peak = max(entry.peak, peak)
+            entry.net += sum(stat.size_diff for stat in diff)
+            for stat in diff[:TOP_SITES]:
+                frame = stat.traceback[0]
+                site = f"{frame.filename}:{frame.lineno}"
+                entry.sites[site] = entry.sites.get(site, 0) + stat.size_diff
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+
+def _report_path(out_dir: Path, command: str, suffix: str) -> Path:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return out_dir / f"{command}-{datetime.now():%Y%m%d-%H%M%S}.{suffix}"
+
+
+@contextmanager
+def cpu_profile(out_dir: Path, command: str, limit: int = 40) -> Iterator[None]:
+    """Runs the block under cProfile; writes raw ``.prof`` stats and a cumulative-time report."""
+
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        raw = _report_path(out_dir, command, "prof")
+        profiler.dump_stats(raw)
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(limit)
+        report = raw.with_suffix(".cpu.txt")
+        report.write_text(text.getvalue(), encoding="utf-8")
+        print(f"[profile] CPU 프로파일: {report} (원본 {raw.name})", file=sys.stderr)
+
+
+@contextmanager
+def memory_profile(out_dir: Path, command: str, frames: int = 1) -> Iterator[None]:
+    """Runs the block under tracemalloc and reports overall and per-stage memory use."""
+
+    observer = MemoryStageObserver()
+    tracemalloc.start(frames)
+    add_stage_observer(observer)
+    try:
+        yield
+    finally:
+        remove_stage_observer(observer)
+        _, peak = tracemalloc.get_traced_memory()
+        top = _snapshot().statistics("lineno")[:TOP_SITES]
+        tracemalloc.stop()
+        lines = [f"command: {command}", f"peak: {peak / 1024:.1f} KiB", "", "top allocation sites (retained):"]
+        lines += [f"  {stat.size / 1024:10.1f} KiB  {stat.traceback[0].filename}:{stat.traceback[0].lineno}" for stat in top]
+        for entry in observer.stages.values():
+            lines += [
+                "",
+                f"[{entry.stage}] calls={entry.calls} peak={entry.peak / 1024:.1f} KiB net={entry.net / 1024:+.1f} KiB",
+            ]
+            ranked = sorted(entry.sites.items(), key=lambda pair: abs(pair[1]), reverse=True)[:TOP_SITES]
+            lines += [f"  {size / 1024:+10.1f} KiB  {site}" for site, size in ranked]
+        report = _report_path(out_dir, command, "mem.txt")
+        report.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        print(f"[profile] 메모리 프로파일: {report} (최대 {peak / 1024:.1f} KiB)", file=sys.stderr)
+
+
+@contextmanager
+def profiled(mode: str, out_dir: Path, command: str) -> Iterator[None]:
+    if mode == "cpu":
+        with cpu_profile(out_dir, command):
+            yield
+    elif mode == "mem":
+        with memory_profile(out_dir, command):
+            yield
+    else:
+        raise ValueError(f"Unknown profile mode {mode}")
@@ -0,0 +1,443 @@
+"""Console command execution shared by the in-process CLI path and the daemon."""
+from __future__ import annotations
+
+import dataclasses
+import threading
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict
+from datetime import datetime, time
+from pathlib import Path
+from typing import Any, Callable, Collection, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from domain import models, serialization
+from infrastructure.inventory_store import InventoryStore
+from infrastructure.job_store import JobStore
+from sync.coalescer import DeltaCoalescer
+from sync.dispatch import Lane, PriorityDispatcher
+from sync.inventory import InventoryService, load_stock_event
+from sync.metrics import MetricsRegistry, observed_stage
+from sync.orchestrator import SyncOrchestrator, SyncOutcome
+from sync.scheduler import Scheduler
+from sync.sharding import OrchestratorFactory, ShardedSyncRunner
+from .codec import dump_outcome, dump_report
+
+
+class _AdmissionLock:
+    """``CommandService._admit`` as a reusable, re-entrant lock object, for the scheduler."""
+
+    def __init__(self, admit: Callable[[], ContextManager[None]]) -> None:
+        self._admit = admit
+        self._local = threading.local()
+
+    def __enter__(self) -> None:
+        stack = self._local.__dict__.setdefault("stack", [])
+        admission = self._admit()
+        admission.__enter__()
+        stack.append(admission)
+
+    def __exit__(self, *exc: Any) -> Optional[bool]:
+        return self._local.stack.pop().__exit__(*exc)
+
+
+class CommandService:
+    """Runs console commands against one orchestrator.
+
+    The store configuration is re-read only when its file changes, so a
+    long-lived service keeps its connectors, rules and sessions warm.
+
+    Without ``priority_lanes`` commands run one at a time under the command
+    lock. With it they are admitted through a ``PriorityDispatcher`` holding
+    the platform slots of the stores they touch, so work on different
+    platforms runs side by side and the command lock only guards the
+    service's own state. Pauses and sold-out toggles go ahead of queued bulk
+    work, and syncs and template rollouts are admitted a store (or a small
+    chunk of stores) at a time so urgent work never waits for a whole fleet
+    run.
+    """
+
+    _LANES = {
+        "pause": Lane.URGENT,
+        "soldout": Lane.URGENT,
+        "stock": Lane.URGENT,
+        "sync": Lane.BULK,
+        "template": Lane.BULK,
+    }
+    # Commands that admit their own units of portal work (per store, chunk, flush or job batch).
+    _SELF_ADMITTED = {"sync", "template", "stock", "run_jobs"}
+    # Commands whose portal work is not limited to the targeted stores' platforms.
+    _UNTARGETED = {"reconcile"}
+    # Stores per worker admitted at once by a sharded sync.
+    _SHARD_CHUNK = 2
+
+    def __init__(
+        self,
+        orchestrator: SyncOrchestrator,
+        store: models.Store,
+        items: Iterable[models.Item],
+        store_config: Optional[Path] = None,
+        loader: Optional[Callable[[Path], Tuple[models.Store, Iterable[models.Item]]]] = None,
+        jobs: Optional[JobStore] = None,
+        inventory: Optional[InventoryStore] = None,
+        stock_window: float = 2.0,
+        metrics_file: Optional[Path] = None,
+        shard_factory: Optional[OrchestratorFactory] = None,
+        priority_lanes: bool = False,
+        lane_max_skips: int = 8,
+    ) -> None:
+        self._orchestrator = orchestrator
+        self._stores: Dict[str, Tuple[models.Store, List[models.Item]]] = {store.id: (store, list(items))}
+        self._store_config = store_config
+        self._loader = loader
+        self._config_mtime = store_config.stat().st_mtime_ns if store_config and store_config.exists() else None
+        # Re-entrant so that ``run_jobs`` can fire the scheduler under the command lock.
+        self._lock = threading.RLock()
+        self._metrics_file = metrics_file
+        self._shard_factory = shard_factory
+        self._sharded: Optional[ShardedSyncRunner] = None
+        self._dispatcher: Optional[PriorityDispatcher] = None
+        if priority_lanes:
+            self._dispatcher = PriorityDispatcher(max_skips=lane_max_skips, metrics=self.metrics)
+        self.scheduler: Optional[Scheduler] = None
+        if jobs is not None:
+            execution_lock = self._lock if self._dispatcher is None else _AdmissionLock(lambda: self._admit(Lane.URGENT))
+            self.scheduler = Scheduler(
+                jobs, orchestrator, self._store, execution_lock=execution_lock, on_availability=self._remember_availability
+            )
+        self.inventory: Optional[InventoryService] = None
+        if inventory is not None:
+            coalescer = DeltaCoalescer(self._apply_stock_delta, window=stock_window)
+            self.inventory = InventoryService(inventory, self._store, coalescer)
+
+    def start(self) -> None:
+        """Starts the background workers of a long-lived (daemon) service."""
+
+        if self.scheduler is not None:
+            self.scheduler.recover()
+            self.scheduler.start()
+        if self.inventory is not None:
+            self.inventory.start()
+        if self._orchestrator.reconciler is not None:
+            self._orchestrator.reconciler.start(self._reconcile_due)
+
+    def stop(self) -> None:
+        if self._orchestrator.reconciler is not None:
+            self._orchestrator.reconciler.stop()
+        if self.scheduler is not None:
+            self.scheduler.stop()
+        if self.inventory is not None:
+            self.inventory.stop()
+        if self._sharded is not None:
+            self._sharded.close()
+            self._sharded = None
+
+    def add_stores(self, entries: Iterable[Tuple[models.Store, Iterable[models.Item]]]) -> None:
+        for store, items in entries:
+            self._stores[store.id] = (store, list(items))
+
+    @contextmanager
+    def _admit(self, lane: Lane, platforms: Optional[Collection[models.Platform]] = None) -> Iterator[None]:
+        """Waits for the slots of ``platforms`` (default: all) in ``lane``, or for the command lock without lanes."""
+
+        with self._dispatcher.slot(lane, platforms) if self._dispatcher is not None else self._lock:
+            yield
+
+    def _admit_stores(self, lane: Lane, stores: Iterable[models.Store]) -> ContextManager[None]:
+        return self._admit(lane, {binding.platform for store in stores for binding in store.bindings})
+
+    def _apply_stock_delta(self, store: models.Store, platform: models.Platform, delta: models.UnifiedDelta) -> SyncOutcome:
+        with self._admit(Lane.URGENT, [platform]):
+            # Persist the new availability like ``set_sold_out`` does, or the next bulk sync would undo it.
+            availability = dict(delta.toggled_items)
+            if availability:
+                self._orchestrator.catalog.set_availability(store.id, availability)
+                self._remember_availability(store.id, availability)
+            return self._orchestrator.apply_delta(store, platform, delta, actor="inventory")
+
+    def _remember_availability(self, store_id: str, availability: Dict[str, bool]) -> None:
+        """Patches the cached items of a store after a sold-out toggle that bypassed ``sync``."""
+
+        with self._lock:
+            entry = self._stores.get(store_id)
+            if entry is None:
+                return
+            store, items = entry
+            self._stores[store_id] = (
+                store,
+                [dataclasses.replace(item, available=availability[item.id]) if item.id in availability else item for item in items],
+            )
+
+    def _reconcile_due(self) -> None:
+        with self._admit(Lane.NORMAL):
+            self._orchestrator.reconcile()
+
+    def _store(self, store_id: str) -> Optional[models.Store]:
+        entry = self._stores.get(store_id)
+        return entry[0] if entry else None
+
+    def _refresh_stores(self) -> None:
+        if self._store_config is None or self._loader is None or not self._store_config.exists():
+            return
+        mtime = self._store_config.stat().st_mtime_ns
+        if mtime == self._config_mtime:
+            return
+        store, items = self._loader(self._store_config)
+        self._stores[store.id] = (store, list(items))
+        self._config_mtime = mtime
+
+    def _targets(self, payload: Dict[str, Any]) -> List[Tuple[models.Store, List[models.Item]]]:
+        wanted = payload.get("store_ids")
+        with self._lock:
+            return [entry for store_id, entry in self._stores.items() if not wanted or store_id in wanted]
+
+    def handles(self, command: str) -> bool:
+        return callable(getattr(self, f"_cmd_{command}", None))
+
+    def execute(self, command: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.handles(command):
+            raise KeyError(f"Unknown command {command}")
+        handler = getattr(self, f"_cmd_{command}")
+        with self._lock:
+            self._refresh_stores()
+        lane = self._LANES.get(command, Lane.NORMAL)
+        if command in self._SELF_ADMITTED:
+            admission: ContextManager[None] = nullcontext()
+        elif command in self._UNTARGETED:
+            admission = self._admit(lane)
+        else:
+            admission = self._admit_stores(lane, [store for store, _ in self._targets(payload)])
+        with admission:
+            try:
+                return handler(payload)
+            finally:
+                if self._metrics_file is not None and self.metrics is not None:
+                    with self._lock:
+                        self.metrics.write(self._metrics_file)
+
+    @property
+    def metrics(self) -> Optional[MetricsRegistry]:
+        return self._orchestrator.metrics
+
+    def _sharded_runner(self, workers: int) -> ShardedSyncRunner:
+        # Worker processes keep their sessions warm, so the pool is reused until the worker count changes.
+        # They are spawned rather than forked because the daemon's background threads may hold locks.
+        if self._sharded is not None and self._sharded.workers != workers:
+            self._sharded.close()
+            self._sharded = None
+        if self._sharded is None:
+            if self._shard_factory is None:
+                raise ValueError("Sharded sync is not configured for this service")
+            self._sharded = ShardedSyncRunner(workers, self._shard_factory, metrics=self.metrics, start_method="spawn")
+        return self._sharded
+
+    def _cmd_sync(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        actor = payload.get("actor", "console")
+        auto_fix = payload.get("auto_fix", False)
+        workers = int(payload.get("workers") or 1)
+        response: Dict[str, Any] = {}
+        if payload.get("changed_only"):
+            if workers > 1:
+                raise RuntimeError("Change-feed syncs run in-process and cannot be sharded")
+            stores = {store.id: store for store, _ in self._targets(payload)}
+            results = self._orchestrator.sync_changed(
+                stores, actor=actor, auto_normalize=auto_fix, chunk=lambda chunk: self._admit_stores(Lane.BULK, chunk)
+            )
+            response["dead_letters"] = [
+                {"store_id": entry.store_id, "attempts": entry.attempts, "error": entry.last_error}
+                for entry in self._orchestrator.catalog.backlog("scheduled")
+                if entry.dead
+            ]
+        elif workers > 1:
+            targets = self._targets(payload)
+            with self._lock:
+                runner = self._sharded_runner(workers)
+            results = []
+            shards: Dict[int, Dict[str, Any]] = {}
+            size = workers * self._SHARD_CHUNK
+            for offset in range(0, len(targets), size):
+                chunk = targets[offset : offset + size]
+                with self._admit_stores(Lane.BULK, [store for store, _ in chunk]):
+                    chunk_results, reports = runner.sync(chunk, actor=actor, auto_normalize=auto_fix)
+                results.extend(chunk_results)
+                for report in reports:
+                    shard = shards.setdefault(report.shard, {"shard": report.shard, "pid": report.pid, "stores": 0, "elapsed": 0.0})
+                    shard["stores"] += len(report.outcomes)
+                    shard["elapsed"] += report.elapsed
+            response["shards"] = [shards[index] for index in sorted(shards)]
+        else:
+            results = []
+            for store, items in self._targets(payload):
+                with self._admit_stores(Lane.BULK, [store]):
+                    results.append((store.id, self._orchestrator.sync_store(store, items, actor=actor, auto_normalize=auto_fix)))
+        with observed_stage("serialize"):
+            response["outcomes"] = [
+                {**dump_outcome(outcome), "store_id": store_id} for store_id, outcomes in results for outcome in outcomes
+            ]
+            return response
+
+    def _cmd_preview(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        previews = []
+        for store, items in self._targets(payload):
+            for report, issues in self._orchestrator.preview_normalization(store, items).values():
+                previews.append({"report": dump_report(report), "issues": [asdict(issue) for issue in issues]})
+        return {"previews": previews}
+
+    def _cmd_soldout(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        item_ids = list(payload["item_ids"])
+        sold_out = payload.get("sold_out", True)
+        outcomes: List[SyncOutcome] = []
+        for store, _ in self._targets(payload):
+            outcomes.extend(self._orchestrator.set_sold_out(store, item_ids, sold_out, actor=payload.get("actor", "console")))
+            self._remember_availability(store.id, {item_id: not sold_out for item_id in item_ids})
+        return {"outcomes": [dump_outcome(outcome) for outcome in outcomes]}
+
+    def _require_scheduler(self) -> Scheduler:
+        if self.scheduler is None:
+            raise RuntimeError("Scheduled jobs are not enabled for this service")
+        return self.scheduler
+
+    def _cmd_pause(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        results: List[models.ApplyResult] = []
+        jobs: List[models.ScheduledJob] = []
+        until = datetime.fromisoformat(payload["until"]) if payload.get("until") else None
+        for store, _ in self._targets(payload):
+            command = models.PauseCommand(store_id=store.id, paused=payload["paused"], reason=payload.get("reason"), until=until)
+            store_results = self._orchestrator.toggle_pause(store, command, actor=payload.get("actor", "console"))
+            results.extend(store_results)
+            if self.scheduler is not None and any(result.success for result in store_results):
+                # A new pause or a manual resume supersedes any earlier auto-resume.
+                self.scheduler.cancel_pending(store.id, models.JobAction.RESUME)
+                if command.paused and until is not None:
+                    jobs.append(self.scheduler.schedule(store.id, models.JobAction.RESUME, until, reason="auto-resume"))
+        return {
+            "results": [serialization.dump_apply_result(result) for result in results],
+            "jobs": [serialization.dump_job(job) for job in jobs],
+        }
+
+    def _cmd_schedule(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        scheduler = self._require_scheduler()
+        action = models.JobAction(payload["action"])
+        due_at = datetime.fromisoformat(payload["at"])
+        platform = models.Platform(payload["platform"]) if payload.get("platform") else None
+        jobs = [
+            scheduler.schedule(store.id, action, due_at, platform=platform, item_ids=payload.get("item_ids"), reason=payload.get("reason"))
+            for store, _ in self._targets(payload)
+        ]
+        return {"jobs": [serialization.dump_job(job) for job in jobs]}
+
+    def _cmd_stock(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.inventory is None:
+            raise RuntimeError("Inventory tracking is not enabled for this service")
+        default_store = payload.get("store_id") or next(iter(self._stores))
+        events = [load_stock_event(event, default_store) for event in payload.get("events", [])]
+        transitions = self.inventory.record(events)
+        # Without a running daemon nothing would flush the window later, so send right away.
+        sent = 0 if self.inventory.running else self.inventory.flush()
+        store_ids = dict.fromkeys(event.store_id for event in events)
+        return {
+            "accepted": len(events),
+            "transitions": transitions,
+            "sent": sent,
+            "sold_out": {store_id: self.inventory.sold_out(store_id) for store_id in store_ids},
+        }
+
+    def _cmd_run_jobs(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        scheduler = self._require_scheduler()
+        scheduler.recover()
+        fired = scheduler.run_due()
+        return {
+            "fired": [
+                {
+                    "store_id": batch.store_id,
+                    "action": batch.action.value,
+                    "jobs": len(batch.job_ids),
+                    "success": batch.success,
+                }
+                for batch in fired
+            ],
+            "results": [serialization.dump_apply_result(result) for batch in fired for result in batch.results],
+        }
+
+    def _cmd_template(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        template = serialization.load_template(payload["template"])
+        with self._lock:
+            stores = {store.id: store for store, _ in self._stores.values()}
+        rollout = self._orchestrator.propagate_template(
+            template, stores, actor=payload.get("actor", "console"), chunk=lambda chunk: self._admit_stores(Lane.BULK, chunk)
+        )
+        with self._lock:
+            for store_id, items in rollout.resolved.items():
+                self._stores[store_id] = (self._stores[store_id][0], list(items))
+        return {
+            "template_id": rollout.template_id,
+            "changed_items": rollout.changed_items,
+            "groups": rollout.groups,
+            "diffs": rollout.diffs,
+            "results": [
+                {"store_id": store_id, "outcomes": [dump_outcome(outcome) for outcome in outcomes]}
+                for store_id, outcomes in rollout.results
+            ],
+        }
+
+    def _cmd_breakers(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        breaker = self._orchestrator.breaker
+        if breaker is None:
+            return {"enabled": False, "breakers": [], "reset": 0}
+        reset = 0
+        if payload.get("reset"):
+            platform = payload.get("platform")
+            reset = breaker.reset(models.Platform(platform) if platform else None)
+        return {
+            "enabled": True,
+            "threshold": breaker.threshold,
+            "cooldown": breaker.cooldown,
+            "reset": reset,
+            "breakers": [
+                {
+                    "platform": status.platform.value,
+                    "selector_version": status.selector_version,
+                    "state": status.state.value,
+                    "failures": status.failures,
+                    "last_code": status.last_code,
+                }
+                for status in breaker.snapshot()
+            ],
+        }
+
+    def _cmd_reconcile(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        reconciler = self._orchestrator.reconciler
+        if reconciler is None:
+            return {"enabled": False, "results": [], "pending": 0}
+        results = self._orchestrator.reconcile(force=bool(payload.get("now")))
+        return {
+            "enabled": True,
+            "results": [
+                {
+                    "platform": result.platform.value,
+                    "shop_id": result.shop_id,
+                    "checked": result.checked,
+                    "mismatches": [asdict(mismatch) for mismatch in result.mismatches],
+                    "requeued": result.requeued,
+                    "error": result.error,
+                }
+                for result in results
+            ],
+            "pending": len(reconciler),
+        }
+
+    def _cmd_hours(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        results: List[models.ApplyResult] = []
+        for store, _ in self._targets(payload):
+            hours = [
+                models.OperatingHours(
+                    store_id=store.id,
+                    dow=i,
+                    open=time.fromisoformat(payload["open"]),
+                    close=time.fromisoformat(payload["close"]),
+                    break_times=[],
+                    holiday=False,
+                )
+                for i in range(1, 8)
+            ]
+            command = models.HoursCommand(store_id=store.id, hours=hours)
+            results.extend(self._orchestrator.update_hours(store, command, actor=payload.get("actor", "console")))
+        return {"results": [serialization.dump_apply_result(result) for result in results]}
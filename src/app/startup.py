@@ -0,0 +1,29 @@
+"""Startup timing report for ``--startup-profile``."""
+from __future__ import annotations
+
+import sys
+import time
+from typing import List, TextIO, Tuple
+
+
+class StartupProfile:
+    """Records named phases with their duration and the modules they imported."""
+
+    def __init__(self, enabled: bool, started_at: float, modules_at_start: int) -> None:
+        self.enabled = enabled
+        self._last = (started_at, modules_at_start)
+        self._phases: List[Tuple[str, float, int]] = []
+
+    def mark(self, phase: str) -> None:
+        now, modules = time.perf_counter(), len(sys.modules)
+        self._phases.append((phase, now - self._last[0], modules - self._last[1]))
+        self._last = (now, modules)
+
+    def report(self, stream: TextIO = sys.stderr) -> None:
+        if not self.enabled:
+            return
+        total = sum(duration for _, duration, _ in self._phases)
+        print("[startup-profile]", file=stream)
+        for phase, duration, modules in self._phases:
+            print(f"  {phase:<18} {duration * 1000:8.1f} ms  (+{modules} modules)", file=stream)
+        print(f"  {'total':<18} {total * 1000:8.1f} ms", file=stream)
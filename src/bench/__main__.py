@@ -0,0 +1,54 @@
+"""Command line entrypoint for the benchmark suite (``python -m bench``)."""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+from .runner import CASES, BenchResult, compare, run_suite
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="동기화 핵심 경로 벤치마크 (합성 카탈로그)")
+    parser.add_argument("--sizes", default="200,5000", help="카탈로그 메뉴 수 목록 (쉼표 구분, 예: 200,5000,50000)")
+    parser.add_argument("--cases", help=f"실행할 케이스 (쉼표 구분, 기본=전체: {', '.join(CASES)})")
+    parser.add_argument("--repeat", type=int, default=3, help="케이스별 반복 횟수 (최솟값을 기준으로 비교)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 시드")
+    parser.add_argument("--label", default="", help="결과에 기록할 이름 (예: 커밋 해시)")
+    parser.add_argument("--out", type=Path, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", type=Path, help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 판단할 증가율 (0.2=20%%)")
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    cases = [case for case in args.cases.split(",") if case] if args.cases else None
+
+    def progress(result: BenchResult) -> None:
+        print(f"{result.case:<24} {result.size:>7}  best {result.best * 1000:10.2f} ms  mean {result.mean * 1000:10.2f} ms")
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        report = run_suite(sizes, Path(workdir), cases=cases, repeat=args.repeat, seed=args.seed, label=args.label, progress=progress)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text(encoding="utf-8")), threshold=args.threshold)
+        for regression in regressions:
+            print(
+                f"회귀: {regression.case} ({regression.size}) "
+                f"{regression.baseline * 1000:.2f} ms → {regression.current * 1000:.2f} ms (x{regression.ratio:.2f})"
+            )
+        if regressions:
+            return 1
+        print("기준 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Seeded generator for synthetic stores and catalogs used by the benchmarks."""
+from __future__ import annotations
+
+import dataclasses
+import random
+from typing import List, Sequence
+
+from domain import models
+
+_NAMES = ["김밥", "라면", "떡볶이", "돈까스", "비빔밥", "냉면", "우동", "제육덮밥", "순두부찌개", "치킨마요"]
+_EXTRAS = ["치즈 추가", "곱빼기", "계란 추가", "맵기 조절", "음료 선택", "사이드 추가"]
+
+
+def make_store(store_id: str = "bench-store", platforms: Sequence[models.Platform] = tuple(models.Platform)) -> models.Store:
+    return models.Store(
+        id=store_id,
+        name="벤치마크 매장",
+        bindings=[
+            models.CredentialBinding(
+                platform=platform,
+                shop_id=f"{store_id}-{platform.value.lower()}",
+                cred_ref=f"cred-{platform.value.lower()}",
+            )
+            for platform in platforms
+        ],
+    )
+
+
+def make_catalog(
+    size: int,
+    seed: int = 0,
+    store_id: str = "bench-store",
+    max_groups: int = 3,
+    max_options: int = 5,
+    invalid_ratio: float = 0.0,
+) -> List[models.Item]:
+    """Builds ``size`` items with option trees that pass every platform's rules.
+
+    ``invalid_ratio`` of the items get an off-step price so validation has
+    something to report. The same arguments always produce the same catalog.
+    """
+
+    rng = random.Random(seed)
+    items: List[models.Item] = []
+    for index in range(size):
+        item_id = f"item-{index:06d}"
+        groups = []
+        for group_index in range(rng.randint(0, max_groups)):
+            group_id = f"{item_id}-g{group_index}"
+            groups.append(
+                models.OptionGroup(
+                    id=group_id,
+                    item_id=item_id,
+                    name=rng.choice(_EXTRAS),
+                    min=0,
+                    max=2,
+                    required=False,
+                    sort=group_index,
+                    options=[
+                        models.Option(
+                            id=f"{group_id}-o{option_index}",
+                            group_id=group_id,
+                            name=f"{rng.choice(_EXTRAS)} {option_index + 1}",
+                            price_delta=rng.randint(0, 20) * 100,
+                        )
+                        for option_index in range(rng.randint(1, max_options))
+                    ],
+                )
+            )
+        price = rng.randint(10, 300) * 100
+        if rng.random() < invalid_ratio:
+            price += 30
+        items.append(
+            models.Item(
+                id=item_id,
+                store_id=store_id,
+                category_id=f"cat-{index % 20:02d}",
+                name=f"{rng.choice(_NAMES)} {index}",
+                desc=f"{rng.choice(_NAMES)}와 {rng.choice(_EXTRAS)}가 어울리는 메뉴",
+                price=price,
+                sku=f"SKU-{index:06d}",
+                options=groups,
+            )
+        )
+    return items
+
+
+def perturb(items: Sequence[models.Item], ratio: float = 0.05, seed: int = 1) -> List[models.Item]:
+    """Returns a copy where ``ratio`` of the items changed price, availability or name."""
+
+    rng = random.Random(seed)
+    changed = list(items)
+    for index in rng.sample(range(len(changed)), int(len(changed) * ratio)):
+        item = changed[index]
+        kind = rng.randrange(3)
+        if kind == 0:
+            changed[index] = dataclasses.replace(item, price=item.price + 100)
+        elif kind == 1:
+            changed[index] = dataclasses.replace(item, available=not item.available)
+        else:
+            changed[index] = dataclasses.replace(item, name=f"{item.name} (신)")
+    return changed
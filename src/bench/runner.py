@@ -0,0 +1,224 @@
+"""Timing harness for the sync hot paths with JSON reports and regression checks."""
+from __future__ import annotations
+
+import gc
+import itertools
+import json
+import platform as host_platform
+import shutil
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from app.paths import DATA_DIR
+from connectors.registry import load_default_connectors
+from domain import models, serialization
+from infrastructure.audit_logger import AuditLogger
+from infrastructure.catalog_repository import CatalogRepository
+from infrastructure.credential_store import Credential, CredentialStore
+from sync import diff
+from sync.orchestrator import SyncOrchestrator
+from sync.preview import PreviewRuleEngine
+from .generator import make_catalog, make_store, perturb
+
+RULES_PATH = DATA_DIR / "rules" / "preview.rules.json"
+
+# A case prepares its inputs for one catalog size (untimed) and returns the callable to time.
+Case = Callable[[List[models.Item], Path], Callable[[], object]]
+
+
+def _calculate_delta(items: List[models.Item], workdir: Path) -> Callable[[], object]:
+    remote = perturb(items)
+    return lambda: diff.calculate_delta(items, remote)
+
+
+def _serialization(items: List[models.Item], workdir: Path) -> Callable[[], object]:
+    return lambda: serialization.load_items(json.loads(json.dumps(serialization.dump_items(items), ensure_ascii=False)))
+
+
+def _validate(items: List[models.Item], workdir: Path) -> Callable[[], object]:
+    platforms = list(models.Platform)
+    return lambda: PreviewRuleEngine(RULES_PATH).validate_all(platforms, items)
+
+
+def _validate_memo(items: List[models.Item], workdir: Path) -> Callable[[], object]:
+    engine = PreviewRuleEngine(RULES_PATH)
+    platforms = list(models.Platform)
+    engine.validate_all(platforms, items)
+    return lambda: engine.validate_all(platforms, items)
+
+
+def _catalog_save_load(items: List[models.Item], workdir: Path) -> Callable[[], object]:
+    repo = CatalogRepository(workdir / "catalog.db")
+    store_id = items[0].store_id if items else "bench-store"
+    snapshot = models.PlatformSnapshot(
+        platform=models.Platform.BAEMIN, store_id=store_id, items=items, hours=[], state=models.StoreState(store_id=store_id)
+    )
+
+    def run() -> object:
+        repo.save_snapshot(snapshot)
+        return repo.load_snapshot(store_id)
+
+    return run
+
+
+def _audit_append_load(items: List[models.Item], workdir: Path) -> Callable[[], object]:
+    # Roughly one entry per changed item; capped so large catalogs do not just measure file opens.
+    path = workdir / "audit.log"
+    logger = AuditLogger(path)
+    entries = [
+        models.AuditLog(
+            id=uuid.uuid4().hex,
+            actor="bench",
+            action=models.AuditAction.APPLY,
+            entity=f"BAEMIN:{item.id}",
+            before={"price": item.price},
+            after={"price": item.price + 100},
+            ts=datetime.utcnow(),
+        )
+        for item in items[:2000]
+    ]
+
+    def run() -> object:
+        path.unlink(missing_ok=True)
+        for entry in entries:
+            logger.append(entry)
+        return logger.load_recent(100)
+
+    return run
+
+
+def _sync_store(items: List[models.Item], workdir: Path) -> Callable[[], object]:
+    base = workdir / "portal"
+    shutil.copytree(DATA_DIR / "selectors", base / "data" / "selectors")
+    store = make_store(items[0].store_id if items else "bench-store")
+    credentials = CredentialStore(workdir / "credentials.json")
+    for binding in store.bindings:
+        credentials.save(binding.cred_ref, Credential(username="bench", password="bench"))
+    orchestrator = SyncOrchestrator(
+        catalog=CatalogRepository(workdir / "sync-catalog.db"),
+        credential_store=credentials,
+        audit_logger=AuditLogger(workdir / "sync-audit.log"),
+        rule_engine=PreviewRuleEngine(RULES_PATH),
+        connectors=load_default_connectors(base),
+    )
+    orchestrator.sync_store(store, items, actor="bench")
+    # Alternate between two catalogs so every timed run has a ~5% delta to push.
+    catalogs = itertools.cycle([perturb(items), items])
+    return lambda: orchestrator.sync_store(store, next(catalogs), actor="bench")
+
+
+CASES: Dict[str, Case] = {
+    "calculate_delta": _calculate_delta,
+    "serialization_roundtrip": _serialization,
+    "validate": _validate,
+    "validate_memo": _validate_memo,
+    "catalog_save_load": _catalog_save_load,
+    "audit_append_load": _audit_append_load,
+    "sync_store": _sync_store,
+}
+
+
+@dataclass(slots=True)
+class BenchResult:
+    case: str
+    size: int
+    runs: List[float]
+
+    @property
+    def best(self) -> float:
+        return min(self.runs)
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.runs)
+
+
+@dataclass(slots=True)
+class Regression:
+    case: str
+    size: int
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def run_case(name: str, items: List[models.Item], workdir: Path, repeat: int = 3) -> BenchResult:
+    case_dir = workdir / f"{name}-{len(items)}"
+    case_dir.mkdir(parents=True, exist_ok=True)
+    fn = CASES[name](items, case_dir)
+    runs: List[float] = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - started)
+    return BenchResult(case=name, size=len(items), runs=runs)
+
+
+def run_suite(
+    sizes: Sequence[int],
+    workdir: Path,
+    cases: Optional[Iterable[str]] = None,
+    repeat: int = 3,
+    seed: int = 0,
+    label: str = "",
+    progress: Optional[Callable[[BenchResult], None]] = None,
+) -> Dict[str, Any]:
+    """Runs every case for every catalog size and returns a JSON-ready report."""
+
+    names = list(cases) if cases else list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise KeyError(f"Unknown benchmark case(s): {', '.join(unknown)}")
+    results: List[BenchResult] = []
+    for size in sizes:
+        items = make_catalog(size, seed=seed)
+        for name in names:
+            result = run_case(name, items, workdir, repeat=repeat)
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return {
+        "meta": {
+            "label": label,
+            "seed": seed,
+            "repeat": repeat,
+            "python": sys.version.split()[0],
+            "platform": host_platform.platform(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": [
+            {"case": r.case, "size": r.size, "best": r.best, "mean": r.mean, "runs": r.runs} for r in results
+        ],
+    }
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = 0.2,
+    min_seconds: float = 0.001,
+) -> List[Regression]:
+    """Lists cases whose best time grew by more than ``threshold`` (0.2 = 20%) over the baseline.
+
+    Cases faster than ``min_seconds`` in both reports are ignored as noise.
+    """
+
+    previous = {(entry["case"], entry["size"]): entry["best"] for entry in baseline["results"]}
+    regressions: List[Regression] = []
+    for entry in current["results"]:
+        before = previous.get((entry["case"], entry["size"]))
+        if before is None or max(before, entry["best"]) < min_seconds:
+            continue
+        if entry["best"] > before * (1 + threshold):
+            regressions.append(Regression(entry["case"], entry["size"], before, entry["best"]))
+    return regressions
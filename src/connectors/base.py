@@ -2,28 +2,82 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Protocol
+from typing import Dict, List, Optional, Protocol, Tuple
 
 from domain import models, serialization
 
 
+_TOKEN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class SelectorTemplate:
+    """A selector string with ``{{token}}`` placeholders split once into parts."""
+
+    __slots__ = ("raw", "_parts")
+
+    def __init__(self, raw: str) -> None:
+        self.raw = raw
+        parts: List[Tuple[bool, str]] = []
+        cursor = 0
+        for match in _TOKEN.finditer(raw):
+            if match.start() > cursor:
+                parts.append((False, raw[cursor : match.start()]))
+            parts.append((True, match.group(1)))
+            cursor = match.end()
+        if cursor < len(raw):
+            parts.append((False, raw[cursor:]))
+        self._parts = tuple(parts)
+
+    def render(self, **params: object) -> str:
+        try:
+            return "".join(str(params[text]) if is_token else text for is_token, text in self._parts)
+        except KeyError as exc:
+            raise KeyError(f"Missing selector parameter {exc.args[0]} for {self.raw!r}") from None
+
+
+def _compile_templates(payload: Dict[str, object], prefix: str = "") -> Dict[str, SelectorTemplate]:
+    compiled: Dict[str, SelectorTemplate] = {}
+    for key, value in payload.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            compiled.update(_compile_templates(value, f"{path}."))
+        elif isinstance(value, str):
+            compiled[path] = SelectorTemplate(value)
+    return compiled
+
+
 @dataclass(slots=True)
 class SelectorMap:
     platform: models.Platform
     version: str
     payload: Dict[str, object]
+    channel: str = "stable"
+    source: Optional[Path] = None
+    templates: Dict[str, SelectorTemplate] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        if not self.templates:
+            self.templates = _compile_templates({k: v for k, v in self.payload.items() if k != "meta"})
 
     @classmethod
-    def load(cls, path: Path) -> "SelectorMap":
+    def load(cls, path: Path, channel: Optional[str] = None) -> "SelectorMap":
         data = json.loads(path.read_text(encoding="utf-8"))
         return cls(
             platform=models.Platform(data["meta"]["platform"]),
             version=data["meta"]["version"],
             payload=data,
+            channel=channel or data["meta"].get("channel", "stable"),
+            source=path,
         )
 
+    def selector(self, path: str, **params: object) -> str:
+        """Renders a selector such as ``selector("hours.row", dow=1)``."""
+
+        return self.templates[path].render(**params)
+
 
 class IPlatformConnector(Protocol):
     def login(self, credential: models.CredentialBinding, username: str, password: str) -> models.AuthSession:
@@ -99,6 +153,15 @@ class FileBackedConnector:
     def fetch_snapshot(self, session: models.AuthSession) -> models.PlatformSnapshot:
         return self._load_state(session.shop_id)
 
+    def snapshot_version(self, session: models.AuthSession) -> Optional[str]:
+        """Cheap change stamp of a shop's state file (mtime and size); None before the first write."""
+
+        try:
+            stat = self._state_path(session.shop_id).stat()
+        except FileNotFoundError:
+            return None
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
     def apply_changes(self, session: models.AuthSession, delta: models.UnifiedDelta) -> models.ApplyResult:
         snapshot = self._load_state(session.shop_id)
         item_index: Dict[str, models.Item] = {item.id: item for item in snapshot.items}
@@ -0,0 +1,241 @@
+"""HTTP implementation of ``IPlatformConnector`` with pooled keep-alive connections."""
+from __future__ import annotations
+
+import json
+import socket
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from domain import models, serialization
+
+# Only these may be re-sent after the portal could already have received them.
+_IDEMPOTENT = frozenset({"GET", "HEAD"})
+
+
+@dataclass(slots=True)
+class HttpCall:
+    method: str
+    path: str
+    body: Optional[Dict[str, Any]] = None
+    token: Optional[str] = None
+
+
+@dataclass(slots=True)
+class HttpResponse:
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: Any = None
+
+
+class _Connection:
+    """A single socket that can send several requests before reading replies."""
+
+    def __init__(self, host: str, port: int, timeout: float) -> None:
+        self.host = host
+        self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        self.closed = False
+        # Set once a request was fully written, i.e. the portal may have acted on it.
+        self.sent = False
+
+    def _encode(self, call: HttpCall, keep_alive: bool) -> bytes:
+        body = b"" if call.body is None else json.dumps(call.body, ensure_ascii=False).encode("utf-8")
+        lines = [
+            f"{call.method} {call.path} HTTP/1.1",
+            f"Host: {self.host}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+            "Accept: application/json",
+            f"Content-Length: {len(body)}",
+        ]
+        if body:
+            lines.append("Content-Type: application/json; charset=utf-8")
+        if call.token:
+            lines.append(f"Authorization: Bearer {call.token}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+    def _read_response(self) -> HttpResponse:
+        status_line = self._reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by portal")
+        status = int(status_line.split()[1])
+        headers: Dict[str, str] = {}
+        while True:
+            line = self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", "0"))
+        raw = self._reader.read(length) if length else b""
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return HttpResponse(status=status, headers=headers, body=json.loads(raw) if raw else None)
+
+    def exchange(self, calls: Sequence[HttpCall], keep_alive: bool) -> List[HttpResponse]:
+        """Writes every request up front (pipelining) and then reads the replies in order."""
+
+        payload = b"".join(self._encode(call, keep_alive or i < len(calls) - 1) for i, call in enumerate(calls))
+        self.sent = False
+        self._sock.sendall(payload)
+        self.sent = True
+        return [self._read_response() for _ in calls]
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self._reader.close()
+            self._sock.close()
+
+
+class ConnectionPool:
+    """Keeps up to ``max_idle`` persistent connections per portal host.
+
+    With ``keep_alive=False`` every exchange opens and closes its own socket,
+    which is useful as a baseline when benchmarking connection reuse.
+    """
+
+    def __init__(self, host: str, port: int, max_idle: int = 4, keep_alive: bool = True, timeout: float = 10.0) -> None:
+        self.host = host
+        self.port = port
+        self.max_idle = max_idle
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._idle: Deque[_Connection] = deque()
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> Tuple[_Connection, bool]:
+        with self._lock:
+            while self._idle:
+                conn = self._idle.pop()
+                if not conn.closed:
+                    return conn, True
+            self.connections_opened += 1
+        return _Connection(self.host, self.port, self.timeout), False
+
+    def _release(self, conn: _Connection) -> None:
+        if conn.closed:
+            return
+        with self._lock:
+            if self.keep_alive and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def exchange(self, calls: Sequence[HttpCall]) -> List[HttpResponse]:
+        if not calls:
+            return []
+        conn, reused = self._acquire()
+        try:
+            responses = conn.exchange(calls, self.keep_alive)
+        except (ConnectionError, OSError):
+            conn.close()
+            if not reused or (conn.sent and not all(call.method in _IDEMPOTENT for call in calls)):
+                raise
+            # The portal may drop idle keep-alive sockets; retry once on a fresh one, unless a
+            # write already went out (e.g. a read timeout) and could be applied twice.
+            with self._lock:
+                self.connections_opened += 1
+            conn = _Connection(self.host, self.port, self.timeout)
+            try:
+                responses = conn.exchange(calls, self.keep_alive)
+            except BaseException:
+                conn.close()
+                raise
+        except BaseException:
+            conn.close()
+            raise
+        self._release(conn)
+        return responses
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn in idle:
+            conn.close()
+
+
+class HttpConnector:
+    """Talks to a portal such as ``MockPortalServer`` over persistent HTTP connections."""
+
+    def __init__(self, platform: models.Platform, pool: ConnectionPool, selector_version: str = "") -> None:
+        self.platform = platform
+        self.selector_version = selector_version
+        self._pool = pool
+        self._valid_credentials: Dict[str, str] = {}
+
+    def register_credentials(self, shop_id: str, username: str) -> None:
+        # The portal owns credential checks; kept for parity with FileBackedConnector.
+        self._valid_credentials[shop_id] = username
+
+    def _shop_path(self, shop_id: str, action: str) -> str:
+        return f"/{self.platform.value}/shops/{shop_id}/{action}"
+
+    @staticmethod
+    def _raise_for_status(response: HttpResponse) -> Any:
+        if response.status == 200:
+            return response.body
+        message = (response.body or {}).get("error", f"HTTP {response.status}")
+        raise ValueError(message)
+
+    def _call(self, call: HttpCall) -> Any:
+        return self._raise_for_status(self._pool.exchange([call])[0])
+
+    def login(self, credential: models.CredentialBinding, username: str, password: str) -> models.AuthSession:
+        body = {"shop_id": credential.shop_id, "cred_ref": credential.cred_ref, "username": username, "password": password}
+        return serialization.load_session(self._call(HttpCall("POST", f"/{self.platform.value}/login", body)))
+
+    def fetch_snapshot(self, session: models.AuthSession) -> models.PlatformSnapshot:
+        data = self._call(HttpCall("GET", self._shop_path(session.shop_id, "snapshot"), token=session.token))
+        return serialization.load_snapshot(data)
+
+    def snapshot_version(self, session: models.AuthSession) -> Optional[str]:
+        data = self._call(HttpCall("GET", self._shop_path(session.shop_id, "version"), token=session.token))
+        return data.get("version")
+
+    def apply_changes(self, session: models.AuthSession, delta: models.UnifiedDelta) -> models.ApplyResult:
+        call = HttpCall("POST", self._shop_path(session.shop_id, "changes"), serialization.dump_delta(delta), session.token)
+        return serialization.load_apply_result(self._call(call))
+
+    def set_pause(self, session: models.AuthSession, command: models.PauseCommand) -> models.ApplyResult:
+        call = HttpCall("POST", self._shop_path(session.shop_id, "pause"), serialization.dump_pause_command(command), session.token)
+        return serialization.load_apply_result(self._call(call))
+
+    def set_operating_hours(self, session: models.AuthSession, command: models.HoursCommand) -> models.ApplyResult:
+        call = HttpCall("POST", self._shop_path(session.shop_id, "hours"), serialization.dump_hours_command(command), session.token)
+        return serialization.load_apply_result(self._call(call))
+
+    # multi-shop helpers -----------------------------------------------
+
+    def fetch_snapshots(self, sessions: Sequence[models.AuthSession]) -> List[models.PlatformSnapshot]:
+        """Fetches several shops by pipelining GETs on one connection."""
+
+        calls = [HttpCall("GET", self._shop_path(s.shop_id, "snapshot"), token=s.token) for s in sessions]
+        return [serialization.load_snapshot(self._raise_for_status(r)) for r in self._pool.exchange(calls)]
+
+    def apply_changes_batch(
+        self, changes: Sequence[Tuple[models.AuthSession, models.UnifiedDelta]]
+    ) -> List[models.ApplyResult]:
+        """Applies deltas for several shops in a single ``/batch`` request."""
+
+        requests = [
+            {
+                "method": "POST",
+                "path": self._shop_path(session.shop_id, "changes"),
+                "body": serialization.dump_delta(delta),
+                "token": session.token,
+            }
+            for session, delta in changes
+        ]
+        payload = self._call(HttpCall("POST", "/batch", {"requests": requests}))
+        results: List[models.ApplyResult] = []
+        for entry in payload["responses"]:
+            if entry["status"] == 200:
+                results.append(serialization.load_apply_result(entry["body"]))
+            else:
+                message = entry["body"].get("error", f"HTTP {entry['status']}")
+                results.append(models.ApplyResult(success=False, message=message, errors=[message]))
+        return results
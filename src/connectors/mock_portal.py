@@ -0,0 +1,174 @@
+"""Local HTTP portal that exposes ``FileBackedConnector`` state over HTTP/1.1."""
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from domain import models, serialization
+from .base import FileBackedConnector
+
+
+class PortalError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class MockPortalServer:
+    """Serves the file-backed portal state on localhost.
+
+    Connections are kept alive (HTTP/1.1) and requests on a connection are
+    handled in arrival order, so clients may pipeline. ``POST /batch`` executes
+    several operations in a single round trip.
+    """
+
+    def __init__(
+        self,
+        connectors: Mapping[models.Platform, FileBackedConnector],
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self._connectors = connectors
+        self._sessions: Dict[str, models.AuthSession] = {}
+        self._lock = threading.Lock()
+        # FileBackedConnector rewrites whole JSON files, so portal operations are serialised.
+        self._state_lock = threading.Lock()
+        self.connections_accepted = 0
+        self.requests_served = 0
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        host, port = self._httpd.server_address[:2]
+        return str(host), int(port)
+
+    def start(self) -> "MockPortalServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-portal", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "MockPortalServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    # request dispatch -------------------------------------------------
+
+    def _connector(self, platform: str) -> FileBackedConnector:
+        try:
+            return self._connectors[models.Platform(platform)]
+        except (KeyError, ValueError):
+            raise PortalError(404, f"Unknown platform {platform}") from None
+
+    def _session(self, token: Optional[str], platform: str, shop_id: str) -> models.AuthSession:
+        with self._lock:
+            session = self._sessions.get(token or "")
+        if session is None or session.platform.value != platform or session.shop_id != shop_id:
+            raise PortalError(401, "AUTH_INVALID: session expired")
+        return session
+
+    def dispatch(self, method: str, path: str, body: Dict[str, Any], token: Optional[str]) -> Any:
+        parts = [part for part in path.split("/") if part]
+        if method == "POST" and parts == ["batch"]:
+            return {"responses": [self._dispatch_one(call, token) for call in body.get("requests", [])]}
+        if len(parts) == 2 and parts[1] == "login" and method == "POST":
+            connector = self._connector(parts[0])
+            binding = models.CredentialBinding(
+                platform=connector.platform,
+                shop_id=body["shop_id"],
+                cred_ref=body.get("cred_ref", ""),
+            )
+            try:
+                session = connector.login(binding, body["username"], body["password"])
+            except ValueError as exc:
+                raise PortalError(401, str(exc)) from None
+            with self._lock:
+                self._sessions[session.token] = session
+            return serialization.dump_session(session)
+        if len(parts) == 4 and parts[1] == "shops":
+            platform, _, shop_id, action = parts
+            connector = self._connector(platform)
+            session = self._session(token, platform, shop_id)
+            if method == "GET" and action == "snapshot":
+                return serialization.dump_snapshot(connector.fetch_snapshot(session))
+            if method == "GET" and action == "version":
+                return {"version": connector.snapshot_version(session)}
+            if method == "POST" and action == "changes":
+                result = connector.apply_changes(session, serialization.load_delta(body))
+                return serialization.dump_apply_result(result)
+            if method == "POST" and action == "pause":
+                result = connector.set_pause(session, serialization.load_pause_command(body))
+                return serialization.dump_apply_result(result)
+            if method == "POST" and action == "hours":
+                result = connector.set_operating_hours(session, serialization.load_hours_command(body))
+                return serialization.dump_apply_result(result)
+        raise PortalError(404, f"No route for {method} {path}")
+
+    def _dispatch_one(self, call: Dict[str, Any], token: Optional[str]) -> Dict[str, Any]:
+        try:
+            payload = self.dispatch(call["method"], call["path"], call.get("body") or {}, call.get("token", token))
+            return {"status": 200, "body": payload}
+        except PortalError as exc:
+            return {"status": exc.status, "body": {"error": str(exc)}}
+        # One malformed or failing call must not fail the rest of the batch.
+        except (KeyError, ValueError) as exc:
+            return {"status": 400, "body": {"error": f"Bad request: {exc}"}}
+        except Exception as exc:
+            return {"status": 500, "body": {"error": f"{type(exc).__name__}: {exc}"}}
+
+
+def _make_handler(server: MockPortalServer) -> type:
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self) -> None:
+            super().setup()
+            with server._lock:
+                server.connections_accepted += 1
+
+        def _handle(self, method: str) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            token = self.headers.get("Authorization", "").removeprefix("Bearer ") or None
+            try:
+                body = json.loads(raw) if raw else {}
+                with server._state_lock:
+                    status, payload = 200, server.dispatch(method, self.path, body, token)
+            except PortalError as exc:
+                status, payload = exc.status, {"error": str(exc)}
+            except (KeyError, ValueError) as exc:
+                status, payload = 400, {"error": f"Bad request: {exc}"}
+            with server._lock:
+                server.requests_served += 1
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            if self.close_connection:
+                self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            self._handle("GET")
+
+        def do_POST(self) -> None:  # noqa: N802 - http.server naming
+            self._handle("POST")
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    return _Handler
+
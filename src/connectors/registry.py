@@ -2,21 +2,89 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Mapping, Optional
 
 from domain import models
-from .base import FileBackedConnector, SelectorMap
-
-
-def load_default_connectors(base_dir: Path) -> Dict[models.Platform, FileBackedConnector]:
-    selectors_dir = base_dir / "data" / "selectors"
-    state_dir = base_dir / "data" / "platform_state"
-    mapping = {}
-    for platform, file_name in [
-        (models.Platform.BAEMIN, "baemin.v2025-10-08.json"),
-        (models.Platform.YOGIYO, "yogiyo.v2025-10-08.json"),
-        (models.Platform.CEATS, "ceats.v2025-10-08.json"),
-    ]:
-        selector = SelectorMap.load(selectors_dir / file_name)
-        mapping[platform] = FileBackedConnector(platform=platform, selectors=selector, state_dir=state_dir)
-    return mapping
+from .base import FileBackedConnector
+from .selectors import SelectorRegistry
+
+if TYPE_CHECKING:
+    from .http_connector import HttpConnector
+
+BuildHook = Callable[[models.Platform, FileBackedConnector], None]
+
+
+class ConnectorRegistry(Mapping[models.Platform, FileBackedConnector]):
+    """Builds file-backed connectors on first access.
+
+    Every lookup re-resolves the selector map through ``SelectorRegistry`` so a
+    hotfixed selector file is picked up by existing connectors without a
+    restart.
+    """
+
+    def __init__(
+        self,
+        selectors: SelectorRegistry,
+        state_dir: Path,
+        platforms: Optional[Iterable[models.Platform]] = None,
+        on_build: Optional[BuildHook] = None,
+    ) -> None:
+        self.selectors = selectors
+        self._on_build = on_build
+        self._state_dir = state_dir
+        self._platforms = set(platforms) if platforms is not None else None
+        self._built: Dict[models.Platform, FileBackedConnector] = {}
+
+    def _allowed(self) -> List[models.Platform]:
+        available = self.selectors.platforms()
+        if self._platforms is None:
+            return available
+        return [platform for platform in available if platform in self._platforms]
+
+    def __getitem__(self, platform: models.Platform) -> FileBackedConnector:
+        if self._platforms is not None and platform not in self._platforms:
+            raise KeyError(platform)
+        selector_map = self.selectors.get(platform)
+        connector = self._built.get(platform)
+        if connector is None:
+            connector = FileBackedConnector(platform=platform, selectors=selector_map, state_dir=self._state_dir)
+            self._built[platform] = connector
+            if self._on_build is not None:
+                self._on_build(platform, connector)
+        elif connector.selectors is not selector_map:
+            connector.selectors = selector_map
+        return connector
+
+    def __iter__(self) -> Iterator[models.Platform]:
+        return iter(self._allowed())
+
+    def __len__(self) -> int:
+        return len(self._allowed())
+
+    @property
+    def built(self) -> Dict[models.Platform, FileBackedConnector]:
+        return dict(self._built)
+
+
+def load_default_connectors(
+    base_dir: Path,
+    platforms: Optional[Iterable[models.Platform]] = None,
+    channel: str = "stable",
+    on_build: Optional[BuildHook] = None,
+) -> ConnectorRegistry:
+    selectors = SelectorRegistry(base_dir / "data" / "selectors", channel=channel)
+    return ConnectorRegistry(selectors, base_dir / "data" / "platform_state", platforms=platforms, on_build=on_build)
+
+
+def load_http_connectors(
+    host: str,
+    port: int,
+    keep_alive: bool = True,
+    max_idle: int = 4,
+) -> Dict[models.Platform, HttpConnector]:
+    """Builds HTTP connectors for every platform sharing one portal connection pool."""
+
+    from .http_connector import ConnectionPool, HttpConnector
+
+    pool = ConnectionPool(host, port, max_idle=max_idle, keep_alive=keep_alive)
+    return {platform: HttpConnector(platform=platform, pool=pool) for platform in models.Platform}
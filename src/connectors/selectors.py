@@ -0,0 +1,147 @@
+"""Discovery, channel resolution and hot-swap of versioned selector maps."""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from domain import models
+from .base import SelectorMap
+
+# baemin.v2025-10-08.json, baemin.v2025-10-20.experimental.json
+_FILE_NAME = re.compile(r"^(?P<platform>[a-z]+)\.(?P<version>v[0-9][\w-]*?)(?:\.(?P<channel>stable|experimental))?\.json$")
+
+CHANNELS = ("stable", "experimental")
+
+
+@dataclass(frozen=True, slots=True)
+class SelectorFile:
+    platform: models.Platform
+    version: str
+    channel: str
+    path: Path
+    mtime_ns: int
+    size: int
+
+    @property
+    def sort_key(self) -> Tuple[int, ...]:
+        return tuple(int(part) for part in re.findall(r"\d+", self.version))
+
+    @property
+    def stamp(self) -> Tuple[str, int, int]:
+        return (self.path.name, self.mtime_ns, self.size)
+
+
+class SelectorRegistry:
+    """Resolves the selector map to use for each platform.
+
+    Only file names and ``stat`` results are read while scanning; a JSON file is
+    parsed the first time its platform is requested. ``stable`` resolves to the
+    newest stable version, ``experimental`` to the newest version of any
+    channel, and ``pins`` force an exact version. Scans are throttled by
+    ``check_interval`` seconds; when the resolved file for a loaded platform is
+    replaced or edited, the next ``get`` returns the new map.
+    """
+
+    def __init__(
+        self,
+        selectors_dir: Path,
+        channel: str = "stable",
+        pins: Optional[Dict[models.Platform, str]] = None,
+        check_interval: float = 2.0,
+    ) -> None:
+        if channel not in CHANNELS:
+            raise ValueError(f"Unknown selector channel {channel}")
+        self._dir = selectors_dir
+        self._channel = channel
+        self._pins = dict(pins or {})
+        self._check_interval = check_interval
+        self._lock = threading.Lock()
+        self._files: Dict[models.Platform, List[SelectorFile]] = {}
+        self._scanned_at: Optional[float] = None
+        self._loaded: Dict[models.Platform, Tuple[Tuple[str, int, int], SelectorMap]] = {}
+
+    def discover(self) -> Dict[models.Platform, List[SelectorFile]]:
+        found: Dict[models.Platform, List[SelectorFile]] = {}
+        if not self._dir.exists():
+            return found
+        for path in self._dir.iterdir():
+            match = _FILE_NAME.match(path.name)
+            if not match:
+                continue
+            try:
+                platform = models.Platform(match["platform"].upper())
+            except ValueError:
+                continue
+            stat = path.stat()
+            found.setdefault(platform, []).append(
+                SelectorFile(
+                    platform=platform,
+                    version=match["version"],
+                    channel=match["channel"] or "stable",
+                    path=path,
+                    mtime_ns=stat.st_mtime_ns,
+                    size=stat.st_size,
+                )
+            )
+        for files in found.values():
+            files.sort(key=lambda f: f.sort_key)
+        return found
+
+    def _scan_if_due(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and self._scanned_at is not None and now - self._scanned_at < self._check_interval:
+            return
+        self._files = self.discover()
+        self._scanned_at = now
+
+    def resolve(self, platform: models.Platform, channel: Optional[str] = None) -> SelectorFile:
+        with self._lock:
+            self._scan_if_due()
+            return self._resolve_locked(platform, channel or self._channel)
+
+    def _resolve_locked(self, platform: models.Platform, channel: str) -> SelectorFile:
+        files = self._files.get(platform, [])
+        pinned = self._pins.get(platform)
+        if pinned is not None:
+            candidates = [f for f in files if f.version == pinned]
+        elif channel == "stable":
+            candidates = [f for f in files if f.channel == "stable"]
+        else:
+            candidates = files
+        if not candidates:
+            raise KeyError(f"No {channel} selector map for {platform.value} in {self._dir}")
+        return candidates[-1]
+
+    def platforms(self) -> List[models.Platform]:
+        with self._lock:
+            self._scan_if_due()
+            return [platform for platform in models.Platform if platform in self._files]
+
+    def get(self, platform: models.Platform) -> SelectorMap:
+        with self._lock:
+            self._scan_if_due()
+            resolved = self._resolve_locked(platform, self._channel)
+            cached = self._loaded.get(platform)
+            if cached is not None and cached[0] == resolved.stamp:
+                return cached[1]
+            selectors = SelectorMap.load(resolved.path, channel=resolved.channel)
+            self._loaded[platform] = (resolved.stamp, selectors)
+            return selectors
+
+    def refresh(self) -> List[models.Platform]:
+        """Forces a rescan and returns the loaded platforms whose selector map changed."""
+
+        with self._lock:
+            self._scan_if_due(force=True)
+            stale = [
+                platform
+                for platform, (stamp, _) in self._loaded.items()
+                if self._resolve_locked(platform, self._channel).stamp != stamp
+            ]
+        for platform in stale:
+            self.get(platform)
+        return stale
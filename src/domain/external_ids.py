@@ -0,0 +1,69 @@
+"""Bidirectional index between portal item ids and unified catalog item ids."""
+from __future__ import annotations
+
+import dataclasses
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Tuple
+
+from . import models
+
+
+@dataclass(slots=True)
+class ExternalIds:
+    """One store's items on one platform, indexed both ways.
+
+    Items without a mapping are listed on the portal under their catalog id,
+    so both lookups fall back to the id they were given.
+    """
+
+    platform: models.Platform
+    to_item: Dict[str, str] = field(default_factory=dict)
+    to_external: Dict[str, str] = field(default_factory=dict)
+
+    def add(self, external_id: str, item_id: str) -> None:
+        stale = self.to_external.pop(item_id, None)
+        if stale is not None:
+            self.to_item.pop(stale, None)
+        self.to_item[external_id] = item_id
+        self.to_external[item_id] = external_id
+
+    def item_id(self, external_id: str) -> str:
+        return self.to_item.get(external_id, external_id)
+
+    def external_id(self, item_id: str) -> str:
+        return self.to_external.get(item_id, item_id)
+
+    def to_portal(self, delta: models.UnifiedDelta) -> models.UnifiedDelta:
+        """Rewrites a delta planned on catalog ids into the ids the portal knows."""
+
+        if not self.to_external:
+            return delta
+        ids = self.external_id
+        return models.UnifiedDelta(
+            updated_items=[
+                item if item.id not in self.to_external else dataclasses.replace(item, id=ids(item.id))
+                for item in delta.updated_items
+            ],
+            toggled_items={ids(item_id): value for item_id, value in delta.toggled_items.items()},
+            price_updates={ids(item_id): value for item_id, value in delta.price_updates.items()},
+            sold_out_items={ids(item_id): value for item_id, value in delta.sold_out_items.items()},
+        )
+
+    def __len__(self) -> int:
+        return len(self.to_item)
+
+
+def index_items(items: Iterable[models.Item]) -> Dict[models.Platform, ExternalIds]:
+    """Builds the per-platform indexes from the items' own ``external_mappings``."""
+
+    return index_pairs((mapping.platform, mapping.external_id, item.id) for item in items for mapping in item.external_mappings)
+
+
+def index_pairs(pairs: Iterable[Tuple[models.Platform, str, str]]) -> Dict[models.Platform, ExternalIds]:
+    indexes: Dict[models.Platform, ExternalIds] = {}
+    for platform, external_id, item_id in pairs:
+        index = indexes.get(platform)
+        if index is None:
+            index = indexes[platform] = ExternalIds(platform)
+        index.add(external_id, item_id)
+    return indexes
@@ -79,6 +79,36 @@ class Item:
     external_mappings: List[ItemMapping] = field(default_factory=list)
 
 
+@dataclass(slots=True)
+class CatalogTemplate:
+    """A franchise base menu shared by every store that links to it."""
+
+    id: str
+    name: str
+    items: List[Item] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ItemOverride:
+    price: Optional[int] = None
+    available: Optional[bool] = None
+
+
+@dataclass(slots=True)
+class StoreOverrides:
+    """What one store changes on top of its template (copy-on-write).
+
+    ``extra_items`` holds store-only items as well as full replacements of
+    template items; ``removed`` lists template items the store does not sell.
+    """
+
+    store_id: str
+    template_id: str
+    overrides: Dict[str, ItemOverride] = field(default_factory=dict)
+    extra_items: List[Item] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
 @dataclass(slots=True)
 class OperatingHoursBreak:
     start: time
@@ -135,6 +165,24 @@ class AuditLog:
     ts: datetime
 
 
+class JobAction(str, Enum):
+    PAUSE = "PAUSE"
+    RESUME = "RESUME"
+    SOLD_OUT = "SOLD_OUT"
+    RESTOCK = "RESTOCK"
+
+
+@dataclass(slots=True)
+class ScheduledJob:
+    id: str
+    store_id: str
+    action: JobAction
+    due_at: datetime
+    platform: Optional[Platform] = None
+    item_ids: List[str] = field(default_factory=list)
+    reason: Optional[str] = None
+
+
 @dataclass(slots=True)
 class PlatformSnapshot:
     platform: Platform
@@ -172,6 +220,7 @@ class ApplyResult:
     message: str
     errors: List[str] = field(default_factory=list)
     partial: bool = False
+    skipped: bool = False
 
 
 @dataclass(slots=True)
@@ -41,7 +41,10 @@ def load_item(data: Dict[str, Any]) -> models.Item:
     for group in data.get("options", []):
         options = [models.Option(**option) for option in group.get("options", [])]
         groups.append(models.OptionGroup(options=options, **{k: v for k, v in group.items() if k != "options"}))
-    mappings = [models.ItemMapping(**mapping) for mapping in data.get("external_mappings", [])]
+    mappings = [
+        models.ItemMapping(platform=models.Platform(mapping["platform"]), external_id=mapping["external_id"])
+        for mapping in data.get("external_mappings", [])
+    ]
     return models.Item(options=groups, external_mappings=mappings, **{k: v for k, v in data.items() if k not in {"options", "external_mappings"}})
 
 
@@ -126,5 +129,130 @@ def dump_items(items: Iterable[models.Item]) -> List[Dict[str, Any]]:
     return [dump_item(item) for item in items]
 
 
+def dump_template(template: models.CatalogTemplate) -> Dict[str, Any]:
+    return {"id": template.id, "name": template.name, "items": dump_items(template.items)}
+
+
+def load_template(data: Dict[str, Any]) -> models.CatalogTemplate:
+    return models.CatalogTemplate(id=data["id"], name=data.get("name", data["id"]), items=load_items(data.get("items", [])))
+
+
+def dump_overrides(overrides: models.StoreOverrides) -> Dict[str, Any]:
+    return {
+        "store_id": overrides.store_id,
+        "template_id": overrides.template_id,
+        "overrides": {
+            item_id: {key: value for key, value in asdict(override).items() if value is not None}
+            for item_id, override in overrides.overrides.items()
+        },
+        "extra_items": dump_items(overrides.extra_items),
+        "removed": list(overrides.removed),
+    }
+
+
+def load_overrides(data: Dict[str, Any]) -> models.StoreOverrides:
+    return models.StoreOverrides(
+        store_id=data["store_id"],
+        template_id=data["template_id"],
+        overrides={item_id: models.ItemOverride(**fields) for item_id, fields in data.get("overrides", {}).items()},
+        extra_items=load_items(data.get("extra_items", [])),
+        removed=list(data.get("removed", [])),
+    )
+
+
 def load_entity(entity_cls: Type[T], data: Dict[str, Any]) -> T:
     return entity_cls(**data)
+
+
+def dump_delta(delta: models.UnifiedDelta) -> Dict[str, Any]:
+    return {
+        "updated_items": dump_items(delta.updated_items),
+        "toggled_items": dict(delta.toggled_items),
+        "price_updates": dict(delta.price_updates),
+        "sold_out_items": dict(delta.sold_out_items),
+    }
+
+
+def load_delta(data: Dict[str, Any]) -> models.UnifiedDelta:
+    return models.UnifiedDelta(
+        updated_items=load_items(data.get("updated_items", [])),
+        toggled_items=dict(data.get("toggled_items", {})),
+        price_updates=dict(data.get("price_updates", {})),
+        sold_out_items=dict(data.get("sold_out_items", {})),
+    )
+
+
+def dump_pause_command(command: models.PauseCommand) -> Dict[str, Any]:
+    return {
+        "store_id": command.store_id,
+        "paused": command.paused,
+        "reason": command.reason,
+        "until": _datetime_to_string(command.until),
+    }
+
+
+def load_pause_command(data: Dict[str, Any]) -> models.PauseCommand:
+    return models.PauseCommand(
+        store_id=data["store_id"],
+        paused=data["paused"],
+        reason=data.get("reason"),
+        until=_datetime_from_string(data.get("until")),
+    )
+
+
+def dump_hours_command(command: models.HoursCommand) -> Dict[str, Any]:
+    return {"store_id": command.store_id, "hours": dump_hours(command.hours)}
+
+
+def load_hours_command(data: Dict[str, Any]) -> models.HoursCommand:
+    return models.HoursCommand(store_id=data["store_id"], hours=load_hours(data.get("hours", [])))
+
+
+def dump_apply_result(result: models.ApplyResult) -> Dict[str, Any]:
+    return asdict(result)
+
+
+def load_apply_result(data: Dict[str, Any]) -> models.ApplyResult:
+    return models.ApplyResult(**data)
+
+
+def dump_session(session: models.AuthSession) -> Dict[str, Any]:
+    return {
+        "platform": session.platform.value,
+        "shop_id": session.shop_id,
+        "token": session.token,
+        "selector_version": session.selector_version,
+    }
+
+
+def load_session(data: Dict[str, Any]) -> models.AuthSession:
+    return models.AuthSession(
+        platform=models.Platform(data["platform"]),
+        shop_id=data["shop_id"],
+        token=data["token"],
+        selector_version=data["selector_version"],
+    )
+
+
+def dump_job(job: models.ScheduledJob) -> Dict[str, Any]:
+    return {
+        "id": job.id,
+        "store_id": job.store_id,
+        "action": job.action.value,
+        "due_at": _datetime_to_string(job.due_at),
+        "platform": job.platform.value if job.platform else None,
+        "item_ids": list(job.item_ids),
+        "reason": job.reason,
+    }
+
+
+def load_job(data: Dict[str, Any]) -> models.ScheduledJob:
+    return models.ScheduledJob(
+        id=data["id"],
+        store_id=data["store_id"],
+        action=models.JobAction(data["action"]),
+        due_at=datetime.fromisoformat(data["due_at"]),
+        platform=models.Platform(data["platform"]) if data.get("platform") else None,
+        item_ids=list(data.get("item_ids", [])),
+        reason=data.get("reason"),
+    )
@@ -0,0 +1,110 @@
+"""Resolution of franchise template catalogs and per-store overrides."""
+from __future__ import annotations
+
+import dataclasses
+import json
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from . import models, serialization
+
+
+class ResolvedCatalog:
+    """Read-only view of a template with one store's overrides applied.
+
+    Iterating yields the template's own ``Item`` objects for everything the
+    store does not override, so hundreds of stores on one template share a
+    single copy of the base menu. Shared items keep the template id as
+    ``store_id``; only overridden items are copied, lazily, per iteration.
+    """
+
+    __slots__ = ("template", "overrides", "_extra")
+
+    def __init__(self, template: models.CatalogTemplate, overrides: models.StoreOverrides) -> None:
+        self.template = template
+        self.overrides = overrides
+        self._extra: Dict[str, models.Item] = {item.id: item for item in overrides.extra_items}
+
+    def __iter__(self) -> Iterator[models.Item]:
+        removed = set(self.overrides.removed)
+        changes = self.overrides.overrides
+        seen = set()
+        for item in self.template.items:
+            seen.add(item.id)
+            if item.id in removed:
+                continue
+            replacement = self._extra.get(item.id)
+            if replacement is not None:
+                yield replacement
+                continue
+            override = changes.get(item.id)
+            yield item if override is None else _apply(item, override)
+        for item in self.overrides.extra_items:
+            if item.id not in seen:
+                yield item
+
+    def __len__(self) -> int:
+        template_ids = {item.id for item in self.template.items}
+        kept = len(template_ids - set(self.overrides.removed))
+        return kept + sum(1 for item_id in self._extra if item_id not in template_ids)
+
+
+def _apply(item: models.Item, override: models.ItemOverride) -> models.Item:
+    fields = {key: value for key, value in (("price", override.price), ("available", override.available)) if value is not None}
+    return dataclasses.replace(item, **fields) if fields else item
+
+
+def _same(item: models.Item, base: models.Item) -> bool:
+    return dataclasses.replace(item, store_id=base.store_id) == base
+
+
+def derive_overrides(template: models.CatalogTemplate, store_id: str, items: Iterable[models.Item]) -> models.StoreOverrides:
+    """Computes the smallest overrides that resolve ``template`` to ``items``."""
+
+    base = {item.id: item for item in template.items}
+    result = models.StoreOverrides(store_id=store_id, template_id=template.id)
+    seen = set()
+    for item in items:
+        seen.add(item.id)
+        template_item = base.get(item.id)
+        if template_item is None:
+            result.extra_items.append(item)
+        elif _same(item, template_item):
+            continue
+        elif _same(dataclasses.replace(item, price=template_item.price, available=template_item.available), template_item):
+            result.overrides[item.id] = models.ItemOverride(
+                price=item.price if item.price != template_item.price else None,
+                available=item.available if item.available != template_item.available else None,
+            )
+        else:
+            result.extra_items.append(item)
+    result.removed = [item_id for item_id in base if item_id not in seen]
+    return result
+
+
+def override_key(overrides: models.StoreOverrides) -> Hashable:
+    """Identity of a store's resolved catalog: stores with equal keys resolve to the same items."""
+
+    changes: List[Tuple[str, Optional[int], Optional[bool]]] = sorted(
+        (item_id, override.price, override.available) for item_id, override in overrides.overrides.items()
+    )
+    extras = sorted(
+        json.dumps({**serialization.dump_item(item), "store_id": None}, sort_keys=True, ensure_ascii=False)
+        for item in overrides.extra_items
+    )
+    return (overrides.template_id, tuple(changes), tuple(extras), tuple(sorted(overrides.removed)))
+
+
+def changed_ids(before: Optional[models.StoreOverrides], after: models.StoreOverrides) -> List[str]:
+    """Item ids whose resolved value can differ between two override sets of the same template."""
+
+    if before is None:
+        return []
+
+    def entries(overrides: models.StoreOverrides) -> Dict[str, object]:
+        result: Dict[str, object] = {item_id: ("override", o.price, o.available) for item_id, o in overrides.overrides.items()}
+        result.update({item.id: ("item", item) for item in overrides.extra_items})
+        result.update({item_id: "removed" for item_id in overrides.removed})
+        return result
+
+    old, new = entries(before), entries(after)
+    return sorted(item_id for item_id in old.keys() | new.keys() if old.get(item_id) != new.get(item_id))
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import json
+import threading
 from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
@@ -14,12 +15,15 @@ class AuditLogger:
     def __init__(self, file_path: Path) -> None:
         self._path = file_path
         self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
 
     def append(self, log: AuditLog) -> None:
         entry = asdict(log)
         entry["ts"] = log.ts.isoformat()
-        with self._path.open("a", encoding="utf-8") as stream:
-            stream.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        # Platforms may be updated from worker threads; keep each entry on its own line.
+        with self._lock, self._path.open("a", encoding="utf-8") as stream:
+            stream.write(line)
 
     def load_recent(self, limit: int = 100) -> Iterable[AuditLog]:
         if not self._path.exists():
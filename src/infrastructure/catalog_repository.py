@@ -1,12 +1,16 @@
 """SQLite-backed repository for persisting unified catalog snapshots."""
 from __future__ import annotations
 
+import dataclasses
 import json
 import sqlite3
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from domain import models, serialization
+from domain.external_ids import ExternalIds, index_pairs
+from domain.templates import ResolvedCatalog, changed_ids, derive_overrides
 
 
 _SCHEMA = """
@@ -15,35 +19,478 @@ CREATE TABLE IF NOT EXISTS unified_catalog (
     payload TEXT NOT NULL,
     updated_at TEXT NOT NULL
 );
+CREATE TABLE IF NOT EXISTS unified_catalog_items (
+    store_id TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (store_id, item_id)
+);
+CREATE TABLE IF NOT EXISTS catalog_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    store_id TEXT NOT NULL,
+    item_id TEXT,
+    changed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS catalog_templates (
+    template_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS catalog_template_items (
+    template_id TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (template_id, item_id)
+);
+CREATE TABLE IF NOT EXISTS store_overrides (
+    store_id TEXT PRIMARY KEY,
+    template_id TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS external_ids (
+    store_id TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    external_id TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    PRIMARY KEY (store_id, platform, external_id)
+);
+CREATE TABLE IF NOT EXISTS catalog_cursors (
+    consumer TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS change_backlog (
+    consumer TEXT NOT NULL,
+    store_id TEXT NOT NULL,
+    item_ids TEXT,
+    attempts INTEGER NOT NULL,
+    last_error TEXT,
+    dead INTEGER NOT NULL,
+    PRIMARY KEY (consumer, store_id)
+);
 """
 
 
+@dataclass(slots=True)
+class CatalogChange:
+    """One entry of the change feed; ``item_id`` is None when the whole store changed."""
+
+    seq: int
+    store_id: str
+    item_id: Optional[str]
+
+
+@dataclass(slots=True)
+class ChangeSet:
+    """Changes grouped per store; a store maps to None when all of its items must be considered."""
+
+    since: int
+    until: int
+    stores: Dict[str, Optional[Set[str]]]
+
+
+@dataclass(slots=True)
+class BacklogEntry:
+    """Changes of one store a consumer moved its cursor past without syncing them."""
+
+    store_id: str
+    # None when all of the store's items must be considered.
+    item_ids: Optional[Set[str]]
+    attempts: int
+    last_error: Optional[str] = None
+    # Gave up after too many failed attempts; revived by the store's next change.
+    dead: bool = False
+
+
+def merge_item_ids(left: Optional[Set[str]], right: Optional[Set[str]]) -> Optional[Set[str]]:
+    return None if left is None or right is None else left | right
+
+
 class CatalogRepository:
-    """Persists unified catalog state as JSON blobs inside SQLite."""
+    """Persists unified catalog state as JSON blobs inside SQLite.
+
+    Items are stored one row each so targeted edits such as sold-out toggles
+    touch only the affected rows. Catalogs saved before the split keep their
+    items inside the store blob until the next full save.
+
+    Every write that actually changes a store or item appends to a change feed
+    with a monotonically increasing sequence; consumers keep a high-water mark
+    in ``catalog_cursors`` and read only what changed since (``pending``).
+
+    Stores linked to a franchise template keep no item rows of their own: only
+    their ``StoreOverrides`` are stored, and snapshots are resolved against the
+    template, which is loaded once per version and shared between stores.
+
+    The items' ``external_mappings`` are mirrored into ``external_ids`` on
+    every save, so a sync loads a store's portal id index with one query
+    instead of decoding every item.
+    """
 
     def __init__(self, db_path: Path) -> None:
         self._db_path = db_path
-        self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        with sqlite3.connect(self._db_path) as conn:
-            conn.execute(_SCHEMA)
-            conn.commit()
+        self._schema_ready = False
+        self._templates: Dict[str, Tuple[int, models.CatalogTemplate]] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        # The database is created lazily so commands that never touch the catalog skip it.
+        if not self._schema_ready:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._db_path)
+            try:
+                conn.executescript(_SCHEMA)
+            finally:
+                conn.close()
+            self._schema_ready = True
+        return sqlite3.connect(self._db_path)
 
     def save_snapshot(
         self,
         snapshot: models.PlatformSnapshot,
     ) -> None:
-        payload = json.dumps(serialization.dump_snapshot(snapshot), ensure_ascii=False)
-        with sqlite3.connect(self._db_path) as conn:
+        linked = self.load_overrides(snapshot.store_id)
+        if linked is not None:
+            self._save_linked(snapshot, linked)
+            return
+        data = serialization.dump_snapshot(snapshot)
+        items = [(item["id"], json.dumps(item, ensure_ascii=False)) for item in data.pop("items")]
+        payload = json.dumps(data, ensure_ascii=False)
+        with self._connect() as conn:
+            row = conn.execute("SELECT payload FROM unified_catalog WHERE store_id=?", (snapshot.store_id,)).fetchone()
+            stored = conn.execute(
+                "SELECT item_id, payload FROM unified_catalog_items WHERE store_id=? ORDER BY position",
+                (snapshot.store_id,),
+            ).fetchall()
+            if row is None or (not stored and "items" in json.loads(row[0])):
+                # New store, or a legacy blob without item rows: everything counts as changed.
+                changed: List[Optional[str]] = [None]
+            else:
+                before = dict(stored)
+                changed = [item_id for item_id, item in items if before.pop(item_id, None) != item]
+                changed += list(before)  # removed items
+                if row[0] != payload:
+                    changed.append(None)
+            # Also backfills the index for catalogs saved before it existed.
+            self._write_external_ids(conn, snapshot.store_id, snapshot.items)
+            if not changed and [item_id for item_id, _ in stored] == [item_id for item_id, _ in items]:
+                return
             conn.execute(
                 "REPLACE INTO unified_catalog(store_id, payload, updated_at) VALUES(?,?,datetime('now'))",
                 (snapshot.store_id, payload),
             )
+            conn.execute("DELETE FROM unified_catalog_items WHERE store_id=?", (snapshot.store_id,))
+            conn.executemany(
+                "REPLACE INTO unified_catalog_items(store_id, item_id, position, payload) VALUES(?,?,?,?)",
+                [(snapshot.store_id, item_id, position, item) for position, (item_id, item) in enumerate(items)],
+            )
+            self._record_changes(conn, snapshot.store_id, changed)
             conn.commit()
 
     def load_snapshot(self, store_id: str) -> Optional[models.PlatformSnapshot]:
-        with sqlite3.connect(self._db_path) as conn:
+        with self._connect() as conn:
             row = conn.execute("SELECT payload FROM unified_catalog WHERE store_id=?", (store_id,)).fetchone()
             if not row:
                 return None
             payload = json.loads(row[0])
+            linked = self._overrides(conn, store_id)
+            if linked is not None:
+                template = self.load_template(linked.template_id)
+                if template is not None:
+                    snapshot = serialization.load_snapshot({**payload, "items": []})
+                    snapshot.items = list(ResolvedCatalog(template, linked))
+                    return snapshot
+            rows = conn.execute(
+                "SELECT payload FROM unified_catalog_items WHERE store_id=? ORDER BY position", (store_id,)
+            ).fetchall()
+            if rows or "items" not in payload:
+                payload["items"] = [json.loads(item) for (item,) in rows]
             return serialization.load_snapshot(payload)
+
+    def set_availability(self, store_id: str, availability: Dict[str, bool]) -> List[str]:
+        """Flips ``available`` on the given items in place; returns the ids that were stored."""
+
+        linked = self.load_overrides(store_id)
+        if linked is not None:
+            return self._set_linked_availability(linked, availability)
+        updated: List[str] = []
+        with self._connect() as conn:
+            for item_id, available in availability.items():
+                cursor = conn.execute(
+                    "UPDATE unified_catalog_items SET payload=json_set(payload, '$.available', json(?)) "
+                    "WHERE store_id=? AND item_id=?",
+                    ("true" if available else "false", store_id, item_id),
+                )
+                if cursor.rowcount:
+                    updated.append(item_id)
+            conn.execute("UPDATE unified_catalog SET updated_at=datetime('now') WHERE store_id=?", (store_id,))
+            self._record_changes(conn, store_id, updated)
+            conn.commit()
+        return updated
+
+    # franchise templates -------------------------------------------------
+
+    def save_template(self, template: models.CatalogTemplate) -> List[str]:
+        """Stores a template; returns the ids of items that changed (or were removed).
+
+        Every linked store gets a change-feed entry for each changed item.
+        """
+
+        items = [(item.id, json.dumps(serialization.dump_item(item), ensure_ascii=False)) for item in template.items]
+        with self._connect() as conn:
+            row = conn.execute("SELECT version, name FROM catalog_templates WHERE template_id=?", (template.id,)).fetchone()
+            before = dict(
+                conn.execute(
+                    "SELECT item_id, payload FROM catalog_template_items WHERE template_id=? ORDER BY position", (template.id,)
+                ).fetchall()
+            )
+            order_changed = list(before) != [item_id for item_id, _ in items]
+            changed = [item_id for item_id, item in items if before.pop(item_id, None) != item] + list(before)
+            if row is not None and not changed and not order_changed and row[1] == template.name:
+                return []
+            version = (row[0] if row else 0) + 1
+            conn.execute(
+                "REPLACE INTO catalog_templates(template_id, name, version, updated_at) VALUES(?,?,?,datetime('now'))",
+                (template.id, template.name, version),
+            )
+            conn.execute("DELETE FROM catalog_template_items WHERE template_id=?", (template.id,))
+            conn.executemany(
+                "INSERT INTO catalog_template_items(template_id, item_id, position, payload) VALUES(?,?,?,?)",
+                [(template.id, item_id, position, item) for position, (item_id, item) in enumerate(items)],
+            )
+            for (store_id,) in conn.execute("SELECT store_id FROM store_overrides WHERE template_id=?", (template.id,)).fetchall():
+                self._record_changes(conn, store_id, changed)
+            conn.commit()
+        self._templates[template.id] = (version, template)
+        return changed
+
+    def load_template(self, template_id: str) -> Optional[models.CatalogTemplate]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT version, name FROM catalog_templates WHERE template_id=?", (template_id,)).fetchone()
+            if row is None:
+                return None
+            cached = self._templates.get(template_id)
+            if cached is not None and cached[0] == row[0]:
+                return cached[1]
+            rows = conn.execute(
+                "SELECT payload FROM catalog_template_items WHERE template_id=? ORDER BY position", (template_id,)
+            ).fetchall()
+        template = models.CatalogTemplate(
+            id=template_id, name=row[1], items=[serialization.load_item(json.loads(item)) for (item,) in rows]
+        )
+        self._templates[template_id] = (row[0], template)
+        return template
+
+    def link_store(self, overrides: models.StoreOverrides) -> None:
+        """Points a store at a template; its own item rows are dropped in favour of the overrides."""
+
+        with self._connect() as conn:
+            before = self._overrides(conn, overrides.store_id)
+            if before is not None and before.template_id == overrides.template_id:
+                changed: List[Optional[str]] = list(changed_ids(before, overrides))
+            else:
+                changed = [None]
+            if not changed:
+                return
+            state = models.StoreState(store_id=overrides.store_id)
+            payload = serialization.dump_snapshot(models.PlatformSnapshot(models.Platform.BAEMIN, overrides.store_id, [], [], state))
+            payload.pop("items")
+            conn.execute(
+                "INSERT OR IGNORE INTO unified_catalog(store_id, payload, updated_at) VALUES(?,?,datetime('now'))",
+                (overrides.store_id, json.dumps(payload, ensure_ascii=False)),
+            )
+            self._write_overrides(conn, overrides)
+            conn.execute("DELETE FROM unified_catalog_items WHERE store_id=?", (overrides.store_id,))
+            self._record_changes(conn, overrides.store_id, changed)
+            conn.commit()
+
+    def load_overrides(self, store_id: str) -> Optional[models.StoreOverrides]:
+        with self._connect() as conn:
+            return self._overrides(conn, store_id)
+
+    def linked_stores(self, template_id: str) -> List[models.StoreOverrides]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT payload FROM store_overrides WHERE template_id=? ORDER BY store_id", (template_id,)
+            ).fetchall()
+        return [serialization.load_overrides(json.loads(payload)) for (payload,) in rows]
+
+    @staticmethod
+    def _overrides(conn: sqlite3.Connection, store_id: str) -> Optional[models.StoreOverrides]:
+        row = conn.execute("SELECT payload FROM store_overrides WHERE store_id=?", (store_id,)).fetchone()
+        return serialization.load_overrides(json.loads(row[0])) if row else None
+
+    @staticmethod
+    def _write_overrides(conn: sqlite3.Connection, overrides: models.StoreOverrides) -> None:
+        conn.execute(
+            "REPLACE INTO store_overrides(store_id, template_id, payload) VALUES(?,?,?)",
+            (overrides.store_id, overrides.template_id, json.dumps(serialization.dump_overrides(overrides), ensure_ascii=False)),
+        )
+
+    def _save_linked(self, snapshot: models.PlatformSnapshot, before: models.StoreOverrides) -> None:
+        # Copy-on-write: only the difference from the template is stored.
+        template = self.load_template(before.template_id)
+        if template is None:
+            raise KeyError(f"Template {before.template_id} for store {snapshot.store_id} is missing")
+        after = derive_overrides(template, snapshot.store_id, snapshot.items)
+        data = serialization.dump_snapshot(snapshot)
+        data.pop("items")
+        with self._connect() as conn:
+            conn.execute(
+                "REPLACE INTO unified_catalog(store_id, payload, updated_at) VALUES(?,?,datetime('now'))",
+                (snapshot.store_id, json.dumps(data, ensure_ascii=False)),
+            )
+            self._write_external_ids(conn, snapshot.store_id, snapshot.items)
+            changed = changed_ids(before, after)
+            if changed:
+                self._write_overrides(conn, after)
+                self._record_changes(conn, snapshot.store_id, changed)
+            conn.commit()
+
+    def _set_linked_availability(self, linked: models.StoreOverrides, availability: Dict[str, bool]) -> List[str]:
+        snapshot = self.load_snapshot(linked.store_id)
+        if snapshot is None:
+            return []
+        updated = [item.id for item in snapshot.items if item.id in availability]
+        snapshot.items = [
+            dataclasses.replace(item, available=availability[item.id]) if item.id in availability else item
+            for item in snapshot.items
+        ]
+        self._save_linked(snapshot, linked)
+        return updated
+
+    @staticmethod
+    def _write_external_ids(conn: sqlite3.Connection, store_id: str, items: Iterable[models.Item]) -> None:
+        wanted = {
+            (mapping.platform.value, mapping.external_id): item.id for item in items for mapping in item.external_mappings
+        }
+        stored = {
+            (platform, external_id): item_id
+            for platform, external_id, item_id in conn.execute(
+                "SELECT platform, external_id, item_id FROM external_ids WHERE store_id=?", (store_id,)
+            )
+        }
+        if wanted == stored:
+            return
+        conn.execute("DELETE FROM external_ids WHERE store_id=?", (store_id,))
+        conn.executemany(
+            "INSERT INTO external_ids(store_id, platform, external_id, item_id) VALUES(?,?,?,?)",
+            [(store_id, platform, external_id, item_id) for (platform, external_id), item_id in wanted.items()],
+        )
+
+    def external_ids(self, store_id: str) -> Dict[models.Platform, ExternalIds]:
+        """The store's (platform, external id) <-> item id index, one ``ExternalIds`` per mapped platform."""
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT platform, external_id, item_id FROM external_ids WHERE store_id=? ORDER BY rowid", (store_id,)
+            ).fetchall()
+        return index_pairs((models.Platform(platform), external_id, item_id) for platform, external_id, item_id in rows)
+
+    @staticmethod
+    def _record_changes(conn: sqlite3.Connection, store_id: str, item_ids: Iterable[Optional[str]]) -> None:
+        conn.executemany(
+            "INSERT INTO catalog_changes(store_id, item_id, changed_at) VALUES(?,?,datetime('now'))",
+            [(store_id, item_id) for item_id in item_ids],
+        )
+
+    def changes_since(self, seq: int, limit: Optional[int] = None) -> List[CatalogChange]:
+        query = "SELECT seq, store_id, item_id FROM catalog_changes WHERE seq>? ORDER BY seq"
+        params: Tuple[int, ...] = (seq,)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+        with self._connect() as conn:
+            return [CatalogChange(*row) for row in conn.execute(query, params).fetchall()]
+
+    def cursor(self, consumer: str) -> int:
+        with self._connect() as conn:
+            row = conn.execute("SELECT seq FROM catalog_cursors WHERE consumer=?", (consumer,)).fetchone()
+        return row[0] if row else 0
+
+    def advance(self, consumer: str, seq: int) -> None:
+        """Moves a consumer's high-water mark forward; it never moves backwards."""
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO catalog_cursors(consumer, seq) VALUES(?,?) "
+                "ON CONFLICT(consumer) DO UPDATE SET seq=max(seq, excluded.seq)",
+                (consumer, seq),
+            )
+            conn.commit()
+
+    def pending(self, consumer: str) -> ChangeSet:
+        """Everything that changed since ``consumer`` last advanced, grouped per store."""
+
+        since = self.cursor(consumer)
+        changes = self.changes_since(since)
+        stores: Dict[str, Optional[Set[str]]] = {}
+        for change in changes:
+            items = stores.setdefault(change.store_id, set())
+            if items is None:
+                continue
+            if change.item_id is None:
+                stores[change.store_id] = None
+            else:
+                items.add(change.item_id)
+        return ChangeSet(since=since, until=changes[-1].seq if changes else since, stores=stores)
+
+    def backlog(self, consumer: str) -> List[BacklogEntry]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT store_id, item_ids, attempts, last_error, dead FROM change_backlog WHERE consumer=? ORDER BY store_id",
+                (consumer,),
+            ).fetchall()
+        return [
+            BacklogEntry(store_id, None if items is None else set(json.loads(items)), attempts, error, bool(dead))
+            for store_id, items, attempts, error, dead in rows
+        ]
+
+    def hold(
+        self,
+        consumer: str,
+        store_id: str,
+        item_ids: Optional[Set[str]],
+        error: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+    ) -> BacklogEntry:
+        """Parks a store's changes outside the consumer's cursor; an ``error`` counts as a failed attempt.
+
+        The entry is marked dead once ``max_attempts`` attempts have failed.
+        """
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT item_ids, attempts, dead FROM change_backlog WHERE consumer=? AND store_id=?", (consumer, store_id)
+            ).fetchone()
+            attempts = 0
+            if row is not None:
+                item_ids = merge_item_ids(None if row[0] is None else set(json.loads(row[0])), item_ids)
+                attempts = 0 if row[2] else row[1]
+            if error is not None:
+                attempts += 1
+            entry = BacklogEntry(
+                store_id,
+                item_ids,
+                attempts,
+                error,
+                dead=error is not None and max_attempts is not None and attempts >= max_attempts,
+            )
+            conn.execute(
+                "REPLACE INTO change_backlog(consumer, store_id, item_ids, attempts, last_error, dead) VALUES(?,?,?,?,?,?)",
+                (
+                    consumer,
+                    store_id,
+                    None if item_ids is None else json.dumps(sorted(item_ids)),
+                    attempts,
+                    error,
+                    int(entry.dead),
+                ),
+            )
+            conn.commit()
+        return entry
+
+    def release(self, consumer: str, store_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM change_backlog WHERE consumer=? AND store_id=?", (consumer, store_id))
+            conn.commit()
@@ -0,0 +1,68 @@
+"""SQLite persistence for per-item stock counts."""
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable
+
+from domain import models
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inventory (
+    store_id TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    qty INTEGER,
+    low INTEGER,
+    auto_sold_out INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (store_id, item_id)
+);
+"""
+
+
+class InventoryStore:
+    """Keeps the last persisted stock counts per store."""
+
+    def __init__(self, db_path: Path) -> None:
+        self._db_path = db_path
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._schema_ready:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._db_path)
+            try:
+                conn.executescript(_SCHEMA)
+            finally:
+                conn.close()
+            self._schema_ready = True
+        return sqlite3.connect(self._db_path)
+
+    def load(self, store_id: str) -> Dict[str, models.Inventory]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT item_id, type, qty, low, auto_sold_out FROM inventory WHERE store_id=?", (store_id,)
+            ).fetchall()
+        return {
+            item_id: models.Inventory(
+                item_id=item_id,
+                type=models.InventoryType(kind),
+                qty=qty,
+                low=low,
+                auto_sold_out=bool(auto_sold_out),
+            )
+            for item_id, kind, qty, low, auto_sold_out in rows
+        }
+
+    def save_many(self, store_id: str, inventories: Iterable[models.Inventory]) -> None:
+        with self._connect() as conn:
+            conn.executemany(
+                "REPLACE INTO inventory(store_id, item_id, type, qty, low, auto_sold_out, updated_at) "
+                "VALUES(?,?,?,?,?,?,datetime('now'))",
+                [
+                    (store_id, inv.item_id, inv.type.value, inv.qty, inv.low, int(inv.auto_sold_out))
+                    for inv in inventories
+                ],
+            )
@@ -0,0 +1,157 @@
+"""SQLite persistence for scheduled jobs."""
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from domain import models
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scheduled_jobs (
+    id TEXT PRIMARY KEY,
+    store_id TEXT NOT NULL,
+    platform TEXT,
+    action TEXT NOT NULL,
+    item_ids TEXT NOT NULL,
+    reason TEXT,
+    due_at REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    last_error TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scheduled_jobs_pending ON scheduled_jobs(status, due_at);
+CREATE INDEX IF NOT EXISTS idx_scheduled_jobs_store ON scheduled_jobs(store_id, action, status);
+"""
+
+
+def _row_to_job(row: sqlite3.Row) -> models.ScheduledJob:
+    return models.ScheduledJob(
+        id=row["id"],
+        store_id=row["store_id"],
+        action=models.JobAction(row["action"]),
+        due_at=datetime.fromtimestamp(row["due_at"], tz=timezone.utc),
+        platform=models.Platform(row["platform"]) if row["platform"] else None,
+        item_ids=json.loads(row["item_ids"]),
+        reason=row["reason"],
+    )
+
+
+class JobStore:
+    """Keeps scheduled jobs durable so they survive restarts.
+
+    Due times are stored as UTC epoch seconds; naive datetimes are taken as
+    local time.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self._db_path = db_path
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._schema_ready:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._db_path)
+            try:
+                conn.executescript(_SCHEMA)
+            finally:
+                conn.close()
+            self._schema_ready = True
+        conn = sqlite3.connect(self._db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def add(self, job: models.ScheduledJob) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "REPLACE INTO scheduled_jobs(id, store_id, platform, action, item_ids, reason, due_at, status, updated_at) "
+                "VALUES(?,?,?,?,?,?,?,'pending',datetime('now'))",
+                (
+                    job.id,
+                    job.store_id,
+                    job.platform.value if job.platform else None,
+                    job.action.value,
+                    json.dumps(job.item_ids),
+                    job.reason,
+                    job.due_at.timestamp(),
+                ),
+            )
+
+    def pending(self, due_before: Optional[float] = None) -> List[models.ScheduledJob]:
+        query = "SELECT * FROM scheduled_jobs WHERE status='pending'"
+        params: tuple = ()
+        if due_before is not None:
+            query += " AND due_at <= ?"
+            params = (due_before,)
+        with self._connect() as conn:
+            return [_row_to_job(row) for row in conn.execute(query + " ORDER BY due_at", params)]
+
+    def claim(self, job_ids: Iterable[str]) -> List[str]:
+        """Moves pending jobs to ``running``; returns the ids this caller claimed."""
+
+        claimed: List[str] = []
+        with self._connect() as conn:
+            for job_id in job_ids:
+                cursor = conn.execute(
+                    "UPDATE scheduled_jobs SET status='running', updated_at=datetime('now') WHERE id=? AND status='pending'",
+                    (job_id,),
+                )
+                if cursor.rowcount:
+                    claimed.append(job_id)
+        return claimed
+
+    def running(self, job_ids: Iterable[str]) -> List[str]:
+        """Returns which of ``job_ids`` are still claimed, i.e. were not cancelled meanwhile."""
+
+        wanted = list(job_ids)
+        if not wanted:
+            return []
+        marks = ",".join("?" * len(wanted))
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT id FROM scheduled_jobs WHERE status='running' AND id IN ({marks})", wanted)
+            return [row["id"] for row in rows]
+
+    def release_running(self) -> int:
+        """Puts jobs left ``running`` back to ``pending``; returns how many there were."""
+
+        with self._connect() as conn:
+            return conn.execute("UPDATE scheduled_jobs SET status='pending' WHERE status='running'").rowcount
+
+    def mark(self, job_ids: Iterable[str], status: str, error: Optional[str] = None) -> None:
+        """Settles claimed jobs; a job cancelled in the meantime stays cancelled."""
+
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE scheduled_jobs SET status=?, last_error=?, updated_at=datetime('now') WHERE id=? AND status='running'",
+                [(status, error, job_id) for job_id in job_ids],
+            )
+
+    def cancel(self, job_id: str) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE scheduled_jobs SET status='cancelled', updated_at=datetime('now') "
+                "WHERE id=? AND status IN ('pending','running')",
+                (job_id,),
+            )
+            return cursor.rowcount > 0
+
+    def cancel_matching(self, store_id: str, action: models.JobAction) -> List[str]:
+        """Cancels a store's not yet fired ``action`` jobs; returns their ids."""
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            job_ids = [
+                row["id"]
+                for row in conn.execute(
+                    "SELECT id FROM scheduled_jobs WHERE store_id=? AND action=? AND status IN ('pending','running')",
+                    (store_id, action.value),
+                )
+            ]
+            conn.executemany(
+                "UPDATE scheduled_jobs SET status='cancelled', updated_at=datetime('now') WHERE id=?",
+                [(job_id,) for job_id in job_ids],
+            )
+        return job_ids
@@ -0,0 +1,132 @@
+"""Per-platform circuit breaker driven by error severity."""
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Collection, Dict, Iterable, List, Optional, Tuple
+
+from domain import models
+from .errors import ErrorSeverity, classify
+
+BreakerKey = Tuple[models.Platform, Optional[str]]
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(slots=True)
+class BreakerStatus:
+    platform: models.Platform
+    selector_version: Optional[str]
+    state: BreakerState
+    failures: int = 0
+    last_code: Optional[str] = None
+    opened_at: Optional[float] = None
+    probing: bool = False
+
+
+class CircuitBreaker:
+    """Stops calling a platform after ``threshold`` consecutive High-severity failures.
+
+    An open breaker fails calls fast for ``cooldown`` seconds, then turns
+    half-open and lets exactly one probe through: success closes it, another
+    High failure re-opens it for a new cooldown. Lower-severity failures
+    (validation, timeouts, rate limits) neither trip nor reset it, and neither
+    do High codes in ``shop_scoped`` such as a single shop's rejected
+    credentials. With ``per_selector_version`` each selector version gets its
+    own breaker, so a hotfixed selector map is tried immediately.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 3,
+        cooldown: float = 120.0,
+        per_selector_version: bool = False,
+        shop_scoped: Collection[str] = ("AUTH_INVALID",),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if threshold < 1:
+            raise ValueError("threshold must be at least 1")
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.per_selector_version = per_selector_version
+        self.shop_scoped = frozenset(shop_scoped)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._breakers: Dict[BreakerKey, BreakerStatus] = {}
+
+    def __reduce__(self) -> Tuple[object, ...]:
+        # Only the configuration crosses process boundaries; every shard worker trips on its own.
+        return (type(self), (self.threshold, self.cooldown, self.per_selector_version, tuple(self.shop_scoped)))
+
+    def _key(self, platform: models.Platform, selector_version: Optional[str]) -> BreakerKey:
+        return (platform, selector_version if self.per_selector_version else None)
+
+    def _status(self, key: BreakerKey) -> BreakerStatus:
+        status = self._breakers.get(key)
+        if status is None:
+            status = self._breakers[key] = BreakerStatus(key[0], key[1], BreakerState.CLOSED)
+        return status
+
+    def allow(self, platform: models.Platform, selector_version: Optional[str] = None) -> Optional[str]:
+        """Returns None when the call may proceed, otherwise the reason it is refused."""
+
+        with self._lock:
+            status = self._breakers.get(self._key(platform, selector_version))
+            if status is None or status.state is BreakerState.CLOSED:
+                return None
+            if status.state is BreakerState.OPEN:
+                remaining = (status.opened_at or 0.0) + self.cooldown - self._clock()
+                if remaining > 0:
+                    return f"CIRCUIT_OPEN: {platform.value} blocked after {status.last_code}, retry in {remaining:.0f}s"
+                status.state = BreakerState.HALF_OPEN
+            if status.probing:
+                return f"CIRCUIT_OPEN: {platform.value} probe in progress after {status.last_code}"
+            status.probing = True
+            return None
+
+    def record(
+        self, platform: models.Platform, selector_version: Optional[str], success: bool, messages: Iterable[str] = ()
+    ) -> Optional[BreakerState]:
+        """Feeds a call result back; returns the new state when it changed."""
+
+        descriptor = None if success else classify(messages)
+        with self._lock:
+            status = self._status(self._key(platform, selector_version))
+            before = status.state
+            status.probing = False
+            if success:
+                status.state, status.failures, status.opened_at = BreakerState.CLOSED, 0, None
+            elif (
+                descriptor is not None
+                and descriptor.severity is ErrorSeverity.HIGH
+                and descriptor.code not in self.shop_scoped
+            ):
+                status.failures += 1
+                status.last_code = descriptor.code
+                if status.state is BreakerState.HALF_OPEN or status.failures >= self.threshold:
+                    status.state, status.opened_at = BreakerState.OPEN, self._clock()
+            # Any other failure is inconclusive: a half-open breaker waits for the next probe.
+            return status.state if status.state is not before else None
+
+    def reset(self, platform: Optional[models.Platform] = None) -> int:
+        with self._lock:
+            keys = [key for key in self._breakers if platform is None or key[0] == platform]
+            for key in keys:
+                del self._breakers[key]
+        return len(keys)
+
+    def snapshot(self) -> List[BreakerStatus]:
+        with self._lock:
+            statuses = [dataclasses.replace(status) for status in self._breakers.values()]
+        now = self._clock()
+        for status in statuses:
+            if status.state is BreakerState.OPEN and now - (status.opened_at or 0.0) >= self.cooldown:
+                status.state = BreakerState.HALF_OPEN
+        return statuses
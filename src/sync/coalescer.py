@@ -0,0 +1,246 @@
+"""Pending-change buffer that merges bursty deltas before they reach a portal."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from domain import models
+from .outcome import SyncOutcome
+
+Key = Tuple[str, models.Platform]
+FlushSink = Callable[[models.Store, models.Platform, models.UnifiedDelta], object]
+
+_log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _Pending:
+    store: models.Store
+    first_seen: float
+    last_seen: float
+    baseline: Dict[Tuple[str, str], object] = field(default_factory=dict)
+    latest: Dict[Tuple[str, str], object] = field(default_factory=dict)
+    baseline_items: Dict[str, models.Item] = field(default_factory=dict)
+    items: Dict[str, models.Item] = field(default_factory=dict)
+    # Flushes of this key that raised so far.
+    attempts: int = 0
+
+
+def _field_changes(delta: models.UnifiedDelta) -> Dict[Tuple[str, str], object]:
+    changes: Dict[Tuple[str, str], object] = {}
+    for item in delta.updated_items:
+        changes[(item.id, "price")] = item.price
+        changes[(item.id, "available")] = item.available
+    for item_id, sold_out in delta.sold_out_items.items():
+        changes[(item_id, "available")] = not sold_out
+    for item_id, available in delta.toggled_items.items():
+        changes[(item_id, "available")] = available
+    for item_id, price in delta.price_updates.items():
+        changes[(item_id, "price")] = price
+    return changes
+
+
+class DeltaCoalescer:
+    """Merges successive ``UnifiedDelta``s per (store, platform).
+
+    Fields are last-write-wins. When the caller passes the items as they were
+    before the first edit (``before``), or just their availability
+    (``available_before``), fields that end up back at their original value
+    are dropped, so an A→B→A price change or a sold-out that is restocked
+    within the window never reaches the portal. A key is flushed once it has
+    been quiet for ``window`` seconds, or ``max_delay`` seconds after its first
+    edit under a continuous stream of changes, or whenever ``flush`` is called.
+
+    A flush whose sink raises is put back, merged under any edits made since,
+    and retried after another window, up to ``max_attempts`` times. A sink that
+    returns a ``SyncOutcome`` which was not applied is logged and not retried.
+    """
+
+    def __init__(
+        self,
+        sink: FlushSink,
+        window: float = 30.0,
+        max_delay: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        max_attempts: int = 3,
+    ) -> None:
+        self._sink = sink
+        self._window = window
+        self.max_attempts = max_attempts
+        self._max_delay = max_delay if max_delay is not None else window * 4
+        self._clock = clock
+        self._pending: Dict[Key, _Pending] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def submit(
+        self,
+        store: models.Store,
+        platform: models.Platform,
+        delta: models.UnifiedDelta,
+        before: Optional[Iterable[models.Item]] = None,
+        available_before: Optional[Mapping[str, bool]] = None,
+    ) -> None:
+        now = self._clock()
+        before_index = {item.id: item for item in before or []}
+        available_before = available_before or {}
+        with self._cond:
+            key = (store.id, platform)
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _Pending(store=store, first_seen=now, last_seen=now)
+            pending.store = store
+            pending.last_seen = now
+            for (item_id, name), value in _field_changes(delta).items():
+                original = before_index.get(item_id)
+                if (item_id, name) not in pending.latest:
+                    if original is not None:
+                        pending.baseline[(item_id, name)] = getattr(original, name)
+                    elif name == "available" and item_id in available_before:
+                        pending.baseline[(item_id, name)] = available_before[item_id]
+                pending.latest[(item_id, name)] = value
+            for item in delta.updated_items:
+                if item.id not in pending.items and item.id in before_index:
+                    pending.baseline_items[item.id] = before_index[item.id]
+                pending.items[item.id] = item
+            self._cond.notify_all()
+
+    def pending(self) -> List[Key]:
+        with self._cond:
+            return list(self._pending)
+
+    def _build_delta(self, pending: _Pending) -> models.UnifiedDelta:
+        delta = models.UnifiedDelta()
+        for item_id, item in pending.items.items():
+            original = pending.baseline_items.get(item_id)
+            if original is None or original.name != item.name or original.desc != item.desc:
+                delta.updated_items.append(item)
+        for (item_id, name), value in pending.latest.items():
+            if (item_id, name) in pending.baseline and pending.baseline[(item_id, name)] == value:
+                continue
+            if name == "price":
+                delta.price_updates[item_id] = value  # type: ignore[assignment]
+            else:
+                delta.toggled_items[item_id] = bool(value)
+                delta.sold_out_items[item_id] = not value
+        return delta
+
+    def _take(self, keys: Iterable[Key]) -> List[Tuple[_Pending, models.UnifiedDelta, models.Platform]]:
+        taken = []
+        for key in keys:
+            pending = self._pending.pop(key, None)
+            if pending is not None:
+                taken.append((pending, self._build_delta(pending), key[1]))
+        return taken
+
+    def _emit(self, batch: List[Tuple[_Pending, models.UnifiedDelta, models.Platform]]) -> int:
+        flushed = 0
+        for pending, delta, platform in batch:
+            if not (delta.updated_items or delta.price_updates or delta.toggled_items):
+                continue
+            try:
+                result = self._sink(pending.store, platform, delta)
+            except Exception:
+                _log.exception("Flushing %s:%s failed", pending.store.id, platform.value)
+                self._requeue(pending, platform)
+                continue
+            if isinstance(result, SyncOutcome) and not result.applied:
+                errors = "; ".join(result.result.errors or [result.result.message])
+                _log.error("Flushing %s:%s was not applied: %s", pending.store.id, platform.value, errors)
+                continue
+            flushed += 1
+        return flushed
+
+    def _requeue(self, pending: _Pending, platform: models.Platform) -> None:
+        pending.attempts += 1
+        if pending.attempts >= self.max_attempts:
+            _log.error("Dropping changes for %s:%s after %d failed flushes", pending.store.id, platform.value, pending.attempts)
+            return
+        with self._cond:
+            key = (pending.store.id, platform)
+            newer = self._pending.get(key)
+            pending.last_seen = self._clock()
+            if newer is not None:
+                # Edits made during the failed flush win; the older baseline still decides what cancels out.
+                pending.store = newer.store
+                for field_key, value in newer.baseline.items():
+                    pending.baseline.setdefault(field_key, value)
+                pending.latest.update(newer.latest)
+                for item_id, item in newer.baseline_items.items():
+                    pending.baseline_items.setdefault(item_id, item)
+                pending.items.update(newer.items)
+            self._pending[key] = pending
+            self._cond.notify_all()
+
+    def _due_keys(self, now: float) -> List[Key]:
+        return [
+            key
+            for key, pending in self._pending.items()
+            if now - pending.last_seen >= self._window or now - pending.first_seen >= self._max_delay
+        ]
+
+    def flush_due(self) -> int:
+        """Flushes every key whose debounce window elapsed; returns the number of deltas sent."""
+
+        with self._cond:
+            batch = self._take(self._due_keys(self._clock()))
+        return self._emit(batch)
+
+    def flush(self, store_id: Optional[str] = None, platform: Optional[models.Platform] = None) -> int:
+        """Flushes pending changes immediately, optionally only for one store and/or platform."""
+
+        with self._cond:
+            keys = [
+                key
+                for key in self._pending
+                if (store_id is None or key[0] == store_id) and (platform is None or key[1] == platform)
+            ]
+            batch = self._take(keys)
+        return self._emit(batch)
+
+    def _next_deadline(self) -> Optional[float]:
+        deadlines = [
+            min(pending.last_seen + self._window, pending.first_seen + self._max_delay)
+            for pending in self._pending.values()
+        ]
+        return min(deadlines) if deadlines else None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopping:
+                    deadline = self._next_deadline()
+                    now = self._clock()
+                    if deadline is not None and deadline <= now:
+                        break
+                    self._cond.wait(None if deadline is None else deadline - now)
+                if self._stopping:
+                    return
+            try:
+                self.flush_due()
+            except Exception:
+                _log.exception("Delta flush failed")
+
+    def start(self) -> None:
+        """Starts a background thread that flushes keys as their windows elapse."""
+
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="delta-coalescer", daemon=True)
+            self._thread.start()
+
+    def stop(self, flush: bool = True) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+        if flush:
+            self.flush()
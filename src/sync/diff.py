@@ -2,9 +2,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from domain import models
+from domain.external_ids import ExternalIds
 
 
 @dataclass(slots=True)
@@ -14,9 +15,16 @@ class DiffSummary:
     availability_changed: List[Tuple[str, bool, bool]]
 
 
-def calculate_delta(unified: Iterable[models.Item], platform: Iterable[models.Item]) -> Tuple[models.UnifiedDelta, DiffSummary]:
+def calculate_delta(
+    unified: Iterable[models.Item], platform: Iterable[models.Item], ids: Optional[ExternalIds] = None
+) -> Tuple[models.UnifiedDelta, DiffSummary]:
+    """Diffs on catalog ids; with ``ids`` the platform items are matched through their portal ids."""
+
     unified_index: Dict[str, models.Item] = {item.id: item for item in unified}
-    platform_index: Dict[str, models.Item] = {item.id: item for item in platform}
+    if ids is None or not ids.to_item:
+        platform_index: Dict[str, models.Item] = {item.id: item for item in platform}
+    else:
+        platform_index = {ids.item_id(item.id): item for item in platform}
 
     updated_items: List[models.Item] = []
     price_updates: Dict[str, int] = {}
@@ -52,3 +60,28 @@ def calculate_delta(unified: Iterable[models.Item], platform: Iterable[models.It
     )
     summary = DiffSummary(updated=updated, price_changed=price_changed, availability_changed=availability_changed)
     return delta, summary
+
+
+def summarize_delta(delta: models.UnifiedDelta, before: Iterable[models.Item] = ()) -> DiffSummary:
+    """Builds a summary for a delta that was planned without a full diff.
+
+    Previous values come from ``before`` when available; unknown ones are
+    reported as ``None``.
+    """
+
+    before_index: Dict[str, models.Item] = {item.id: item for item in before}
+    price_changed = [
+        (item_id, getattr(before_index.get(item_id), "price", None), price) for item_id, price in delta.price_updates.items()
+    ]
+    availability = dict(delta.toggled_items)
+    for item_id, sold_out in delta.sold_out_items.items():
+        availability.setdefault(item_id, not sold_out)
+    availability_changed = [
+        (item_id, getattr(before_index.get(item_id), "available", None), available)
+        for item_id, available in availability.items()
+    ]
+    return DiffSummary(
+        updated=[item.id for item in delta.updated_items],
+        price_changed=price_changed,  # type: ignore[arg-type]
+        availability_changed=availability_changed,  # type: ignore[arg-type]
+    )
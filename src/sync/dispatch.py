@@ -0,0 +1,150 @@
+"""Priority lanes that let urgent portal work overtake queued bulk syncs."""
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Collection, Dict, Iterator, List, Optional, Set
+
+from domain import models
+from .metrics import MetricsRegistry
+
+
+class Lane(str, Enum):
+    URGENT = "urgent"
+    NORMAL = "normal"
+    BULK = "bulk"
+
+
+_RANK = {Lane.URGENT: 0, Lane.NORMAL: 1, Lane.BULK: 2}
+
+
+@dataclass(slots=True)
+class _Ticket:
+    seq: int
+    lane: Lane
+    platforms: Set[models.Platform]
+    queued_at: float
+    granted_at: Optional[float] = None
+    # Times a later ticket from a higher lane was let in first.
+    skipped: int = 0
+
+
+class PriorityDispatcher:
+    """Admits portal work in lane order, holding one slot per platform while it runs.
+
+    Callers run the work on their own thread; ``slot`` blocks until the
+    ticket is admitted. A platform's slot is held by one unit of work at a
+    time, so its connector is never driven concurrently, while work on other
+    platforms runs alongside. Waiting tickets are considered urgent first,
+    then normal, then bulk, FIFO within a lane. A ticket that cannot start yet
+    reserves its platforms, so lower lanes cannot keep taking the slots it
+    waits for. A ticket passed over ``max_skips`` times by higher lanes is
+    promoted ahead of them, so bulk work always progresses. Bulk callers
+    should take one slot per chunk (e.g. per store); urgent work queued in
+    the meantime starts as soon as the chunk holding its platforms finishes.
+
+    Slots are re-entrant per thread: a nested ``slot`` call only waits for
+    platforms the thread does not hold yet. Waiting for more platforms while
+    holding some can deadlock against another thread doing the same, so an
+    outer slot should cover everything its nested work touches.
+    """
+
+    def __init__(
+        self,
+        platforms: Collection[models.Platform] = tuple(models.Platform),
+        max_skips: int = 8,
+        metrics: Optional[MetricsRegistry] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.platforms = frozenset(platforms)
+        self.max_skips = max_skips
+        self.metrics = metrics
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting: List[_Ticket] = []
+        self._busy: Set[models.Platform] = set()
+        self._local = threading.local()
+
+    def _held(self) -> Set[models.Platform]:
+        held = getattr(self._local, "held", None)
+        if held is None:
+            held = self._local.held = set()
+        return held
+
+    def _grant(self) -> None:
+        # Called with the condition held; admits every ticket that fits, in priority order.
+        reserved: Set[models.Platform] = set()
+        granted: List[_Ticket] = []
+        for ticket in sorted(self._waiting, key=lambda t: (t.skipped < self.max_skips, _RANK[t.lane], t.seq)):
+            if ticket.platforms & (self._busy | reserved):
+                reserved |= ticket.platforms
+                continue
+            self._busy |= ticket.platforms
+            ticket.granted_at = self._clock()
+            granted.append(ticket)
+        if not granted:
+            return
+        for ticket in granted:
+            self._waiting.remove(ticket)
+        for ticket in self._waiting:
+            ticket.skipped += sum(1 for other in granted if _RANK[other.lane] < _RANK[ticket.lane] and other.seq > ticket.seq)
+        self._cond.notify_all()
+
+    def acquire(self, lane: Lane, platforms: Optional[Collection[models.Platform]] = None) -> Optional[_Ticket]:
+        """Blocks until ``platforms`` (default: all) are free; returns None when this thread already holds them."""
+
+        held = self._held()
+        needed = set(platforms if platforms is not None else self.platforms) & self.platforms
+        needed -= held
+        if not needed:
+            return None
+        ticket = _Ticket(next(self._seq), lane, needed, self._clock())
+        with self._cond:
+            self._waiting.append(ticket)
+            self._grant()
+            while ticket.granted_at is None:
+                self._cond.wait()
+        held |= needed
+        if self.metrics is not None:
+            self.metrics.observe(
+                "dispatch_wait_seconds",
+                "Time portal work waited for its platforms, per priority lane.",
+                ticket.granted_at - ticket.queued_at,
+                lane=lane.value,
+            )
+        return ticket
+
+    def release(self, ticket: Optional[_Ticket]) -> None:
+        if ticket is None:
+            return
+        self._held().difference_update(ticket.platforms)
+        with self._cond:
+            self._busy -= ticket.platforms
+            self._grant()
+        if self.metrics is not None and ticket.granted_at is not None:
+            self.metrics.observe(
+                "dispatch_run_seconds",
+                "Time portal work held its platform slots, per priority lane.",
+                self._clock() - ticket.granted_at,
+                lane=ticket.lane.value,
+            )
+
+    @contextmanager
+    def slot(self, lane: Lane, platforms: Optional[Collection[models.Platform]] = None) -> Iterator[None]:
+        ticket = self.acquire(lane, platforms)
+        try:
+            yield
+        finally:
+            self.release(ticket)
+
+    def waiting(self) -> Dict[Lane, int]:
+        with self._cond:
+            counts = {lane: 0 for lane in Lane}
+            for ticket in self._waiting:
+                counts[ticket.lane] += 1
+            return counts
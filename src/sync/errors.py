@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict
+from typing import Dict, Iterable, Optional
 
 
 class ErrorSeverity(str, Enum):
@@ -100,6 +100,13 @@ ERRORS: Dict[str, ErrorDescriptor] = {
         recovery="Requeue failed subset",
         user_hint="실패 항목만 재시도할 수 있습니다.",
     ),
+    "CIRCUIT_OPEN": ErrorDescriptor(
+        code="CIRCUIT_OPEN",
+        severity=ErrorSeverity.MEDIUM,
+        reason="Platform skipped after repeated high-severity failures",
+        recovery="Wait for the half-open probe or reset the breaker",
+        user_hint="플랫폼 장애로 잠시 작업을 건너뜁니다. 복구되면 자동으로 재개됩니다.",
+    ),
     "SNAPSHOT_MISMATCH": ErrorDescriptor(
         code="SNAPSHOT_MISMATCH",
         severity=ErrorSeverity.LOW,
@@ -108,3 +115,13 @@ ERRORS: Dict[str, ErrorDescriptor] = {
         user_hint="반영까지 다소 시간이 걸릴 수 있습니다.",
     ),
 }
+
+
+def classify(messages: Iterable[str]) -> Optional[ErrorDescriptor]:
+    """Finds the first known code in messages such as ``"CAPTCHA_BLOCKED: challenge shown"``."""
+
+    for message in messages:
+        code = message.split(":", 1)[0].strip()
+        if code in ERRORS:
+            return ERRORS[code]
+    return None
@@ -0,0 +1,147 @@
+"""Header-only probing of local menu images (PNG, JPEG, WebP)."""
+from __future__ import annotations
+
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple
+
+# JPEG start-of-frame markers carry the dimensions; C4 (DHT), C8 (JPG) and CC (DAC) share the range but do not.
+_JPEG_SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+_JPEG_STANDALONE = frozenset(range(0xD0, 0xD8)) | {0x01}
+
+
+class ImageFormatError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class ImageProbe:
+    """What the portals' upload limits need to know about one file."""
+
+    size: int
+    format: Optional[str] = None
+    width: int = 0
+    height: int = 0
+    error: Optional[str] = None
+
+
+def _read(stream: BinaryIO, count: int) -> bytes:
+    data = stream.read(count)
+    if len(data) < count:
+        raise ImageFormatError("이미지 헤더가 잘려 있습니다")
+    return data
+
+
+def _jpeg_dimensions(stream: BinaryIO) -> Tuple[int, int]:
+    # Walks the marker segments, seeking over their payloads, until a start-of-frame.
+    while True:
+        if _read(stream, 1) != b"\xff":
+            raise ImageFormatError("JPEG 마커가 올바르지 않습니다")
+        marker = _read(stream, 1)[0]
+        while marker == 0xFF:
+            marker = _read(stream, 1)[0]
+        if marker == 0xD9:
+            raise ImageFormatError("JPEG 크기 정보가 없습니다")
+        if marker in _JPEG_STANDALONE:
+            continue
+        (length,) = struct.unpack(">H", _read(stream, 2))
+        if marker in _JPEG_SOF:
+            height, width = struct.unpack(">xHH", _read(stream, 5))
+            return width, height
+        stream.seek(length - 2, os.SEEK_CUR)
+
+
+def _webp_dimensions(header: bytes) -> Tuple[int, int]:
+    chunk = header[12:16]
+    if chunk == b"VP8 " and len(header) >= 30 and header[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and len(header) >= 25 and header[20] == 0x2F:
+        (bits,) = struct.unpack("<I", header[21:25])
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X" and len(header) >= 30:
+        return int.from_bytes(header[24:27], "little") + 1, int.from_bytes(header[27:30], "little") + 1
+    raise ImageFormatError("WebP 크기 정보가 없습니다")
+
+
+def read_image_header(path: Path) -> ImageProbe:
+    """Reads the format and pixel size from the first bytes of ``path``; never decodes pixels."""
+
+    size = path.stat().st_size
+    with path.open("rb") as stream:
+        header = stream.read(32)
+        if header.startswith(b"\x89PNG\r\n\x1a\n") and header[12:16] == b"IHDR":
+            width, height = struct.unpack(">II", header[16:24])
+            return ImageProbe(size, "png", width, height)
+        if header.startswith(b"\xff\xd8"):
+            stream.seek(2)
+            width, height = _jpeg_dimensions(stream)
+            return ImageProbe(size, "jpeg", width, height)
+        if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+            width, height = _webp_dimensions(header)
+            return ImageProbe(size, "webp", width, height)
+    raise ImageFormatError("지원하지 않는 이미지 형식입니다 (PNG/JPEG/WebP)")
+
+
+class ImageProbeCache:
+    """Probe results keyed by path and checked against the file's mtime and size.
+
+    A hit costs one ``stat``; an edited or replaced file is re-read. Misses
+    are probed on a thread pool of ``workers`` threads, since probing is
+    almost all file I/O.
+    """
+
+    def __init__(self, workers: int = 8, max_entries: int = 100_000) -> None:
+        self.workers = workers
+        self._max_entries = max_entries
+        self._entries: Dict[Path, Tuple[int, int, ImageProbe]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _probe(self, path: Path, stat: os.stat_result) -> ImageProbe:
+        try:
+            probe = read_image_header(path)
+        except ImageFormatError as exc:
+            probe = ImageProbe(stat.st_size, error=str(exc))
+        except OSError:
+            return ImageProbe(0, error="이미지 파일을 읽을 수 없습니다")
+        with self._lock:
+            if len(self._entries) >= self._max_entries:
+                self._entries.clear()
+            self._entries[path] = (stat.st_mtime_ns, stat.st_size, probe)
+        return probe
+
+    def probe_all(self, paths: Iterable[Path]) -> Dict[Path, ImageProbe]:
+        results: Dict[Path, ImageProbe] = {}
+        misses = []
+        for path in dict.fromkeys(paths):
+            try:
+                stat = path.stat()
+            except OSError:
+                results[path] = ImageProbe(0, error="이미지 파일을 찾을 수 없습니다")
+                continue
+            with self._lock:
+                cached = self._entries.get(path)
+                fresh = cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size)
+                if fresh:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            if fresh:
+                results[path] = cached[2]
+            else:
+                misses.append((path, stat))
+        if len(misses) > 1 and self.workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(misses)), thread_name_prefix="image") as pool:
+                results.update(zip((path for path, _ in misses), pool.map(lambda miss: self._probe(*miss), misses)))
+        else:
+            results.update((path, self._probe(path, stat)) for path, stat in misses)
+        return results
+
+    def __len__(self) -> int:
+        return len(self._entries)
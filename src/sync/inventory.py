@@ -0,0 +1,180 @@
+"""Stock tracking that turns depleted items into batched sold-out deltas."""
+from __future__ import annotations
+
+import dataclasses
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from domain import models
+from infrastructure.inventory_store import InventoryStore
+from .coalescer import DeltaCoalescer
+
+StoreResolver = Callable[[str], Optional[models.Store]]
+
+
+@dataclass(slots=True)
+class StockEvent:
+    """A stock movement. ``qty`` sets an absolute count (e.g. a restock) and wins over ``delta``."""
+
+    store_id: str
+    item_id: str
+    delta: int = 0
+    qty: Optional[int] = None
+    low: Optional[int] = None
+
+
+def load_stock_event(data: Dict[str, Any], default_store: Optional[str] = None) -> StockEvent:
+    store_id = data.get("store_id") or default_store
+    if not store_id:
+        raise ValueError(f"Stock event for {data.get('item_id')} has no store_id")
+    return StockEvent(
+        store_id=store_id,
+        item_id=data["item_id"],
+        delta=int(data.get("delta", 0)),
+        qty=int(data["qty"]) if data.get("qty") is not None else None,
+        low=int(data["low"]) if data.get("low") is not None else None,
+    )
+
+
+def _depleted(inventory: models.Inventory) -> bool:
+    return inventory.qty is not None and inventory.qty <= (inventory.low or 0)
+
+
+class InventoryService:
+    """Keeps stock counts in memory and marks items sold out when they run low.
+
+    Events only touch in-memory counters; an item that crosses its ``low``
+    threshold (or zero) queues a sold-out delta on the ``DeltaCoalescer``, and
+    a restock above the threshold queues the reverse. The coalescer merges
+    those per (store, platform), so a burst of orders costs one portal call
+    per platform, and an item that runs out and is restocked before the
+    window closes costs none. Counts are written back to ``InventoryStore`` every
+    ``persist_interval`` seconds and on ``flush``/``stop``. Items without a
+    stored count are treated as unlimited until an event sets one.
+    """
+
+    def __init__(
+        self,
+        inventory_store: InventoryStore,
+        resolve_store: StoreResolver,
+        coalescer: DeltaCoalescer,
+        persist_interval: float = 5.0,
+    ) -> None:
+        self._inventory_store = inventory_store
+        self._resolve_store = resolve_store
+        self._coalescer = coalescer
+        self._persist_interval = persist_interval
+        self._counts: Dict[str, Dict[str, models.Inventory]] = {}
+        self._sold_out: Dict[str, Set[str]] = {}
+        self._dirty: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def _inventories(self, store_id: str) -> Dict[str, models.Inventory]:
+        counts = self._counts.get(store_id)
+        if counts is None:
+            counts = self._counts[store_id] = self._inventory_store.load(store_id)
+            self._sold_out[store_id] = {item_id for item_id, inv in counts.items() if inv.auto_sold_out and _depleted(inv)}
+        return counts
+
+    def record(self, events: Iterable[StockEvent]) -> int:
+        """Applies stock events; returns how many sold-out/restock transitions were queued."""
+
+        transitions: Dict[str, Dict[str, bool]] = {}
+        # Availability before the first transition of each item, so the coalescer can cancel round trips.
+        available_before: Dict[str, Dict[str, bool]] = {}
+        with self._lock:
+            for event in events:
+                counts = self._inventories(event.store_id)
+                inventory = counts.get(event.item_id)
+                if inventory is None:
+                    if event.qty is None:
+                        continue
+                    inventory = counts[event.item_id] = models.Inventory(
+                        item_id=event.item_id, type=models.InventoryType.COUNT, qty=0
+                    )
+                if inventory.type != models.InventoryType.COUNT:
+                    continue
+                if event.low is not None:
+                    inventory.low = event.low
+                base = event.qty if event.qty is not None else (inventory.qty or 0) + event.delta
+                inventory.qty = max(0, base)
+                self._dirty.setdefault(event.store_id, set()).add(event.item_id)
+                if not inventory.auto_sold_out:
+                    continue
+                sold_out = self._sold_out[event.store_id]
+                depleted = _depleted(inventory)
+                if depleted != (event.item_id in sold_out):
+                    available_before.setdefault(event.store_id, {}).setdefault(event.item_id, event.item_id not in sold_out)
+                    if depleted:
+                        sold_out.add(event.item_id)
+                    else:
+                        sold_out.discard(event.item_id)
+                    transitions.setdefault(event.store_id, {})[event.item_id] = depleted
+
+        for store_id, changes in transitions.items():
+            store = self._resolve_store(store_id)
+            if store is None:
+                continue
+            delta = models.UnifiedDelta(
+                toggled_items={item_id: not flag for item_id, flag in changes.items()},
+                sold_out_items=dict(changes),
+            )
+            for binding in store.bindings:
+                self._coalescer.submit(store, binding.platform, delta, available_before=available_before[store_id])
+        return sum(len(changes) for changes in transitions.values())
+
+    def levels(self, store_id: str) -> List[models.Inventory]:
+        with self._lock:
+            return [dataclasses.replace(inv) for inv in self._inventories(store_id).values()]
+
+    def sold_out(self, store_id: str) -> List[str]:
+        with self._lock:
+            self._inventories(store_id)
+            return sorted(self._sold_out[store_id])
+
+    def persist(self) -> int:
+        """Writes counts changed since the last call; returns the number of rows written."""
+
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            rows = {
+                store_id: [dataclasses.replace(self._counts[store_id][item_id]) for item_id in item_ids]
+                for store_id, item_ids in dirty.items()
+            }
+        for store_id, inventories in rows.items():
+            self._inventory_store.save_many(store_id, inventories)
+        return sum(len(inventories) for inventories in rows.values())
+
+    def flush(self) -> int:
+        """Sends queued deltas and persists counts now; returns the number of deltas sent."""
+
+        sent = self._coalescer.flush()
+        self.persist()
+        return sent
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._persist_interval):
+            self.persist()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._coalescer.start()
+        self._thread = threading.Thread(target=self._run, name="inventory-persist", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopped.set()
+            thread.join()
+            self._coalescer.stop(flush=True)
+        self.persist()
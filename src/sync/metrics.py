@@ -0,0 +1,218 @@
+"""Per-stage timing spans and Prometheus-style metrics for the sync pipeline."""
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Protocol, Sequence, Tuple
+
+from .outcome import SyncOutcome
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class StageObserver(Protocol):
+    def enter(self, stage: str) -> None:
+        ...
+
+    def exit(self, stage: str) -> None:
+        ...
+
+
+# Profilers hook in here; the list is empty in normal runs so spans stay cheap.
+_observers: List[StageObserver] = []
+
+
+def add_stage_observer(observer: StageObserver) -> None:
+    _observers.append(observer)
+
+
+def remove_stage_observer(observer: StageObserver) -> None:
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+@contextmanager
+def observed_stage(stage: str) -> Iterator[None]:
+    """Marks a stage for observers only, for code that is not timed per outcome."""
+
+    if not _observers:
+        yield
+        return
+    for observer in _observers:
+        observer.enter(stage)
+    try:
+        yield
+    finally:
+        for observer in reversed(_observers):
+            observer.exit(stage)
+
+
+class StageTimer:
+    """Accumulates wall-clock seconds per pipeline stage (login, fetch, diff, ...)."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            with observed_stage(stage):
+                yield
+        finally:
+            self.stages[stage] = self.stages.get(stage, 0.0) + time.perf_counter() - started
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, buckets: int) -> None:
+        self.counts = [0] * buckets
+        self.total = 0.0
+        self.count = 0
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+@dataclass(slots=True)
+class MetricsState:
+    """Picklable copy of a registry's series (see ``MetricsRegistry.drain``)."""
+
+    help: Dict[str, str]
+    counters: Dict[str, Dict[Labels, float]]
+    histograms: Dict[str, Dict[Labels, Tuple[List[int], float, int]]]
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms rendered in Prometheus text format.
+
+    ``record_outcome`` turns a ``SyncOutcome`` into an outcome counter plus one
+    histogram observation per timed stage, labelled by operation and platform.
+    """
+
+    def __init__(self, prefix: str = "baedal", buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self._prefix = prefix
+        self._buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, _Histogram]] = {}
+        self._help: Dict[str, str] = {}
+
+    def _name(self, name: str, help_text: str) -> str:
+        full = f"{self._prefix}_{name}"
+        self._help.setdefault(full, help_text)
+        return full
+
+    def inc(self, name: str, help_text: str, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(self._name(name, help_text), {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, help_text: str, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(self._name(name, help_text), {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(len(self._buckets))
+            index = bisect_left(self._buckets, value)
+            if index < len(self._buckets):
+                histogram.counts[index] += 1
+            histogram.total += value
+            histogram.count += 1
+
+    def record_outcome(self, operation: str, outcome: SyncOutcome) -> None:
+        platform = outcome.platform.value
+        if outcome.applied:
+            result = "applied"
+        elif outcome.validation_issues:
+            result = "rejected"
+        else:
+            result = "failed"
+        self.inc("sync_outcomes_total", "Sync outcomes per platform and result.", operation=operation, platform=platform, result=result)
+        for stage, seconds in outcome.timings.items():
+            self.observe(
+                "sync_stage_seconds",
+                "Time spent per sync pipeline stage.",
+                seconds,
+                operation=operation,
+                platform=platform,
+                stage=stage,
+            )
+
+    def drain(self) -> MetricsState:
+        """Returns everything recorded so far as plain data and resets the registry.
+
+        Used by shard workers to ship their metrics back to the parent process.
+        """
+
+        with self._lock:
+            state = MetricsState(
+                help=dict(self._help),
+                counters={name: dict(series) for name, series in self._counters.items()},
+                histograms={
+                    name: {labels: (list(h.counts), h.total, h.count) for labels, h in series.items()}
+                    for name, series in self._histograms.items()
+                },
+            )
+            self._counters.clear()
+            self._histograms.clear()
+        return state
+
+    def merge(self, state: MetricsState) -> None:
+        with self._lock:
+            for name, help_text in state.help.items():
+                self._help.setdefault(name, help_text)
+            for name, series in state.counters.items():
+                target = self._counters.setdefault(name, {})
+                for labels, value in series.items():
+                    target[labels] = target.get(labels, 0.0) + value
+            for name, histograms in state.histograms.items():
+                target_histograms = self._histograms.setdefault(name, {})
+                for labels, (counts, total, count) in histograms.items():
+                    histogram = target_histograms.get(labels)
+                    if histogram is None:
+                        histogram = target_histograms[labels] = _Histogram(len(self._buckets))
+                    histogram.counts = [a + b for a, b in zip(histogram.counts, counts)]
+                    histogram.total += total
+                    histogram.count += count
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines += [f"# HELP {name} {self._help[name]}", f"# TYPE {name} counter"]
+                lines += [f"{name}{_format_labels(labels)} {value:g}" for labels, value in sorted(series.items())]
+            for name, histograms in sorted(self._histograms.items()):
+                lines += [f"# HELP {name} {self._help[name]}", f"# TYPE {name} histogram"]
+                for labels, histogram in sorted(histograms.items()):
+                    cumulative = 0
+                    for bound, count in zip(self._buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels, [('le', f'{bound:g}')])} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.total:.6f}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        tmp.replace(path)
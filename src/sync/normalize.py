@@ -0,0 +1,133 @@
+"""Auto-normalisation of prices and option deltas to each platform's step rules."""
+from __future__ import annotations
+
+import dataclasses
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from domain import models
+from .preview import PlatformValidator, PreviewRuleEngine
+
+Rounder = Callable[[int], int]
+
+
+@dataclass(slots=True)
+class PriceAdjustment:
+    item_id: str
+    field: str
+    before: int
+    after: int
+
+
+@dataclass(slots=True)
+class NormalizationReport:
+    platform: models.Platform
+    adjustments: List[PriceAdjustment] = field(default_factory=list)
+
+    @property
+    def changed_items(self) -> List[str]:
+        return list(dict.fromkeys(adjustment.item_id for adjustment in self.adjustments))
+
+
+def make_rounder(mode: str, step: int, base: int = 0) -> Rounder:
+    """Returns a function snapping values onto ``base + k * step``.
+
+    ``nearest-step`` rounds half up, ``ceil-step`` always rounds up. Results
+    never go below ``base``.
+    """
+
+    if step <= 1:
+        return lambda value: max(base, value)
+    if mode == "ceil-step":
+        return lambda value: max(base, base - (-(value - base) // step) * step)
+    if mode == "nearest-step":
+        half = step / 2
+
+        def nearest(value: int) -> int:
+            quotient, remainder = divmod(value - base, step)
+            return max(base, base + (quotient + (1 if remainder >= half else 0)) * step)
+
+        return nearest
+    raise ValueError(f"Unknown rounding mode {mode}")
+
+
+class PriceNormalizer:
+    """Snaps a whole catalog onto each platform's price and option steps.
+
+    Prices and option deltas are gathered into flat columns and rounded in one
+    pass per platform; only items with an adjusted value are copied, all others
+    are shared with the input list.
+    """
+
+    def __init__(self, rule_engine: PreviewRuleEngine) -> None:
+        self._rules = rule_engine
+        self._rounders: Dict[models.Platform, Tuple[Rounder, Optional[Rounder]]] = {}
+
+    def _rounders_for(self, platform: models.Platform) -> Tuple[Rounder, Optional[Rounder]]:
+        rounders = self._rounders.get(platform)
+        if rounders is None:
+            validator: PlatformValidator = self._rules.validator(platform)
+            price = make_rounder(validator.rounding, validator.price_step, validator.price_min)
+            delta = None
+            if validator.delta_step:
+                # Option deltas may be zero or negative, so they are not clamped to a base.
+                delta_rounder = make_rounder(validator.rounding, validator.delta_step, 0)
+                step = validator.delta_step
+
+                def delta(value: int, _round: Rounder = delta_rounder, _step: int = step) -> int:
+                    return value if value % _step == 0 else (_round(value) if value > 0 else -_round(-value))
+
+            rounders = self._rounders[platform] = (price, delta)
+        return rounders
+
+    def normalize(
+        self, platform: models.Platform, items: Iterable[models.Item]
+    ) -> Tuple[List[models.Item], NormalizationReport]:
+        item_list = list(items)
+        round_price, round_delta = self._rounders_for(platform)
+        report = NormalizationReport(platform=platform)
+
+        prices = [item.price for item in item_list]
+        new_prices = [round_price(price) for price in prices]
+
+        deltas: List[Tuple[int, int, int, int]] = []
+        if round_delta is not None:
+            deltas = [
+                (item_index, group_index, option_index, option.price_delta)
+                for item_index, item in enumerate(item_list)
+                for group_index, group in enumerate(item.options)
+                for option_index, option in enumerate(group.options)
+            ]
+        new_deltas = [round_delta(value) for *_, value in deltas] if round_delta is not None else []
+
+        changed_prices = {index for index, (old, new) in enumerate(zip(prices, new_prices)) if old != new}
+        changed_options: Dict[int, List[Tuple[int, int, int]]] = {}
+        for (item_index, group_index, option_index, old), new in zip(deltas, new_deltas):
+            if old != new:
+                changed_options.setdefault(item_index, []).append((group_index, option_index, new))
+
+        result = list(item_list)
+        for index in sorted(changed_prices | set(changed_options)):
+            item = item_list[index]
+            updates: Dict[str, object] = {}
+            if index in changed_prices:
+                updates["price"] = new_prices[index]
+                report.adjustments.append(PriceAdjustment(item.id, "price", item.price, new_prices[index]))
+            if index in changed_options:
+                groups = list(item.options)
+                for group_index, option_index, new in changed_options[index]:
+                    group = groups[group_index]
+                    options = list(group.options)
+                    option = options[option_index]
+                    report.adjustments.append(PriceAdjustment(item.id, f"option:{option.id}", option.price_delta, new))
+                    options[option_index] = dataclasses.replace(option, price_delta=new)
+                    groups[group_index] = dataclasses.replace(group, options=options)
+                updates["options"] = groups
+            result[index] = dataclasses.replace(item, **updates)
+        return result, report
+
+    def normalize_all(
+        self, platforms: Sequence[models.Platform], items: Iterable[models.Item]
+    ) -> Dict[models.Platform, Tuple[List[models.Item], NormalizationReport]]:
+        item_list = list(items)
+        return {platform: self.normalize(platform, item_list) for platform in dict.fromkeys(platforms)}
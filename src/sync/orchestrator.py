@@ -1,26 +1,37 @@
 """High level orchestration of sync pipeline."""
 from __future__ import annotations
 
+import logging
+import time
 import uuid
-from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import asdict
 from datetime import datetime
-from typing import Dict, Iterable, List, Tuple
+from typing import AbstractSet, Callable, ContextManager, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
 
-from connectors.base import FileBackedConnector, SelectorMap
-from domain import models
+from connectors.base import IPlatformConnector
+from domain import models, serialization
+from domain.external_ids import ExternalIds
+from domain.templates import ResolvedCatalog, override_key
 from infrastructure.audit_logger import AuditLogger
-from infrastructure.catalog_repository import CatalogRepository
+from infrastructure.catalog_repository import CatalogRepository, merge_item_ids
 from infrastructure.credential_store import Credential, CredentialStore
 from . import diff, preview
+from .circuit import CircuitBreaker
+from .metrics import MetricsRegistry, StageTimer
+from .normalize import NormalizationReport, PriceNormalizer
+from .outcome import SyncOutcome, TemplateRollout
+from .reconcile import PendingCheck, ReconcileQueue, ReconcileResult, compare
+from .snapshot_cache import RemoteSnapshotCache
 
+_log = logging.getLogger(__name__)
 
-@dataclass(slots=True)
-class SyncOutcome:
-    platform: models.Platform
-    applied: bool
-    summary: diff.DiffSummary
-    result: models.ApplyResult
-    validation_issues: List[preview.ValidationIssue]
+# Entered around each chunk of bulk work with the stores it touches, e.g. to let urgent commands in between stores.
+Admission = Callable[[Sequence[models.Store]], ContextManager[object]]
+_TemplateWork = Tuple[
+    str, models.CredentialBinding, IPlatformConnector, models.UnifiedDelta, diff.DiffSummary, Optional[ExternalIds]
+]
 
 
 class SyncOrchestrator:
@@ -30,65 +41,178 @@ class SyncOrchestrator:
         credential_store: CredentialStore,
         audit_logger: AuditLogger,
         rule_engine: preview.PreviewRuleEngine,
-        connectors: Dict[models.Platform, FileBackedConnector],
+        connectors: Mapping[models.Platform, IPlatformConnector],
+        session_ttl: float = 0.0,
+        metrics: Optional[MetricsRegistry] = None,
+        snapshot_ttl: float = 0.0,
+        breaker: Optional[CircuitBreaker] = None,
+        reconciler: Optional[ReconcileQueue] = None,
     ) -> None:
         self._catalog = catalog
         self._credential_store = credential_store
         self._audit = audit_logger
         self._rules = rule_engine
         self._connectors = connectors
+        self._normalizer = PriceNormalizer(rule_engine)
+        # Long-running processes reuse portal sessions for ``session_ttl`` seconds.
+        self._session_ttl = session_ttl
+        self._sessions: Dict[Tuple[models.Platform, str], Tuple[float, models.AuthSession]] = {}
+        self.metrics = metrics
+        # Diffs and pause/hours comparisons read portal snapshots cached for ``snapshot_ttl`` seconds.
+        self._snapshots = RemoteSnapshotCache(snapshot_ttl)
+        self.breaker = breaker
+        # Successful applies are queued here and verified against the portal by ``reconcile``.
+        self.reconciler = reconciler
+
+    @property
+    def catalog(self) -> CatalogRepository:
+        return self._catalog
 
     def _load_credentials(self, binding: models.CredentialBinding) -> Credential:
         return self._credential_store.load(binding.cred_ref)
 
     def _login(self, binding: models.CredentialBinding) -> models.AuthSession:
+        key = (binding.platform, binding.shop_id)
+        if self._session_ttl > 0:
+            cached = self._sessions.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self._session_ttl:
+                return cached[1]
         connector = self._connectors[binding.platform]
         cred = self._load_credentials(binding)
-        return connector.login(binding, cred.username, cred.password)
+        session = connector.login(binding, cred.username, cred.password)
+        if self._session_ttl > 0:
+            self._sessions[key] = (time.monotonic(), session)
+        return session
+
+    def preview_normalization(
+        self, store: models.Store, unified_items: Iterable[models.Item]
+    ) -> Dict[models.Platform, Tuple[NormalizationReport, List[preview.ValidationIssue]]]:
+        """Reports the auto-fixes each bound platform would get and what would still fail."""
+
+        platforms = [binding.platform for binding in store.bindings if self._connectors.get(binding.platform)]
+        normalized = self._normalizer.normalize_all(platforms, unified_items)
+        return {
+            platform: (report, self._rules.validate(platform, items))
+            for platform, (items, report) in normalized.items()
+        }
+
+    def sync_store(
+        self,
+        store: models.Store,
+        unified_items: Iterable[models.Item],
+        actor: str,
+        auto_normalize: bool = False,
+        only_items: Optional[AbstractSet[str]] = None,
+    ) -> List[SyncOutcome]:
+        """Saves the unified catalog and pushes its differences to every bound platform.
 
-    def sync_store(self, store: models.Store, unified_items: Iterable[models.Item], actor: str) -> List[SyncOutcome]:
+        With ``only_items`` the items are taken to be the stored catalog already:
+        nothing is saved and only those ids are validated, diffed and applied.
+        """
+
+        # Store-wide stages run once and are reported on every platform's outcome.
+        shared = StageTimer()
         unified_items_list = list(unified_items)
-        snapshot = models.PlatformSnapshot(
-            platform=models.Platform.BAEMIN,  # placeholder; actual store state saved per platform
-            store_id=store.id,
-            items=unified_items_list,
-            hours=[],
-            state=models.StoreState(store_id=store.id),
-        )
-        self._catalog.save_snapshot(snapshot)
+        if only_items is None:
+            snapshot = models.PlatformSnapshot(
+                platform=models.Platform.BAEMIN,  # placeholder; actual store state saved per platform
+                store_id=store.id,
+                items=unified_items_list,
+                hours=[],
+                state=models.StoreState(store_id=store.id),
+            )
+            with shared.span("save"):
+                self._catalog.save_snapshot(snapshot)
+        else:
+            unified_items_list = [item for item in unified_items_list if item.id in only_items]
+        # Portals list items under their own ids; diff and apply translate through this index.
+        external_ids = self._catalog.external_ids(store.id)
+
+        bound = [(binding, self._connectors.get(binding.platform)) for binding in store.bindings]
+        bound = [(binding, connector) for binding, connector in bound if connector]
+        platforms = [binding.platform for binding, _ in bound]
+        normalized: Dict[models.Platform, Tuple[List[models.Item], NormalizationReport]] = {}
+        if auto_normalize:
+            with shared.span("normalize"):
+                normalized = self._normalizer.normalize_all(platforms, unified_items_list)
+            with shared.span("validate"):
+                issues_by_platform = {platform: self._rules.validate(platform, normalized[platform][0]) for platform in platforms}
+        else:
+            with shared.span("validate"):
+                issues_by_platform = self._rules.validate_all(platforms, unified_items_list)
 
         outcomes: List[SyncOutcome] = []
-        for binding in store.bindings:
-            connector = self._connectors.get(binding.platform)
-            if not connector:
-                continue
-            try:
+        for binding, connector in bound:
+            timer = StageTimer()
+            timer.stages.update(shared.stages)
+            platform_items, report = normalized.get(binding.platform, (unified_items_list, None))
+            issues = issues_by_platform[binding.platform]
+            outcome = self._guarded(
+                binding,
+                connector,
+                timer,
+                lambda: self._sync_binding(
+                    binding,
+                    connector,
+                    timer,
+                    platform_items,
+                    report,
+                    issues,
+                    only_items,
+                    actor,
+                    external_ids.get(binding.platform),
+                ),
+            )
+            outcomes.append(self._record("sync", outcome))
+        return outcomes
+
+    def _sync_binding(
+        self,
+        binding: models.CredentialBinding,
+        connector: IPlatformConnector,
+        timer: StageTimer,
+        platform_items: List[models.Item],
+        report: Optional[NormalizationReport],
+        issues: List[preview.ValidationIssue],
+        only_items: Optional[AbstractSet[str]],
+        actor: str,
+        ids: Optional[ExternalIds] = None,
+    ) -> SyncOutcome:
+        try:
+            with timer.span("login"):
                 session = self._login(binding)
-            except ValueError as exc:
-                outcomes.append(
-                    SyncOutcome(
-                        platform=binding.platform,
-                        applied=False,
-                        summary=diff.DiffSummary(updated=[], price_changed=[], availability_changed=[]),
-                        result=models.ApplyResult(success=False, message=str(exc), errors=[str(exc)]),
-                        validation_issues=[],
-                    )
-                )
-                continue
-            remote_snapshot = connector.fetch_snapshot(session)
-            delta, summary = diff.calculate_delta(unified_items_list, remote_snapshot.items)
-            issues = self._rules.validate(binding.platform, unified_items_list)
-            if issues:
-                outcome = SyncOutcome(
-                    platform=binding.platform,
-                    applied=False,
-                    summary=summary,
-                    result=models.ApplyResult(success=False, message="Validation failed", errors=[i.message for i in issues]),
-                    validation_issues=issues,
-                )
-                outcomes.append(outcome)
-                continue
-            result = connector.apply_changes(session, delta)
+        except ValueError as exc:
+            return SyncOutcome(
+                platform=binding.platform,
+                applied=False,
+                summary=diff.DiffSummary(updated=[], price_changed=[], availability_changed=[]),
+                result=models.ApplyResult(success=False, message=str(exc), errors=[str(exc)]),
+                validation_issues=[],
+                timings=timer.stages,
+            )
+        with timer.span("fetch"):
+            remote_snapshot = self._remote_snapshot(binding, connector, session)
+        with timer.span("diff"):
+            remote_items = remote_snapshot.items
+            if only_items is not None:
+                resolve = ids.item_id if ids is not None else str
+                remote_items = [item for item in remote_items if resolve(item.id) in only_items]
+            delta, summary = diff.calculate_delta(platform_items, remote_items, ids)
+        if issues:
+            return SyncOutcome(
+                platform=binding.platform,
+                applied=False,
+                summary=summary,
+                result=models.ApplyResult(success=False, message="Validation failed", errors=[i.message for i in issues]),
+                validation_issues=issues,
+                normalization=report,
+                timings=timer.stages,
+            )
+        with timer.span("apply"):
+            portal_delta = ids.to_portal(delta) if ids is not None else delta
+            result = connector.apply_changes(session, portal_delta)
+        self._remember_delta(binding, connector, session, portal_delta, result)
+        with timer.span("audit"):
             self._audit.append(
                 models.AuditLog(
                     id=uuid.uuid4().hex,
@@ -100,53 +224,614 @@ class SyncOrchestrator:
                     ts=datetime.utcnow(),
                 )
             )
-            outcomes.append(
-                SyncOutcome(
-                    platform=binding.platform,
-                    applied=result.success,
-                    summary=summary,
-                    result=result,
-                    validation_issues=[],
-                )
+        return SyncOutcome(
+            platform=binding.platform,
+            applied=result.success,
+            summary=summary,
+            result=result,
+            validation_issues=[],
+            normalization=report,
+            timings=timer.stages,
+        )
+
+    def sync_changed(
+        self,
+        stores: Mapping[str, models.Store],
+        actor: str,
+        consumer: str = "scheduled",
+        auto_normalize: bool = False,
+        max_attempts: int = 5,
+        chunk: Optional[Admission] = None,
+    ) -> List[Tuple[str, List[SyncOutcome]]]:
+        """Syncs only the stores and items the catalog change feed recorded since ``consumer`` last ran.
+
+        The consumer's cursor always moves to the end of the feed. Changes of
+        stores not in ``stores`` and of stores whose sync failed are parked in
+        the consumer's backlog and retried on later runs; a store that fails
+        ``max_attempts`` times in a row is dead-lettered until it changes again.
+        Each store is synced inside ``chunk([store])`` when given.
+        """
+
+        pending = self._catalog.pending(consumer)
+        parked = {entry.store_id: entry for entry in self._catalog.backlog(consumer)}
+        work: Dict[str, Optional[Set[str]]] = {
+            store_id: entry.item_ids for store_id, entry in parked.items() if not entry.dead
+        }
+        for store_id, item_ids in pending.stores.items():
+            entry = parked.get(store_id)
+            work[store_id] = merge_item_ids(entry.item_ids, item_ids) if entry is not None else item_ids
+        results: List[Tuple[str, List[SyncOutcome]]] = []
+        for store_id, item_ids in work.items():
+            store = stores.get(store_id)
+            if store is None:
+                self._catalog.hold(consumer, store_id, item_ids)
+                continue
+            with chunk([store]) if chunk is not None else nullcontext():
+                snapshot = self._catalog.load_snapshot(store_id)
+                outcomes: List[SyncOutcome] = []
+                if snapshot is not None:
+                    outcomes = self.sync_store(
+                        store,
+                        snapshot.items,
+                        actor=actor,
+                        auto_normalize=auto_normalize,
+                        only_items=item_ids,
+                    )
+                    results.append((store_id, outcomes))
+            failed = [outcome for outcome in outcomes if not outcome.applied]
+            if failed:
+                errors = [error for outcome in failed for error in (outcome.result.errors or [outcome.result.message])]
+                self._catalog.hold(consumer, store_id, item_ids, error="; ".join(errors), max_attempts=max_attempts)
+            elif store_id in parked:
+                self._catalog.release(consumer, store_id)
+        if pending.until > pending.since:
+            self._catalog.advance(consumer, pending.until)
+        return results
+
+    def _record(self, operation: str, outcome: SyncOutcome) -> SyncOutcome:
+        if self.metrics is not None:
+            self.metrics.record_outcome(operation, outcome)
+        return outcome
+
+    def apply_delta(
+        self,
+        store: models.Store,
+        platform: models.Platform,
+        delta: models.UnifiedDelta,
+        actor: str,
+    ) -> SyncOutcome:
+        """Applies an already planned delta to one platform without fetching or diffing.
+
+        The delta is still checked against the platform's preview rules first.
+        """
+
+        summary = diff.summarize_delta(delta)
+        binding = next((b for b in store.bindings if b.platform == platform), None)
+        connector = self._connectors.get(platform)
+        if binding is None or connector is None:
+            message = f"{platform.value} is not bound for store {store.id}"
+            return SyncOutcome(
+                platform=platform,
+                applied=False,
+                summary=summary,
+                result=models.ApplyResult(success=False, message=message, errors=[message]),
+                validation_issues=[],
             )
-        return outcomes
+        issues = self._rules.validate_delta(platform, delta)
+        if issues:
+            outcome = SyncOutcome(
+                platform=platform,
+                applied=False,
+                summary=summary,
+                result=models.ApplyResult(success=False, message="Validation failed", errors=[i.message for i in issues]),
+                validation_issues=issues,
+            )
+            return self._record("apply", outcome)
+        ids = self._catalog.external_ids(store.id).get(platform)
+        return self._apply_bound(binding, connector, delta, summary, actor, ids=ids)
 
-    def toggle_pause(self, store: models.Store, command: models.PauseCommand, actor: str) -> List[models.ApplyResult]:
-        results: List[models.ApplyResult] = []
-        for binding in store.bindings:
-            connector = self._connectors[binding.platform]
-            session = self._login(binding)
-            result = connector.set_pause(session, command)
-            results.append(result)
+    def _apply_bound(
+        self,
+        binding: models.CredentialBinding,
+        connector: IPlatformConnector,
+        delta: models.UnifiedDelta,
+        summary: diff.DiffSummary,
+        actor: str,
+        operation: str = "apply",
+        ids: Optional[ExternalIds] = None,
+    ) -> SyncOutcome:
+        timer = StageTimer()
+        portal_delta = ids.to_portal(delta) if ids is not None else delta
+        outcome = self._guarded(
+            binding,
+            connector,
+            timer,
+            lambda: self._apply_session(binding, connector, portal_delta, summary, actor, timer),
+            summary,
+        )
+        return self._record(operation, outcome)
+
+    def _apply_session(
+        self,
+        binding: models.CredentialBinding,
+        connector: IPlatformConnector,
+        delta: models.UnifiedDelta,
+        summary: diff.DiffSummary,
+        actor: str,
+        timer: StageTimer,
+    ) -> SyncOutcome:
+        try:
+            with timer.span("login"):
+                session = self._login(binding)
+        except ValueError as exc:
+            return SyncOutcome(
+                platform=binding.platform,
+                applied=False,
+                summary=summary,
+                result=models.ApplyResult(success=False, message=str(exc), errors=[str(exc)]),
+                validation_issues=[],
+                timings=timer.stages,
+            )
+        with timer.span("apply"):
+            result = connector.apply_changes(session, delta)
+        self._remember_delta(binding, connector, session, delta, result)
+        with timer.span("audit"):
             self._audit.append(
                 models.AuditLog(
                     id=uuid.uuid4().hex,
                     actor=actor,
-                    action=models.AuditAction.PAUSE,
+                    action=models.AuditAction.APPLY,
                     entity=f"{binding.platform.value}:{binding.shop_id}",
                     before={},
-                    after={"paused": command.paused},
+                    after={"summary": asdict(summary)},
                     ts=datetime.utcnow(),
                 )
             )
+        return SyncOutcome(
+            platform=binding.platform,
+            applied=result.success,
+            summary=summary,
+            result=result,
+            validation_issues=[],
+            timings=timer.stages,
+        )
+
+    def _refused(self, binding: models.CredentialBinding, connector: IPlatformConnector) -> Optional[str]:
+        """Asks the circuit breaker whether the platform may be called; returns the refusal reason."""
+
+        if self.breaker is None:
+            return None
+        reason = self.breaker.allow(binding.platform, _selector_version(connector))
+        if reason is not None and self.metrics is not None:
+            self.metrics.inc(
+                "circuit_rejections_total",
+                "Platform calls failed fast by an open circuit breaker.",
+                platform=binding.platform.value,
+            )
+        return reason
+
+    def _feed(
+        self, binding: models.CredentialBinding, connector: IPlatformConnector, success: bool, messages: Iterable[str]
+    ) -> None:
+        if self.breaker is None:
+            return
+        changed = self.breaker.record(binding.platform, _selector_version(connector), success, messages)
+        if changed is not None and self.metrics is not None:
+            self.metrics.inc(
+                "circuit_transitions_total",
+                "Circuit breaker state changes per platform.",
+                platform=binding.platform.value,
+                state=changed.value,
+            )
+
+    def _guarded(
+        self,
+        binding: models.CredentialBinding,
+        connector: IPlatformConnector,
+        timer: StageTimer,
+        call: Callable[[], SyncOutcome],
+        summary: Optional[diff.DiffSummary] = None,
+    ) -> SyncOutcome:
+        reason = self._refused(binding, connector)
+        if reason is not None:
+            return SyncOutcome(
+                platform=binding.platform,
+                applied=False,
+                summary=summary or diff.DiffSummary(updated=[], price_changed=[], availability_changed=[]),
+                result=models.ApplyResult(success=False, message=reason, errors=[reason]),
+                validation_issues=[],
+                timings=timer.stages,
+            )
+        try:
+            outcome = call()
+        except Exception as exc:
+            self._feed(binding, connector, False, [str(exc)])
+            raise
+        # Rejected validation still proves the portal answered login and fetch.
+        self._feed(binding, connector, outcome.applied or bool(outcome.validation_issues), outcome.result.errors or [outcome.result.message])
+        return outcome
+
+    def propagate_template(
+        self,
+        template: models.CatalogTemplate,
+        stores: Mapping[str, models.Store],
+        actor: str,
+        chunk: Optional[Admission] = None,
+        chunk_size: int = 8,
+    ) -> TemplateRollout:
+        """Saves a template edit and pushes it to every linked store without fetching.
+
+        Linked stores are grouped by their overrides; each group resolves to the
+        same catalog, so the old-vs-new diff and the validation run once per
+        group and the resulting delta is applied to every member's platforms.
+        Platforms are assumed to match the previous template; a regular sync
+        corrects any drift. Stores not in ``stores`` only get change-feed entries.
+        Planning, and then the applies of every ``chunk_size`` stores, each run
+        inside their own ``chunk(stores)`` when given.
+        """
+
+        admit: Admission = chunk or (lambda _: nullcontext())
+        with admit(list(stores.values())):
+            rollout, work, rejected = self._plan_template(template, stores)
+        by_store: Dict[str, List[_TemplateWork]] = {}
+        for entry in work:
+            by_store.setdefault(entry[0], []).append(entry)
+        batches = list(by_store.values())
+        applied: Dict[str, List[SyncOutcome]] = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(work))), thread_name_prefix="template") as pool:
+            for offset in range(0, len(batches), chunk_size):
+                with admit([stores[batch[0][0]] for batch in batches[offset : offset + chunk_size]]):
+                    futures = [
+                        (store_id, pool.submit(self._apply_bound, binding, connector, delta, summary, actor, "template", ids))
+                        for batch in batches[offset : offset + chunk_size]
+                        for store_id, binding, connector, delta, summary, ids in batch
+                    ]
+                    for store_id, future in futures:
+                        applied.setdefault(store_id, []).append(future.result())
+        for store_id in stores:
+            outcomes = rejected.get(store_id, []) + applied.get(store_id, [])
+            if outcomes:
+                rollout.results.append((store_id, outcomes))
+        return rollout
+
+    def _plan_template(
+        self, template: models.CatalogTemplate, stores: Mapping[str, models.Store]
+    ) -> Tuple[TemplateRollout, List[_TemplateWork], Dict[str, List[SyncOutcome]]]:
+        before = self._catalog.load_template(template.id)
+        changed = self._catalog.save_template(template)
+        rollout = TemplateRollout(template_id=template.id, changed_items=changed)
+        work: List[_TemplateWork] = []
+        rejected: Dict[str, List[SyncOutcome]] = {}
+        if before is None or not changed:
+            return rollout, work, rejected
+        groups: Dict[Hashable, List[models.StoreOverrides]] = {}
+        for overrides in self._catalog.linked_stores(template.id):
+            if overrides.store_id in stores:
+                groups.setdefault(override_key(overrides), []).append(overrides)
+        rollout.groups = len(groups)
+        for members in groups.values():
+            rollout.resolved.update((overrides.store_id, ResolvedCatalog(template, overrides)) for overrides in members)
+            resolved = list(ResolvedCatalog(template, members[0]))
+            delta, summary = diff.calculate_delta(resolved, ResolvedCatalog(before, members[0]))
+            rollout.diffs += 1
+            if not (delta.updated_items or delta.toggled_items or delta.price_updates or delta.sold_out_items):
+                continue
+            platforms = {
+                binding.platform
+                for overrides in members
+                for binding in stores[overrides.store_id].bindings
+                if self._connectors.get(binding.platform)
+            }
+            issues = self._rules.validate_all(list(platforms), resolved)
+            for overrides in members:
+                external_ids = self._catalog.external_ids(overrides.store_id)
+                for binding in stores[overrides.store_id].bindings:
+                    connector = self._connectors.get(binding.platform)
+                    if connector is None:
+                        continue
+                    if issues[binding.platform]:
+                        outcome = SyncOutcome(
+                            platform=binding.platform,
+                            applied=False,
+                            summary=summary,
+                            result=models.ApplyResult(
+                                success=False, message="Validation failed", errors=[i.message for i in issues[binding.platform]]
+                            ),
+                            validation_issues=issues[binding.platform],
+                        )
+                        rejected.setdefault(overrides.store_id, []).append(self._record("template", outcome))
+                    else:
+                        work.append((overrides.store_id, binding, connector, delta, summary, external_ids.get(binding.platform)))
+        return rollout, work, rejected
+
+    def set_sold_out(
+        self,
+        store: models.Store,
+        item_ids: Iterable[str],
+        sold_out: bool,
+        actor: str,
+    ) -> List[SyncOutcome]:
+        """Marks items sold out (or back in stock) on every bound platform at once.
+
+        Skips the full save/fetch/diff/validate of ``sync_store``: the delta is
+        built from the ids alone, the stored catalog is patched row by row and
+        the platforms are updated in parallel, so the cost follows the number
+        of items touched rather than the menu size.
+        """
+
+        return self.set_availability(store, {item_id: not sold_out for item_id in item_ids}, actor)
+
+    def set_availability(self, store: models.Store, availability: Dict[str, bool], actor: str) -> List[SyncOutcome]:
+        """``set_sold_out`` for a mix of sold-out and restocked items, sent as one delta per platform."""
+
+        delta = models.UnifiedDelta(
+            toggled_items=dict(availability),
+            sold_out_items={item_id: not available for item_id, available in availability.items()},
+        )
+        self._catalog.set_availability(store.id, dict(availability))
+        summary = diff.summarize_delta(delta)
+        external_ids = self._catalog.external_ids(store.id)
+        # Connectors are resolved here so lazy construction never races between worker threads.
+        bound = [(binding, self._connectors.get(binding.platform)) for binding in store.bindings]
+        bound = [(binding, connector) for binding, connector in bound if connector]
+        if len(bound) <= 1:
+            return [
+                self._apply_bound(binding, connector, delta, summary, actor, "soldout", external_ids.get(binding.platform))
+                for binding, connector in bound
+            ]
+        with ThreadPoolExecutor(max_workers=len(bound), thread_name_prefix="sold-out") as pool:
+            futures = [
+                pool.submit(
+                    self._apply_bound, binding, connector, delta, summary, actor, "soldout", external_ids.get(binding.platform)
+                )
+                for binding, connector in bound
+            ]
+            return [future.result() for future in futures]
+
+    def reconcile(self, force: bool = False) -> List[ReconcileResult]:
+        """Re-fetches every shop whose queued checks are due and verifies the fields we wrote.
+
+        Each shop is fetched once however many applies it had; the fetch always
+        goes to the portal and refreshes the snapshot cache, which was patched
+        with what we *meant* to write. Fields that still differ are re-queued
+        and reported as ``SNAPSHOT_MISMATCH`` once their attempts run out; the
+        next sync then diffs against the refreshed snapshot and re-applies them.
+        """
+
+        if self.reconciler is None:
+            return []
+        results: List[ReconcileResult] = []
+        for check in self.reconciler.pop_due(force):
+            binding = check.binding
+            connector = self._connectors.get(binding.platform)
+            if connector is None:
+                continue
+            try:
+                results.append(self._reconcile_check(check, binding, connector))
+            except Exception as exc:
+                # A check must never be lost: put it back and carry on with the other shops.
+                _log.exception("Reconciling %s:%s failed", binding.platform.value, binding.shop_id)
+                result = ReconcileResult(binding.platform, binding.shop_id, checked=len(check.expected), error=str(exc))
+                result.requeued = self.reconciler.requeue(check)
+                results.append(self._record_check(result, "error"))
         return results
 
-    def update_hours(self, store: models.Store, command: models.HoursCommand, actor: str) -> List[models.ApplyResult]:
+    def _reconcile_check(
+        self, check: PendingCheck, binding: models.CredentialBinding, connector: IPlatformConnector
+    ) -> ReconcileResult:
+        assert self.reconciler is not None
+        result = ReconcileResult(binding.platform, binding.shop_id, checked=len(check.expected))
+        result.error = self._refused(binding, connector)
+        if result.error is not None:
+            result.requeued = self.reconciler.requeue(check, charge=False)
+            return self._record_check(result, "refused")
+        try:
+            session = self._login(binding)
+            snapshot = connector.fetch_snapshot(session)
+            version = _snapshot_version(connector, session) if self._snapshots.enabled else None
+        except Exception as exc:
+            self._feed(binding, connector, False, [str(exc)])
+            result.error = str(exc)
+            result.requeued = self.reconciler.requeue(check)
+            return self._record_check(result, "error")
+        self._feed(binding, connector, True, [])
+        if self._snapshots.enabled:
+            self._snapshots.put((binding.platform, binding.shop_id), snapshot, version)
+        result.mismatches = compare(check.expected, snapshot.items)
+        if result.mismatches:
+            result.requeued = self.reconciler.requeue(check, result.mismatches)
+            if not result.requeued:
+                result.error = (
+                    f"SNAPSHOT_MISMATCH: {len(result.mismatches)} field(s) on "
+                    f"{binding.platform.value}:{binding.shop_id} still differ after {check.attempts + 1} checks"
+                )
+        return self._record_check(result, "match" if not result.mismatches else "requeued" if result.requeued else "mismatch")
+
+    def _record_check(self, result: ReconcileResult, outcome: str) -> ReconcileResult:
+        if self.metrics is not None:
+            self.metrics.inc(
+                "reconcile_checks_total",
+                "Post-apply reconciliation fetches per platform and result.",
+                platform=result.platform.value,
+                result=outcome,
+            )
+        return result
+
+    def _remote_snapshot(
+        self, binding: models.CredentialBinding, connector: IPlatformConnector, session: models.AuthSession
+    ) -> models.PlatformSnapshot:
+        key = (binding.platform, binding.shop_id)
+        if not self._snapshots.enabled:
+            return connector.fetch_snapshot(session)
+        version = _snapshot_version(connector, session)
+        snapshot = self._snapshots.get(key, version)
+        if self.metrics is not None:
+            self.metrics.inc(
+                "remote_snapshot_cache_total",
+                "Remote snapshot reads served from the cache (hit) or the portal (miss).",
+                platform=binding.platform.value,
+                result="miss" if snapshot is None else "hit",
+            )
+        if snapshot is None:
+            snapshot = connector.fetch_snapshot(session)
+            self._snapshots.put(key, snapshot, version)
+        return snapshot
+
+    def _remote_state(
+        self, binding: models.CredentialBinding, connector: IPlatformConnector, session: models.AuthSession
+    ) -> Tuple[models.StoreState, List[models.OperatingHours]]:
+        snapshot = self._remote_snapshot(binding, connector, session)
+        return snapshot.state, snapshot.hours
+
+    def _remember_delta(
+        self,
+        binding: models.CredentialBinding,
+        connector: IPlatformConnector,
+        session: models.AuthSession,
+        delta: models.UnifiedDelta,
+        result: models.ApplyResult,
+    ) -> None:
+        if result.success and self.reconciler is not None:
+            self.reconciler.enqueue(binding, delta)
+        if not self._snapshots.enabled:
+            return
+        key = (binding.platform, binding.shop_id)
+        if result.success:
+            self._snapshots.apply_delta(key, delta, _snapshot_version(connector, session))
+        else:
+            self._snapshots.forget(key)
+
+    def _remember_state(
+        self,
+        binding: models.CredentialBinding,
+        connector: IPlatformConnector,
+        session: models.AuthSession,
+        state: models.StoreState,
+        hours: List[models.OperatingHours],
+    ) -> None:
+        if self._snapshots.enabled:
+            key = (binding.platform, binding.shop_id)
+            self._snapshots.update_state(key, state, hours, _snapshot_version(connector, session))
+
+    def _forget_state(self, binding: models.CredentialBinding) -> None:
+        self._snapshots.forget((binding.platform, binding.shop_id))
+
+    def _guarded_write(
+        self,
+        binding: models.CredentialBinding,
+        connector: IPlatformConnector,
+        call: Callable[[], models.ApplyResult],
+    ) -> models.ApplyResult:
+        reason = self._refused(binding, connector)
+        if reason is not None:
+            return models.ApplyResult(success=False, message=reason, errors=[reason])
+        try:
+            result = call()
+        except Exception as exc:
+            self._feed(binding, connector, False, [str(exc)])
+            raise
+        self._feed(binding, connector, result.success, result.errors or [result.message])
+        return result
+
+    def toggle_pause(self, store: models.Store, command: models.PauseCommand, actor: str) -> List[models.ApplyResult]:
+        """Pauses or resumes every platform, skipping those already in the requested state."""
+
         results: List[models.ApplyResult] = []
         for binding in store.bindings:
             connector = self._connectors[binding.platform]
-            session = self._login(binding)
-            result = connector.set_operating_hours(session, command)
-            results.append(result)
-            self._audit.append(
-                models.AuditLog(
-                    id=uuid.uuid4().hex,
-                    actor=actor,
-                    action=models.AuditAction.HOURS,
-                    entity=f"{binding.platform.value}:{binding.shop_id}",
-                    before={},
-                    after={"hours": [h.__dict__ for h in command.hours]},
-                    ts=datetime.utcnow(),
-                )
+            results.append(self._guarded_write(binding, connector, lambda: self._pause_binding(binding, connector, command, actor)))
+        return results
+
+    def _pause_binding(
+        self, binding: models.CredentialBinding, connector: IPlatformConnector, command: models.PauseCommand, actor: str
+    ) -> models.ApplyResult:
+        session = self._login(binding)
+        state, hours = self._remote_state(binding, connector, session)
+        if _pause_matches(state, command):
+            state_text = "already paused" if command.paused else "already open"
+            message = f"{binding.platform.value}:{binding.shop_id} {state_text}"
+            return models.ApplyResult(success=True, message=message, skipped=True)
+        result = connector.set_pause(session, command)
+        after = models.StoreState(
+            store_id=state.store_id,
+            paused=command.paused,
+            reason=command.reason,
+            until=command.until,
+        )
+        if result.success:
+            self._remember_state(binding, connector, session, after, hours)
+        else:
+            self._forget_state(binding)
+        self._audit.append(
+            models.AuditLog(
+                id=uuid.uuid4().hex,
+                actor=actor,
+                action=models.AuditAction.PAUSE,
+                entity=f"{binding.platform.value}:{binding.shop_id}",
+                before=serialization.dump_store_state(state),
+                after=serialization.dump_store_state(after),
+                ts=datetime.utcnow(),
             )
+        )
+        return result
+
+    def update_hours(self, store: models.Store, command: models.HoursCommand, actor: str) -> List[models.ApplyResult]:
+        """Writes operating hours to every platform whose current hours differ."""
+
+        results: List[models.ApplyResult] = []
+        for binding in store.bindings:
+            connector = self._connectors[binding.platform]
+            results.append(self._guarded_write(binding, connector, lambda: self._hours_binding(binding, connector, command, actor)))
         return results
+
+    def _hours_binding(
+        self, binding: models.CredentialBinding, connector: IPlatformConnector, command: models.HoursCommand, actor: str
+    ) -> models.ApplyResult:
+        session = self._login(binding)
+        state, hours = self._remote_state(binding, connector, session)
+        if _hours_key(hours) == _hours_key(command.hours):
+            message = f"{binding.platform.value}:{binding.shop_id} hours already up to date"
+            return models.ApplyResult(success=True, message=message, skipped=True)
+        result = connector.set_operating_hours(session, command)
+        if result.success:
+            self._remember_state(binding, connector, session, state, list(command.hours))
+        else:
+            self._forget_state(binding)
+        self._audit.append(
+            models.AuditLog(
+                id=uuid.uuid4().hex,
+                actor=actor,
+                action=models.AuditAction.HOURS,
+                entity=f"{binding.platform.value}:{binding.shop_id}",
+                before={"hours": serialization.dump_hours(hours)},
+                after={"hours": serialization.dump_hours(command.hours)},
+                ts=datetime.utcnow(),
+            )
+        )
+        return result
+
+
+def _selector_version(connector: IPlatformConnector) -> Optional[str]:
+    selectors = getattr(connector, "selectors", None)
+    if selectors is not None:
+        return selectors.version
+    return getattr(connector, "selector_version", None) or None
+
+
+def _snapshot_version(connector: IPlatformConnector, session: models.AuthSession) -> Optional[str]:
+    # Optional connector capability: a cheap stamp (mtime, etag) that changes whenever the shop does.
+    probe = getattr(connector, "snapshot_version", None)
+    return probe(session) if probe is not None else None
+
+
+def _pause_matches(state: models.StoreState, command: models.PauseCommand) -> bool:
+    if state.paused != command.paused:
+        return False
+    return not command.paused or (state.reason == command.reason and state.until == command.until)
+
+
+def _hours_key(hours: Iterable[models.OperatingHours]) -> List[Tuple[object, ...]]:
+    # store_id is left out: portals key hours by their own shop id.
+    return sorted(
+        (h.dow, h.open, h.close, tuple((b.start, b.end) for b in h.break_times), h.holiday) for h in hours
+    )
@@ -0,0 +1,43 @@
+"""Result objects returned by the sync pipeline.
+
+Kept free of heavy imports so thin clients can decode outcomes without
+loading connectors or storage.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from domain import models
+
+if TYPE_CHECKING:
+    from domain.templates import ResolvedCatalog
+    from .diff import DiffSummary
+    from .normalize import NormalizationReport
+    from .preview import ValidationIssue
+
+
+@dataclass(slots=True)
+class SyncOutcome:
+    platform: models.Platform
+    applied: bool
+    summary: DiffSummary
+    result: models.ApplyResult
+    validation_issues: List[ValidationIssue]
+    normalization: Optional[NormalizationReport] = None
+    # Seconds per pipeline stage (login, fetch, diff, validate, apply, audit, ...).
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class TemplateRollout:
+    """Result of pushing a template edit to every linked store."""
+
+    template_id: str
+    changed_items: List[str]
+    # Distinct resolved catalogs among the linked stores; one diff is computed for each.
+    groups: int = 0
+    diffs: int = 0
+    results: List[Tuple[str, List[SyncOutcome]]] = field(default_factory=list)
+    # New unified catalog of every linked store in the rollout, for callers that keep items in memory.
+    resolved: Dict[str, ResolvedCatalog] = field(default_factory=dict)
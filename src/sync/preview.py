@@ -4,9 +4,11 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import unquote, urlparse
 
 from domain import models
+from .images import ImageProbe, ImageProbeCache
 
 
 @dataclass(slots=True)
@@ -16,37 +18,208 @@ class ValidationIssue:
     message: str
 
 
-class PreviewRuleEngine:
-    def __init__(self, rule_path: Path) -> None:
-        self._rules = json.loads(rule_path.read_text(encoding="utf-8"))
+@dataclass(frozen=True, slots=True)
+class PlatformValidator:
+    """Rules for one platform with thresholds and messages resolved up front."""
 
-    def validate(self, platform: models.Platform, items: Iterable[models.Item]) -> List[ValidationIssue]:
-        rules = self._rules["platforms"][platform.value]
+    platform: models.Platform
+    price_min: int
+    price_step: int
+    rounding: str
+    name_max: int
+    desc_max: int
+    max_groups: int
+    max_options: int
+    delta_step: Optional[int]
+    price_min_message: str
+    price_step_message: str
+    name_message: str
+    desc_message: str
+    delta_message: Optional[str]
+    image_max_bytes: Optional[int] = None
+    image_min_edge: Optional[int] = None
+    image_ratio: Optional[Tuple[int, int]] = None
+
+    @classmethod
+    def compile(cls, platform: models.Platform, rules: Dict[str, Dict[str, object]]) -> "PlatformValidator":
+        price_min = int(rules["price"]["min"])
+        step = int(rules["price"]["step"])
+        delta_step = rules["option"].get("priceDeltaStep") or None
+        image = rules.get("image", {})
+        ratio = str(image["ratio"]).split(":") if image.get("ratio") else None
+        return cls(
+            platform=platform,
+            price_min=price_min,
+            price_step=step,
+            rounding=str(rules["price"].get("rounding", "nearest-step")),
+            name_max=int(rules["name"]["maxLen"]),
+            desc_max=int(rules["desc"]["maxLen"]),
+            max_groups=int(rules["optionGroup"]["maxGroupsPerItem"]),
+            max_options=int(rules["option"]["maxOptionsPerGroup"]),
+            delta_step=int(delta_step) if delta_step else None,
+            price_min_message=f"최소 가격({price_min}) 미만",
+            price_step_message=f"가격 단위({step})에 맞지 않습니다",
+            name_message=f"최대 글자수 {rules['name']['maxLen']} 초과",
+            desc_message=f"설명 글자수 {rules['desc']['maxLen']} 초과",
+            delta_message=f"추가금 단위({delta_step})에 맞지 않습니다" if delta_step else None,
+            image_max_bytes=int(float(image["maxSizeMB"]) * 1024 * 1024) if image.get("maxSizeMB") else None,
+            image_min_edge=int(image["minEdgePx"]) if image.get("minEdgePx") else None,
+            image_ratio=(int(ratio[0]), int(ratio[1])) if ratio else None,
+        )
+
+    def check_price(self, item_id: str, price: int) -> List[ValidationIssue]:
+        issues: List[ValidationIssue] = []
+        if price < self.price_min:
+            issues.append(ValidationIssue(item_id, "price", self.price_min_message))
+        if (price - self.price_min) % self.price_step != 0:
+            issues.append(ValidationIssue(item_id, "price", self.price_step_message))
+        return issues
+
+    def check(self, item: models.Item) -> List[ValidationIssue]:
+        issues = self.check_price(item.id, item.price)
+        if len(item.name) > self.name_max:
+            issues.append(ValidationIssue(item.id, "name", self.name_message))
+        if len(item.desc) > self.desc_max:
+            issues.append(ValidationIssue(item.id, "desc", self.desc_message))
+        if len(item.options) > self.max_groups:
+            issues.append(ValidationIssue(item.id, "optionGroup", "옵션 그룹 개수 초과"))
+        for group in item.options:
+            if len(group.options) > self.max_options:
+                issues.append(ValidationIssue(item.id, f"optionGroup:{group.id}", "옵션 개수 초과"))
+            if self.delta_step:
+                for option in group.options:
+                    if option.price_delta % self.delta_step != 0:
+                        issues.append(ValidationIssue(item.id, f"option:{option.id}", self.delta_message or ""))
+        return issues
+
+    def check_image(self, item_id: str, probe: ImageProbe) -> List[ValidationIssue]:
+        # Messages carry the UPLOAD_FAIL code so outcomes classify like a failed portal upload.
+        if probe.error:
+            return [ValidationIssue(item_id, "image", f"UPLOAD_FAIL: {probe.error}")]
         issues: List[ValidationIssue] = []
+        if self.image_max_bytes is not None and probe.size > self.image_max_bytes:
+            limit = self.image_max_bytes / (1024 * 1024)
+            issues.append(ValidationIssue(item_id, "image", f"UPLOAD_FAIL: 이미지 용량 {limit:g}MB 초과"))
+        if self.image_min_edge is not None and min(probe.width, probe.height) < self.image_min_edge:
+            issues.append(
+                ValidationIssue(item_id, "image", f"UPLOAD_FAIL: 이미지 최소 변 {self.image_min_edge}px 미만 ({probe.width}x{probe.height})")
+            )
+        if self.image_ratio is not None:
+            ratio_w, ratio_h = self.image_ratio
+            # Portals crop a pixel or two themselves, so allow 1% off the exact ratio.
+            if abs(probe.width * ratio_h - probe.height * ratio_w) > 0.01 * probe.height * ratio_w:
+                issues.append(ValidationIssue(item_id, "image", f"UPLOAD_FAIL: 이미지 비율 {ratio_w}:{ratio_h} 아님"))
+        return issues
+
+
+def _fingerprint(item: models.Item) -> Hashable:
+    """Everything the validators look at, so equal fingerprints give equal issues."""
+
+    return (
+        item.id,
+        item.price,
+        len(item.name),
+        len(item.desc),
+        tuple((group.id, tuple((option.id, option.price_delta) for option in group.options)) for group in item.options),
+    )
+
+
+class PreviewRuleEngine:
+    """Validates items against every platform's rules in a single pass.
+
+    Rules are compiled into ``PlatformValidator`` objects on first use. Results are
+    memoised per item fingerprint, so re-validating an unchanged catalog only
+    costs the fingerprinting. The memo is tied to the rules ``version``.
+
+    Items with a local ``image_url`` (a path, relative to ``image_root``, or a
+    ``file://`` URL) also get their file's header checked against the image
+    limits; probes are cached in ``images`` by path, mtime and size. Remote
+    URLs are left to the portals.
+    """
+
+    def __init__(
+        self, rule_path: Path, memo_size: int = 100_000, image_root: Optional[Path] = None, image_workers: int = 8
+    ) -> None:
+        self._rule_path = rule_path
+        self._image_root = image_root
+        self.images = ImageProbeCache(workers=image_workers)
+        self._rules: Optional[Dict[str, object]] = None
+        self.version = ""
+        self._validators: Dict[models.Platform, PlatformValidator] = {}
+        self._order: Tuple[models.Platform, ...] = ()
+        self._memo: Dict[Hashable, Tuple[Tuple[ValidationIssue, ...], ...]] = {}
+        self._memo_size = memo_size
+
+    def _ensure_loaded(self) -> Dict[str, object]:
+        # Rules are read on first use so commands that never validate skip the JSON parse.
+        if self._rules is None:
+            rules = json.loads(self._rule_path.read_text(encoding="utf-8"))
+            self.version = rules.get("version", "")
+            self._validators = {
+                models.Platform(name): PlatformValidator.compile(models.Platform(name), platform_rules)
+                for name, platform_rules in rules["platforms"].items()
+            }
+            self._order = tuple(self._validators)
+            self._rules = rules
+        return self._rules
+
+    @property
+    def rules(self) -> Dict[str, object]:
+        return self._ensure_loaded()
+
+    def validator(self, platform: models.Platform) -> PlatformValidator:
+        self._ensure_loaded()
+        return self._validators[platform]
+
+    def _check_all(self, item: models.Item) -> Tuple[Tuple[ValidationIssue, ...], ...]:
+        key = (self.version, _fingerprint(item))
+        cached = self._memo.get(key)
+        if cached is None:
+            cached = tuple(tuple(self._validators[platform].check(item)) for platform in self._order)
+            if len(self._memo) >= self._memo_size:
+                self._memo.clear()
+            self._memo[key] = cached
+        return cached
+
+    def _image_path(self, url: str) -> Optional[Path]:
+        parsed = urlparse(url)
+        if parsed.scheme == "file":
+            return Path(unquote(parsed.path))
+        if parsed.scheme and len(parsed.scheme) > 1:  # one-letter schemes are Windows drive letters
+            return None
+        path = Path(url)
+        return path if path.is_absolute() or self._image_root is None else self._image_root / path
+
+    def validate_all(
+        self, platforms: Sequence[models.Platform], items: Iterable[models.Item]
+    ) -> Dict[models.Platform, List[ValidationIssue]]:
+        """Walks the items once and returns the issues for each requested platform."""
+
+        self._ensure_loaded()
+        wanted = [(platform, self._order.index(platform)) for platform in dict.fromkeys(platforms)]
+        issues: Dict[models.Platform, List[ValidationIssue]] = {platform: [] for platform, _ in wanted}
+        items = list(items)
+        image_paths = {item.id: self._image_path(item.image_url) for item in items if item.image_url}
+        probes = self.images.probe_all(path for path in image_paths.values() if path is not None)
         for item in items:
-            if item.price < rules["price"]["min"]:
-                issues.append(ValidationIssue(item.id, "price", f"최소 가격({rules['price']['min']}) 미만"))
-            step = rules["price"]["step"]
-            if (item.price - rules["price"]["min"]) % step != 0:
-                issues.append(ValidationIssue(item.id, "price", f"가격 단위({step})에 맞지 않습니다"))
-            if len(item.name) > rules["name"]["maxLen"]:
-                issues.append(ValidationIssue(item.id, "name", f"최대 글자수 {rules['name']['maxLen']} 초과"))
-            if len(item.desc) > rules["desc"]["maxLen"]:
-                issues.append(ValidationIssue(item.id, "desc", f"설명 글자수 {rules['desc']['maxLen']} 초과"))
-            if len(item.options) > rules["optionGroup"]["maxGroupsPerItem"]:
-                issues.append(ValidationIssue(item.id, "optionGroup", "옵션 그룹 개수 초과"))
-            for group in item.options:
-                if len(group.options) > rules["option"]["maxOptionsPerGroup"]:
-                    issues.append(ValidationIssue(item.id, f"optionGroup:{group.id}", "옵션 개수 초과"))
-                if rules["option"].get("priceDeltaStep"):
-                    step_delta = rules["option"]["priceDeltaStep"]
-                    for option in group.options:
-                        if option.price_delta % step_delta != 0:
-                            issues.append(
-                                ValidationIssue(
-                                    item.id,
-                                    f"option:{option.id}",
-                                    f"추가금 단위({step_delta})에 맞지 않습니다",
-                                )
-                            )
+            per_platform = self._check_all(item)
+            path = image_paths.get(item.id)
+            probe = probes[path] if path is not None else None
+            for platform, index in wanted:
+                if per_platform[index]:
+                    issues[platform].extend(per_platform[index])
+                if probe is not None:
+                    issues[platform].extend(self._validators[platform].check_image(item.id, probe))
         return issues
+
+    def validate_delta(self, platform: models.Platform, delta: models.UnifiedDelta) -> List[ValidationIssue]:
+        """Checks what a planned delta writes: full items, and prices of price-only updates."""
+
+        validator = self.validator(platform)
+        issues = [issue for item in delta.updated_items for issue in validator.check(item)]
+        for item_id, price in delta.price_updates.items():
+            issues.extend(validator.check_price(item_id, price))
+        return issues
+
+    def validate(self, platform: models.Platform, items: Iterable[models.Item]) -> List[ValidationIssue]:
+        return self.validate_all([platform], items)[platform]
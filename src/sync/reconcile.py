@@ -0,0 +1,188 @@
+"""Deferred post-apply reconciliation: checks that applied changes actually stuck."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from domain import models
+
+ShopKey = Tuple[models.Platform, str]
+FieldKey = Tuple[str, str]
+
+_log = logging.getLogger(__name__)
+
+# Fields a delta can touch on a portal item; name/desc only travel with full item updates.
+_ITEM_FIELDS = ("name", "desc", "price", "available")
+
+
+def touched_fields(delta: models.UnifiedDelta) -> Dict[FieldKey, object]:
+    """The value every field written by ``delta`` should now have, keyed by (item id, field)."""
+
+    fields: Dict[FieldKey, object] = {}
+    for item in delta.updated_items:
+        for name in _ITEM_FIELDS:
+            fields[(item.id, name)] = getattr(item, name)
+    for item_id, sold_out in delta.sold_out_items.items():
+        fields[(item_id, "available")] = not sold_out
+    for item_id, available in delta.toggled_items.items():
+        fields[(item_id, "available")] = available
+    for item_id, price in delta.price_updates.items():
+        fields[(item_id, "price")] = price
+    return fields
+
+
+@dataclass(slots=True)
+class Mismatch:
+    item_id: str
+    field: str
+    expected: object
+    # None when the item is missing from the portal altogether.
+    actual: object
+
+
+def compare(expected: Dict[FieldKey, object], items: Iterable[models.Item]) -> List[Mismatch]:
+    """Diffs only the expected fields against a fresh portal listing."""
+
+    index = {item.id: item for item in items}
+    mismatches: List[Mismatch] = []
+    for (item_id, name), value in expected.items():
+        item = index.get(item_id)
+        actual = getattr(item, name) if item is not None else None
+        if item is None or actual != value:
+            mismatches.append(Mismatch(item_id, name, value, actual))
+    return mismatches
+
+
+@dataclass(slots=True)
+class PendingCheck:
+    binding: models.CredentialBinding
+    expected: Dict[FieldKey, object]
+    first_queued: float
+    due: float
+    # Checks already spent on these fields without a match.
+    attempts: int = 0
+
+
+@dataclass(slots=True)
+class ReconcileResult:
+    platform: models.Platform
+    shop_id: str
+    checked: int
+    mismatches: List[Mismatch] = field(default_factory=list)
+    requeued: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.mismatches
+
+
+class ReconcileQueue:
+    """Applied field values waiting to be verified, batched per (platform, shop).
+
+    Every successful apply adds the fields it wrote to its shop's entry; the
+    entry falls due ``settle_delay`` seconds after its last addition (at most
+    ``max_delay`` after its first), so a burst of writes to one shop is checked
+    with a single fetch once the portal had time to settle. Fields that still
+    differ are re-queued up to ``max_attempts`` checks in total.
+    """
+
+    def __init__(
+        self,
+        settle_delay: float = 30.0,
+        max_attempts: int = 3,
+        max_delay: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.settle_delay = settle_delay
+        self.max_attempts = max_attempts
+        self._max_delay = max_delay if max_delay is not None else settle_delay * 4
+        self._clock = clock
+        self._pending: Dict[ShopKey, PendingCheck] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def enqueue(self, binding: models.CredentialBinding, delta: models.UnifiedDelta, attempts: int = 0) -> None:
+        fields = touched_fields(delta)
+        if fields:
+            self._add(binding, fields, attempts)
+
+    def _add(self, binding: models.CredentialBinding, fields: Dict[FieldKey, object], attempts: int) -> None:
+        now = self._clock()
+        with self._cond:
+            key = (binding.platform, binding.shop_id)
+            check = self._pending.get(key)
+            if check is None:
+                check = self._pending[key] = PendingCheck(binding, {}, first_queued=now, due=now, attempts=attempts)
+            else:
+                # A merged batch gets as many checks as its freshest fields.
+                check.attempts = min(check.attempts, attempts)
+            check.binding = binding
+            check.expected.update(fields)
+            check.due = min(now + self.settle_delay, check.first_queued + self._max_delay)
+            self._cond.notify_all()
+
+    def requeue(self, check: PendingCheck, mismatches: Optional[Iterable[Mismatch]] = None, charge: bool = True) -> bool:
+        """Queues ``mismatches`` (all fields when None) for another check; False once attempts are used up.
+
+        With ``charge=False`` the check does not count, e.g. when the platform could not be called at all.
+        """
+
+        attempts = check.attempts + 1 if charge else check.attempts
+        if attempts >= self.max_attempts:
+            return False
+        fields = check.expected if mismatches is None else {(m.item_id, m.field): m.expected for m in mismatches}
+        self._add(check.binding, fields, attempts)
+        return True
+
+    def pop_due(self, force: bool = False) -> List[PendingCheck]:
+        now = self._clock()
+        with self._cond:
+            keys = [key for key, check in self._pending.items() if force or check.due <= now]
+            return [self._pending.pop(key) for key in keys]
+
+    def next_due(self) -> Optional[float]:
+        with self._cond:
+            return min((check.due for check in self._pending.values()), default=None)
+
+    def _run(self, runner: Callable[[], object]) -> None:
+        while True:
+            with self._cond:
+                while not self._stopping:
+                    deadline = min((check.due for check in self._pending.values()), default=None)
+                    now = self._clock()
+                    if deadline is not None and deadline <= now:
+                        break
+                    self._cond.wait(None if deadline is None else deadline - now)
+                if self._stopping:
+                    return
+            try:
+                runner()
+            except Exception:
+                _log.exception("Reconcile run failed")
+
+    def start(self, runner: Callable[[], object]) -> None:
+        """Calls ``runner`` from a background thread whenever a check falls due."""
+
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, args=(runner,), name="reconcile", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
@@ -0,0 +1,319 @@
+"""Persistent job scheduler for auto-resume and timed sold-out toggles."""
+from __future__ import annotations
+
+import dataclasses
+import heapq
+import itertools
+import logging
+import threading
+import time
+import uuid
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, ContextManager, Dict, List, Optional, Tuple
+
+from domain import models
+from infrastructure.job_store import JobStore
+from .orchestrator import SyncOrchestrator
+
+StoreResolver = Callable[[str], Optional[models.Store]]
+AvailabilitySink = Callable[[str, Dict[str, bool]], None]
+
+_log = logging.getLogger(__name__)
+
+
+class TimerHeap:
+    """Min-heap of job deadlines with lazy cancellation.
+
+    Scheduling and popping cost O(log n); a tick only touches jobs that are
+    actually due.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._live: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def push(self, job_id: str, due_at: float) -> None:
+        self._live[job_id] = due_at
+        heapq.heappush(self._heap, (due_at, next(self._seq), job_id))
+
+    def discard(self, job_id: str) -> None:
+        self._live.pop(job_id, None)
+
+    def _drop_stale(self) -> None:
+        while self._heap and self._live.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def next_due(self) -> Optional[float]:
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> List[str]:
+        due: List[str] = []
+        while True:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return due
+            _, _, job_id = heapq.heappop(self._heap)
+            del self._live[job_id]
+            due.append(job_id)
+
+
+@dataclass(slots=True)
+class FiredBatch:
+    store_id: str
+    platform: Optional[models.Platform]
+    action: models.JobAction
+    job_ids: List[str]
+    results: List[models.ApplyResult] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        return bool(self.results) and all(result.success for result in self.results)
+
+
+class Scheduler:
+    """Fires persisted jobs through ``SyncOrchestrator`` when they fall due.
+
+    Jobs live in ``JobStore`` and are mirrored in a ``TimerHeap``. ``recover``
+    reloads pending jobs after a restart; anything already overdue fires on the
+    next ``run_due``, which claims due jobs in the store (``pending`` to
+    ``running``) before waiting for the execution lock and drops any that were
+    cancelled while it waited. Jobs that fall due together are batched: pause/resume
+    once per (store, platform) with the latest job winning, and sold-out /
+    restock toggles merged into one delta per (store, platform). Toggles go
+    through ``set_availability`` so the catalog keeps them across later syncs;
+    ``on_availability`` lets the owner patch any items it caches. A batch whose
+    call raises is put back on the heap ``retry_delay`` seconds later and marked
+    failed after ``max_retries`` retries.
+    """
+
+    def __init__(
+        self,
+        jobs: JobStore,
+        orchestrator: SyncOrchestrator,
+        resolve_store: StoreResolver,
+        clock: Callable[[], float] = time.time,
+        execution_lock: Optional[ContextManager[object]] = None,
+        retry_delay: float = 30.0,
+        max_retries: int = 3,
+        on_availability: Optional[AvailabilitySink] = None,
+    ) -> None:
+        self._jobs = jobs
+        self._orchestrator = orchestrator
+        self._resolve_store = resolve_store
+        self._clock = clock
+        self._execution_lock = execution_lock
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
+        self._on_availability = on_availability
+        self._retries: Dict[str, int] = {}
+        self._timers = TimerHeap()
+        self._by_id: Dict[str, models.ScheduledJob] = {}
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        # Claims outlive only the process that made them; one left over means it died mid-fire.
+        self._jobs.release_running()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._timers)
+
+    def recover(self) -> int:
+        """Loads pending jobs from storage that are not queued yet; returns how many were added."""
+
+        jobs = self._jobs.pending()
+        with self._cond:
+            fresh = [job for job in jobs if job.id not in self._by_id]
+            for job in fresh:
+                self._by_id[job.id] = job
+                self._timers.push(job.id, job.due_at.timestamp())
+            self._cond.notify_all()
+        return len(fresh)
+
+    def schedule(
+        self,
+        store_id: str,
+        action: models.JobAction,
+        due_at: datetime,
+        platform: Optional[models.Platform] = None,
+        item_ids: Optional[List[str]] = None,
+        reason: Optional[str] = None,
+    ) -> models.ScheduledJob:
+        job = models.ScheduledJob(
+            id=uuid.uuid4().hex,
+            store_id=store_id,
+            action=action,
+            due_at=due_at,
+            platform=platform,
+            item_ids=list(item_ids or []),
+            reason=reason,
+        )
+        self._jobs.add(job)
+        with self._cond:
+            self._by_id[job.id] = job
+            self._timers.push(job.id, due_at.timestamp())
+            self._cond.notify_all()
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        with self._cond:
+            self._timers.discard(job_id)
+            self._by_id.pop(job_id, None)
+        return self._jobs.cancel(job_id)
+
+    def cancel_pending(self, store_id: str, action: models.JobAction) -> int:
+        """Cancels every not yet fired ``action`` job of a store, e.g. a stale auto-resume."""
+
+        job_ids = self._jobs.cancel_matching(store_id, action)
+        with self._cond:
+            for job_id in job_ids:
+                self._timers.discard(job_id)
+                self._by_id.pop(job_id, None)
+        return len(job_ids)
+
+    def next_due(self) -> Optional[float]:
+        with self._cond:
+            return self._timers.next_due()
+
+    def run_due(self) -> List[FiredBatch]:
+        with self._cond:
+            due = [self._by_id.pop(job_id) for job_id in self._timers.pop_due(self._clock())]
+            # Claimed under the condition, so a concurrent ``recover`` cannot queue them again.
+            claimed = set(self._jobs.claim(job.id for job in due))
+        due = [job for job in due if job.id in claimed]
+        if not due:
+            return []
+        due.sort(key=lambda job: job.due_at)
+        with self._execution_lock or nullcontext():
+            live = set(self._jobs.running(job.id for job in due))
+            due = [job for job in due if job.id in live]
+            return self._fire(due) if due else []
+
+    def _fire(self, due: List[models.ScheduledJob]) -> List[FiredBatch]:
+        pauses: Dict[Tuple[str, Optional[models.Platform]], FiredBatch] = {}
+        toggles: Dict[Tuple[str, Optional[models.Platform]], Tuple[FiredBatch, Dict[str, bool]]] = {}
+        reasons: Dict[Tuple[str, Optional[models.Platform]], Optional[str]] = {}
+        for job in due:
+            key = (job.store_id, job.platform)
+            if job.action in (models.JobAction.PAUSE, models.JobAction.RESUME):
+                batch = pauses.get(key)
+                if batch is None:
+                    batch = pauses[key] = FiredBatch(job.store_id, job.platform, job.action, [])
+                batch.action = job.action
+                batch.job_ids.append(job.id)
+                reasons[key] = job.reason
+            else:
+                if key not in toggles:
+                    toggles[key] = (FiredBatch(job.store_id, job.platform, job.action, []), {})
+                batch, sold_out = toggles[key]
+                batch.job_ids.append(job.id)
+                for item_id in job.item_ids:
+                    sold_out[item_id] = job.action == models.JobAction.SOLD_OUT
+
+        jobs = {job.id: job for job in due}
+        fired: List[FiredBatch] = []
+        for key, batch in pauses.items():
+            store = self._target_store(key)
+            try:
+                if store is not None:
+                    command = models.PauseCommand(
+                        store_id=store.id,
+                        paused=batch.action == models.JobAction.PAUSE,
+                        reason=reasons.get(key),
+                    )
+                    batch.results = self._orchestrator.toggle_pause(store, command, actor="scheduler")
+            except Exception as exc:
+                fired.append(self._retry(batch, jobs, exc))
+                continue
+            fired.append(self._settle(batch))
+        for key, (batch, sold_out) in toggles.items():
+            store = self._target_store(key)
+            try:
+                if store is not None:
+                    availability = {item_id: not flag for item_id, flag in sold_out.items()}
+                    outcomes = self._orchestrator.set_availability(store, availability, actor="scheduler")
+                    batch.results.extend(outcome.result for outcome in outcomes)
+                    if self._on_availability is not None:
+                        self._on_availability(store.id, availability)
+            except Exception as exc:
+                fired.append(self._retry(batch, jobs, exc))
+                continue
+            fired.append(self._settle(batch))
+        return fired
+
+    def _retry(self, batch: FiredBatch, jobs: Dict[str, models.ScheduledJob], exc: Exception) -> FiredBatch:
+        _log.exception("Scheduled %s for store %s failed", batch.action.value, batch.store_id)
+        batch.results = [models.ApplyResult(success=False, message=f"{type(exc).__name__}: {exc}")]
+        retries = max(self._retries.get(job_id, 0) for job_id in batch.job_ids) + 1
+        if retries > self.max_retries:
+            return self._settle(batch)
+        due_at = self._clock() + self.retry_delay
+        with self._cond:
+            self._jobs.mark(batch.job_ids, "pending", batch.results[0].message)
+            for job_id in batch.job_ids:
+                self._retries[job_id] = retries
+                self._by_id[job_id] = jobs[job_id]
+                self._timers.push(job_id, due_at)
+            self._cond.notify_all()
+        return batch
+
+    def _target_store(self, key: Tuple[str, Optional[models.Platform]]) -> Optional[models.Store]:
+        store_id, platform = key
+        store = self._resolve_store(store_id)
+        if store is None or platform is None:
+            return store
+        return dataclasses.replace(store, bindings=[b for b in store.bindings if b.platform == platform])
+
+    def _settle(self, batch: FiredBatch) -> FiredBatch:
+        for job_id in batch.job_ids:
+            self._retries.pop(job_id, None)
+        if batch.success:
+            self._jobs.mark(batch.job_ids, "done")
+        else:
+            errors = [error for result in batch.results for error in (result.errors or [result.message])]
+            self._jobs.mark(batch.job_ids, "failed", "; ".join(errors) or f"Unknown store {batch.store_id}")
+        return batch
+
+    # background loop ---------------------------------------------------
+
+    def _run(self, on_fired: Optional[Callable[[List[FiredBatch]], None]]) -> None:
+        while True:
+            with self._cond:
+                while not self._stopping:
+                    deadline = self._timers.next_due()
+                    now = self._clock()
+                    if deadline is not None and deadline <= now:
+                        break
+                    self._cond.wait(None if deadline is None else min(deadline - now, 60.0))
+                if self._stopping:
+                    return
+            try:
+                fired = self.run_due()
+                if fired and on_fired is not None:
+                    on_fired(fired)
+            except Exception:
+                # Failed batches are already re-queued; the loop must outlive any single error.
+                _log.exception("Scheduler tick failed")
+
+    def start(self, on_fired: Optional[Callable[[List[FiredBatch]], None]] = None) -> None:
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, args=(on_fired,), name="scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
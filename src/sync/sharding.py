@@ -0,0 +1,167 @@
+"""Multi-process store sharding for fleet-wide syncs."""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+import zlib
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from domain import models
+from .diff import DiffSummary
+from .metrics import MetricsRegistry, MetricsState
+from .orchestrator import SyncOrchestrator
+from .outcome import SyncOutcome
+
+# Builds the orchestrator a worker owns for its whole life; it receives the shard index.
+# It must be picklable (a module-level function or a functools.partial of one).
+OrchestratorFactory = Callable[[int], SyncOrchestrator]
+StoreEntry = Tuple[models.Store, List[models.Item]]
+
+
+def shard_for(store_id: str, shards: int) -> int:
+    """Stable shard index for a store; unlike ``hash`` it does not change between processes."""
+
+    return zlib.crc32(store_id.encode("utf-8")) % shards
+
+
+@dataclass(slots=True)
+class ShardReport:
+    shard: int
+    pid: int
+    elapsed: float
+    outcomes: List[Tuple[str, List[SyncOutcome]]] = field(default_factory=list)
+    metrics: Optional[MetricsState] = None
+
+
+_worker: Optional[SyncOrchestrator] = None
+_worker_shard = -1
+
+
+def _init_worker(factory: OrchestratorFactory, shard: int) -> None:
+    global _worker, _worker_shard
+    _worker = factory(shard)
+    _worker_shard = shard
+
+
+def _failed(store: models.Store, exc: BaseException) -> List[SyncOutcome]:
+    """One failed outcome per binding for a store whose sync raised instead of returning outcomes."""
+
+    message = f"{type(exc).__name__}: {exc}"
+    return [
+        SyncOutcome(
+            platform=binding.platform,
+            applied=False,
+            summary=DiffSummary(updated=[], price_changed=[], availability_changed=[]),
+            result=models.ApplyResult(success=False, message=message, errors=[message]),
+            validation_issues=[],
+        )
+        for binding in store.bindings
+    ]
+
+
+def _sync_shard(entries: List[StoreEntry], actor: str, auto_normalize: bool) -> ShardReport:
+    assert _worker is not None, "worker process was not initialised"
+    started = time.perf_counter()
+    report = ShardReport(shard=_worker_shard, pid=os.getpid(), elapsed=0.0)
+    for store, items in entries:
+        # One store's failure must not discard the outcomes (and metrics) of stores already written.
+        try:
+            outcomes = _worker.sync_store(store, items, actor=actor, auto_normalize=auto_normalize)
+        except Exception as exc:
+            outcomes = _failed(store, exc)
+        report.outcomes.append((store.id, outcomes))
+    if _worker.metrics is not None:
+        report.metrics = _worker.metrics.drain()
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+class ShardedSyncRunner:
+    """Spreads ``sync_store`` calls over ``workers`` processes by hashing store ids.
+
+    Every shard is pinned to its own single-process pool, so a store always
+    lands in the same worker and reuses that worker's connectors, sessions and
+    audit segment. Outcomes come back in input order and worker metrics are
+    merged into ``metrics`` in the parent.
+
+    A worker process that dies breaks its pool for good: that shard's stores
+    are reported as failed and the pool is replaced, so later syncs (e.g. in a
+    long-lived daemon) start a fresh worker instead of failing outright.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        factory: OrchestratorFactory,
+        metrics: Optional[MetricsRegistry] = None,
+        start_method: Optional[str] = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.metrics = metrics
+        self._context = multiprocessing.get_context(start_method)
+        self._factory = factory
+        self._pools = [self._new_pool(shard) for shard in range(workers)]
+
+    def _new_pool(self, shard: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=1, mp_context=self._context, initializer=_init_worker, initargs=(self._factory, shard)
+        )
+
+    def _replace_pool(self, shard: int) -> None:
+        self._pools[shard].shutdown(wait=False)
+        self._pools[shard] = self._new_pool(shard)
+
+    def _submit(self, shard: int, bucket: List[StoreEntry], actor: str, auto_normalize: bool) -> Future:
+        try:
+            return self._pools[shard].submit(_sync_shard, bucket, actor, auto_normalize)
+        except BrokenProcessPool:
+            # Broken by a worker that died during an earlier call; nothing of this bucket ran yet.
+            self._replace_pool(shard)
+            return self._pools[shard].submit(_sync_shard, bucket, actor, auto_normalize)
+
+    def sync(
+        self, entries: Sequence[StoreEntry], actor: str, auto_normalize: bool = False
+    ) -> Tuple[List[Tuple[str, List[SyncOutcome]]], List[ShardReport]]:
+        buckets: List[List[StoreEntry]] = [[] for _ in range(self.workers)]
+        for store, items in entries:
+            buckets[shard_for(store.id, self.workers)].append((store, list(items)))
+        reports: List[ShardReport] = []
+        by_store: Dict[str, List[SyncOutcome]] = {}
+        futures: List[Tuple[int, List[StoreEntry], Future]] = []
+        for shard, bucket in enumerate(buckets):
+            if not bucket:
+                continue
+            try:
+                futures.append((shard, bucket, self._submit(shard, bucket, actor, auto_normalize)))
+            except Exception as exc:
+                by_store.update((store.id, _failed(store, exc)) for store, _ in bucket)
+        for shard, bucket, future in futures:
+            try:
+                reports.append(future.result())
+            except Exception as exc:
+                # The worker itself died; the other shards' reports are still merged.
+                if isinstance(exc, BrokenProcessPool):
+                    self._replace_pool(shard)
+                by_store.update((store.id, _failed(store, exc)) for store, _ in bucket)
+
+        for report in reports:
+            by_store.update(report.outcomes)
+            if report.metrics is not None and self.metrics is not None:
+                self.metrics.merge(report.metrics)
+        return [(store.id, by_store.get(store.id, [])) for store, _ in entries], reports
+
+    def close(self) -> None:
+        for pool in self._pools:
+            pool.shutdown()
+
+    def __enter__(self) -> "ShardedSyncRunner":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,101 @@
+"""Per-(platform, shop) cache of remote portal snapshots."""
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from domain import models
+
+CacheKey = Tuple[models.Platform, str]
+
+
+@dataclass(slots=True)
+class _Entry:
+    stored_at: float
+    version: Optional[str]
+    snapshot: models.PlatformSnapshot
+
+
+class RemoteSnapshotCache:
+    """Keeps the last known portal snapshot of every shop for ``ttl`` seconds.
+
+    An entry is served only while it is younger than ``ttl`` and, when the
+    connector exposes a version stamp (``snapshot_version``), while the stamp
+    still matches the one recorded with it. Our own successful writes patch
+    the entry in place instead of dropping it, so back-to-back edits to one
+    shop need a single scrape. Cached snapshots are never mutated: patches
+    swap in new item lists and state objects.
+    """
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: Dict[CacheKey, _Entry] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, key: CacheKey, version: Optional[str] = None) -> Optional[models.PlatformSnapshot]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._clock() - entry.stored_at >= self.ttl or entry.version != version:
+                del self._entries[key]
+                return None
+            return entry.snapshot
+
+    def put(self, key: CacheKey, snapshot: models.PlatformSnapshot, version: Optional[str] = None) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = _Entry(self._clock(), version, snapshot)
+
+    def forget(self, key: CacheKey) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def apply_delta(self, key: CacheKey, delta: models.UnifiedDelta, version: Optional[str] = None) -> None:
+        """Replays a successfully applied delta on the cached items, as the portal did."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            index = {item.id: item for item in entry.snapshot.items}
+            for item in delta.updated_items:
+                index[item.id] = dataclasses.replace(item)
+            changes: Dict[str, Dict[str, object]] = {}
+            for item_id, available in delta.toggled_items.items():
+                changes.setdefault(item_id, {})["available"] = available
+            for item_id, price in delta.price_updates.items():
+                changes.setdefault(item_id, {})["price"] = price
+            for item_id, sold_out in delta.sold_out_items.items():
+                changes.setdefault(item_id, {})["available"] = not sold_out
+            for item_id, fields in changes.items():
+                if item_id in index:
+                    index[item_id] = dataclasses.replace(index[item_id], **fields)
+            snapshot = dataclasses.replace(entry.snapshot, items=list(index.values()))
+            self._entries[key] = _Entry(entry.stored_at, version, snapshot)
+
+    def update_state(
+        self,
+        key: CacheKey,
+        state: models.StoreState,
+        hours: List[models.OperatingHours],
+        version: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            snapshot = dataclasses.replace(entry.snapshot, state=state, hours=list(hours))
+            self._entries[key] = _Entry(entry.stored_at, version, snapshot)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,4 +1,86 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from domain import models  # noqa: E402
+from infrastructure.audit_logger import AuditLogger  # noqa: E402
+from infrastructure.catalog_repository import CatalogRepository  # noqa: E402
+from infrastructure.credential_store import Credential, CredentialStore  # noqa: E402
+from sync.orchestrator import SyncOrchestrator  # noqa: E402
+from sync.preview import PreviewRuleEngine  # noqa: E402
+
+RULES = Path(__file__).resolve().parents[1] / "data" / "rules" / "preview.rules.json"
+
+
+class RecordingConnector:
+    """In-memory portal that lists ``items`` per shop and records every delta it is sent.
+
+    Shops in ``failing`` reject their deltas; shops in ``broken`` raise on fetch.
+    """
+
+    def __init__(self, platform=models.Platform.BAEMIN, failing=(), broken=()):
+        self.platform = platform
+        self.items = {}
+        self.deltas = []
+        self.fetches = 0
+        self.failing = set(failing)
+        self.broken = set(broken)
+
+    def login(self, credential, username, password):
+        return models.AuthSession(platform=self.platform, shop_id=credential.shop_id, token="t", selector_version="v")
+
+    def fetch_snapshot(self, session):
+        self.fetches += 1
+        if session.shop_id in self.broken:
+            raise RuntimeError("portal layout changed")
+        items = list(self.items.get(session.shop_id, []))
+        return models.PlatformSnapshot(self.platform, session.shop_id, items, [], models.StoreState(store_id=session.shop_id))
+
+    def apply_changes(self, session, delta):
+        if session.shop_id in self.failing:
+            return models.ApplyResult(success=False, message="rejected", errors=["VALIDATION: rejected"])
+        self.deltas.append((session.shop_id, delta))
+        return models.ApplyResult(success=True, message="ok")
+
+
+def build_orchestrator(root, connectors, **options):
+    """Builds an orchestrator whose catalog, credentials and audit log live under ``root``.
+
+    Kept module-level so process-pool workers can build their own.
+    """
+
+    credentials = CredentialStore(root / "credentials.json")
+    credentials.save("cred", Credential(username="owner", password="pw"))
+    return SyncOrchestrator(
+        catalog=CatalogRepository(root / "catalog.db"),
+        credential_store=credentials,
+        audit_logger=AuditLogger(root / "audit.log"),
+        rule_engine=PreviewRuleEngine(RULES),
+        connectors=connectors,
+        **options,
+    )
+
+
+def baemin_store(store_id, shop_id=None):
+    """A store bound to one Baemin shop (default: the store id) that logs in with ``cred``."""
+
+    binding = models.CredentialBinding(platform=models.Platform.BAEMIN, shop_id=shop_id or store_id, cred_ref="cred")
+    return models.Store(id=store_id, name="매장", bindings=[binding])
+
+
+@pytest.fixture
+def connector():
+    return RecordingConnector()
+
+
+@pytest.fixture
+def make_orchestrator(tmp_path):
+    def make(connectors, **options):
+        if not isinstance(connectors, dict):
+            connectors = {connectors.platform: connectors}
+        return build_orchestrator(tmp_path, connectors, **options)
+
+    return make
@@ -0,0 +1,25 @@
+from bench.generator import make_catalog
+from bench.runner import RULES_PATH, compare, run_suite
+from domain import models
+from sync.preview import PreviewRuleEngine
+
+
+def test_generator_is_seeded_and_passes_platform_rules():
+    catalog = make_catalog(300, seed=7)
+
+    assert catalog == make_catalog(300, seed=7)
+    assert catalog != make_catalog(300, seed=8)
+    assert any(item.options for item in catalog)
+    issues = PreviewRuleEngine(RULES_PATH).validate_all(list(models.Platform), catalog)
+    assert all(not platform_issues for platform_issues in issues.values())
+
+
+def test_suite_report_round_trips_through_regression_check(tmp_path):
+    report = run_suite([50], tmp_path, cases=["calculate_delta", "validate"], repeat=1)
+
+    assert [(entry["case"], entry["size"]) for entry in report["results"]] == [("calculate_delta", 50), ("validate", 50)]
+    baseline = {"results": [{"case": "validate", "size": 50, "best": 0.010}, {"case": "sync_store", "size": 50, "best": 1.0}]}
+    current = {"results": [{"case": "validate", "size": 50, "best": 0.013}, {"case": "calculate_delta", "size": 50, "best": 0.0}]}
+    regressions = compare(current, baseline, threshold=0.2)
+    assert [(r.case, round(r.ratio, 1)) for r in regressions] == [("validate", 1.3)]
+    assert compare(current, baseline, threshold=0.5) == []
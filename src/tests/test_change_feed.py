@@ -0,0 +1,80 @@
+import dataclasses
+
+from conftest import baemin_store
+from domain import models
+from infrastructure.catalog_repository import CatalogRepository
+
+
+def _item(store_id, n, price=1000):
+    return models.Item(id=f"item-{n}", store_id=store_id, category_id="c", name=f"메뉴 {n}", desc="", price=price)
+
+
+def test_catalog_records_only_real_changes_per_item(tmp_path):
+    catalog = CatalogRepository(tmp_path / "catalog.db")
+
+    def save(items):
+        catalog.save_snapshot(models.PlatformSnapshot(models.Platform.BAEMIN, "s", items, [], models.StoreState(store_id="s")))
+
+    save([_item("s", 1), _item("s", 2)])
+    first = catalog.changes_since(0)
+    save([_item("s", 1), _item("s", 2)])
+    save([_item("s", 1, price=1500), _item("s", 3)])
+    catalog.set_availability("s", {"item-3": False})
+
+    assert [(change.store_id, change.item_id) for change in first] == [("s", None)]
+    assert [change.item_id for change in catalog.changes_since(first[-1].seq)] == ["item-1", "item-3", "item-2", "item-3"]
+    catalog.advance("nightly", 3)
+    catalog.advance("nightly", 1)
+    assert catalog.cursor("nightly") == 3
+    assert catalog.pending("nightly").stores == {"s": {"item-2", "item-3"}}
+
+
+def test_sync_changed_touches_only_edited_stores_and_advances_cursor(connector, make_orchestrator):
+    orchestrator = make_orchestrator(connector)
+    catalog = orchestrator.catalog
+    stores = {}
+    for n in range(3):
+        store = baemin_store(f"store-{n}")
+        stores[store.id] = store
+        items = [_item(store.id, i) for i in range(5)]
+        orchestrator.sync_store(store, items, actor="seed")
+        connector.items[store.id] = items
+    orchestrator.sync_changed(stores, actor="scheduled")
+    connector.deltas.clear()
+
+    edited = [_item("store-1", i) for i in range(5)]
+    edited[2] = dataclasses.replace(edited[2], price=9000)
+    catalog.save_snapshot(models.PlatformSnapshot(models.Platform.BAEMIN, "store-1", edited, [], models.StoreState(store_id="store-1")))
+
+    results = orchestrator.sync_changed(stores, actor="scheduled")
+
+    assert [store_id for store_id, _ in results] == ["store-1"]
+    ((shop_id, delta),) = connector.deltas
+    assert shop_id == "store-1" and delta.price_updates == {"item-2": 9000}
+    assert orchestrator.sync_changed(stores, actor="scheduled") == []
+
+
+def test_skipped_and_failing_stores_are_parked_instead_of_pinning_the_cursor(connector, make_orchestrator):
+    connector.failing.add("broken")
+    orchestrator = make_orchestrator(connector)
+    catalog = orchestrator.catalog
+    stores = {store_id: baemin_store(store_id) for store_id in ("fleet", "broken", "healthy")}
+    for store_id in stores:
+        catalog.save_snapshot(
+            models.PlatformSnapshot(models.Platform.BAEMIN, store_id, [_item(store_id, 1)], [], models.StoreState(store_id=store_id))
+        )
+
+    # Without --fleet the fleet store is skipped, but its changes are kept for a later run.
+    first = orchestrator.sync_changed({"broken": stores["broken"], "healthy": stores["healthy"]}, actor="scheduled", max_attempts=2)
+    assert [store_id for store_id, _ in first] == ["broken", "healthy"]
+    assert catalog.cursor("scheduled") == catalog.pending("scheduled").until
+    assert {entry.store_id: entry.attempts for entry in catalog.backlog("scheduled")} == {"broken": 1, "fleet": 0}
+
+    connector.deltas.clear()
+    second = orchestrator.sync_changed(stores, actor="scheduled", max_attempts=2)
+
+    assert [store_id for store_id, _ in second] == ["broken", "fleet"]
+    assert [shop_id for shop_id, _ in connector.deltas] == ["fleet"]
+    (dead,) = catalog.backlog("scheduled")
+    assert (dead.store_id, dead.attempts, dead.dead) == ("broken", 2, True)
+    assert orchestrator.sync_changed(stores, actor="scheduled") == []
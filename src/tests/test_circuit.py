@@ -0,0 +1,61 @@
+from conftest import baemin_store
+from domain import models
+from sync.circuit import BreakerState, CircuitBreaker
+
+
+class _Clock:
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _BlockedPortal:
+    def __init__(self):
+        self.platform = models.Platform.BAEMIN
+        self.blocked = True
+        self.logins = 0
+
+    def login(self, credential, username, password):
+        self.logins += 1
+        if self.blocked:
+            raise ValueError("CAPTCHA_BLOCKED: challenge page shown")
+        return models.AuthSession(platform=self.platform, shop_id=credential.shop_id, token="t", selector_version="v")
+
+    def fetch_snapshot(self, session):
+        return models.PlatformSnapshot(self.platform, session.shop_id, [], [], models.StoreState(store_id=session.shop_id))
+
+    def apply_changes(self, session, delta):
+        return models.ApplyResult(success=True, message="ok")
+
+
+def test_breaker_fails_fast_then_probes_once_and_closes(make_orchestrator):
+    clock = _Clock()
+    portal = _BlockedPortal()
+    orchestrator = make_orchestrator(portal, breaker=CircuitBreaker(threshold=2, cooldown=30, clock=clock))
+    stores = [baemin_store(f"store-{n}", f"shop-{n}") for n in range(5)]
+
+    messages = [orchestrator.sync_store(store, [], actor="t")[0].result.message for store in stores]
+
+    assert portal.logins == 2
+    assert all(message.startswith("CIRCUIT_OPEN") for message in messages[2:])
+    (status,) = orchestrator.breaker.snapshot()
+    assert (status.state, status.last_code) == (BreakerState.OPEN, "CAPTCHA_BLOCKED")
+
+    clock.now = 31
+    portal.blocked = False
+    assert orchestrator.breaker.snapshot()[0].state is BreakerState.HALF_OPEN
+    (probe,) = orchestrator.sync_store(stores[0], [], actor="t")
+
+    assert probe.applied and portal.logins == 3
+    assert orchestrator.breaker.snapshot()[0].state is BreakerState.CLOSED
+
+
+def test_shop_scoped_and_lower_severity_errors_do_not_trip():
+    breaker = CircuitBreaker(threshold=1)
+    breaker.record(models.Platform.YOGIYO, None, False, ["AUTH_INVALID: username mismatch"])
+    breaker.record(models.Platform.YOGIYO, None, False, ["TIMEOUT: portal did not answer"])
+
+    assert breaker.allow(models.Platform.YOGIYO) is None
+    assert breaker.record(models.Platform.YOGIYO, None, False, ["SELECTOR_MISSING: #menu-table"]) is BreakerState.OPEN
+    assert breaker.allow(models.Platform.YOGIYO).startswith("CIRCUIT_OPEN")
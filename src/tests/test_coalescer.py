@@ -0,0 +1,82 @@
+from domain import models
+from sync.coalescer import DeltaCoalescer
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _item(item_id: str, price: int, available: bool = True) -> models.Item:
+    return models.Item(id=item_id, store_id="store-1", category_id="cat-1", name=item_id, desc="", price=price, available=available)
+
+
+STORE = models.Store(id="store-1", name="테스트")
+
+
+def test_merges_bursts_last_write_wins_and_cancels_round_trips():
+    flushed = []
+    clock = _Clock()
+    coalescer = DeltaCoalescer(lambda store, platform, delta: flushed.append((store.id, platform, delta)), window=30, clock=clock)
+    before = [_item("item-1", 9000), _item("item-2", 5000)]
+
+    coalescer.submit(STORE, models.Platform.BAEMIN, models.UnifiedDelta(price_updates={"item-1": 9500}), before=before)
+    coalescer.submit(STORE, models.Platform.BAEMIN, models.UnifiedDelta(price_updates={"item-1": 9000}), before=before)
+    coalescer.submit(STORE, models.Platform.BAEMIN, models.UnifiedDelta(sold_out_items={"item-2": True}), before=before)
+    coalescer.submit(STORE, models.Platform.BAEMIN, models.UnifiedDelta(price_updates={"item-2": 5500}), before=before)
+    coalescer.submit(STORE, models.Platform.BAEMIN, models.UnifiedDelta(price_updates={"item-2": 6000}), before=before)
+
+    clock.now = 10
+    assert coalescer.flush_due() == 0
+    clock.now = 40
+    assert coalescer.flush_due() == 1
+
+    [(store_id, platform, delta)] = flushed
+    assert (store_id, platform) == ("store-1", models.Platform.BAEMIN)
+    assert delta.price_updates == {"item-2": 6000}
+    assert delta.sold_out_items == {"item-2": True}
+    assert delta.toggled_items == {"item-2": False}
+    assert coalescer.pending() == []
+
+
+def test_fully_cancelled_changes_are_not_flushed_and_flush_is_per_key():
+    flushed = []
+    coalescer = DeltaCoalescer(lambda store, platform, delta: flushed.append(platform), window=30, clock=_Clock())
+    before = [_item("item-1", 9000)]
+    coalescer.submit(STORE, models.Platform.BAEMIN, models.UnifiedDelta(toggled_items={"item-1": False}), before=before)
+    coalescer.submit(STORE, models.Platform.BAEMIN, models.UnifiedDelta(toggled_items={"item-1": True}), before=before)
+    coalescer.submit(STORE, models.Platform.YOGIYO, models.UnifiedDelta(price_updates={"item-1": 9100}))
+
+    assert coalescer.flush(platform=models.Platform.BAEMIN) == 0
+    assert coalescer.flush() == 1
+    assert flushed == [models.Platform.YOGIYO]
+
+
+def test_failed_flush_is_requeued_under_newer_edits():
+    sent = []
+    clock = _Clock()
+
+    def sink(store, platform, delta):
+        if not sent:
+            sent.append(None)
+            raise ConnectionError("portal unreachable")
+        sent.append(delta)
+
+    coalescer = DeltaCoalescer(sink, window=30, clock=clock)
+    before = [_item("item-1", 9000), _item("item-2", 5000)]
+    coalescer.submit(STORE, models.Platform.BAEMIN, models.UnifiedDelta(price_updates={"item-1": 9500}), before=before)
+
+    assert coalescer.flush() == 0
+    assert coalescer.pending() == [("store-1", models.Platform.BAEMIN)]
+    coalescer.submit(STORE, models.Platform.BAEMIN, models.UnifiedDelta(sold_out_items={"item-2": True}), before=before)
+    clock.now = 29
+    assert coalescer.flush_due() == 0
+    clock.now = 30
+    assert coalescer.flush_due() == 1
+
+    delta = sent[-1]
+    assert delta.price_updates == {"item-1": 9500}
+    assert delta.sold_out_items == {"item-2": True}
@@ -0,0 +1,79 @@
+import http.client
+import json
+from pathlib import Path
+
+from app import daemon
+from app.service import CommandService
+from app.client import DaemonClient
+from app.codec import load_outcome, load_results
+from app.bootstrap import load_store_config
+from connectors.registry import load_default_connectors
+from infrastructure.audit_logger import AuditLogger
+from infrastructure.catalog_repository import CatalogRepository
+from infrastructure.credential_store import Credential, CredentialStore
+from sync.orchestrator import SyncOrchestrator
+from sync.preview import PreviewRuleEngine
+
+SRC = Path(__file__).resolve().parents[1]
+
+
+def _service(tmp_path):
+    store, items = load_store_config(SRC / "data" / "sample_store.json")
+    credentials = CredentialStore(tmp_path / "credentials.json")
+    for binding in store.bindings:
+        credentials.save(binding.cred_ref, Credential(username="owner", password="pw"))
+    base = tmp_path / "base"
+    (base / "data").mkdir(parents=True)
+    (base / "data" / "selectors").symlink_to(SRC / "data" / "selectors")
+    orchestrator = SyncOrchestrator(
+        catalog=CatalogRepository(tmp_path / "catalog.db"),
+        credential_store=credentials,
+        audit_logger=AuditLogger(tmp_path / "audit.log"),
+        rule_engine=PreviewRuleEngine(SRC / "data" / "rules" / "preview.rules.json"),
+        connectors=load_default_connectors(base),
+        session_ttl=60,
+    )
+    return CommandService(orchestrator, store, items)
+
+
+def test_client_talks_to_running_daemon_and_decodes_results(tmp_path):
+    runtime = tmp_path / "runtime"
+    assert DaemonClient.discover(runtime) is None
+
+    server = daemon.DaemonServer(_service(tmp_path), runtime).start()
+    try:
+        client = DaemonClient.discover(runtime)
+        assert client is not None
+        results = load_results(client.call("pause", {"paused": True, "reason": "점검"}))
+        outcomes = [load_outcome(o) for o in client.call("sync", {})["outcomes"]]
+    finally:
+        server.stop()
+
+    assert [result.success for result in results] == [True, True, True]
+    assert sorted(outcome.summary.updated for outcome in outcomes)[0] == ["item-001", "item-002"]
+    assert DaemonClient.discover(runtime) is None
+
+
+def test_only_an_unknown_command_is_a_404(tmp_path):
+    server = daemon.DaemonServer(_service(tmp_path), tmp_path / "runtime").start()
+
+    def post(command, body):
+        conn = http.client.HTTPConnection(*server.address, timeout=30)
+        try:
+            conn.request("POST", f"/commands/{command}", body=body)
+            response = conn.getresponse()
+            return response.status, json.loads(response.read())["error"]
+        finally:
+            conn.close()
+
+    try:
+        unknown = post("reboot", b"{}")
+        malformed = post("pause", b"{not json")
+        # A handler's own KeyError is a failure of that command, not a missing route.
+        missing_field = post("soldout", b"{}")
+    finally:
+        server.stop()
+
+    assert unknown == (404, "Unknown command reboot")
+    assert malformed[0] == 400
+    assert missing_field == (500, "KeyError: 'item_ids'")
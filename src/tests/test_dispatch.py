@@ -0,0 +1,148 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from app.service import CommandService
+from conftest import RecordingConnector, baemin_store
+from domain import models
+from sync.dispatch import Lane, PriorityDispatcher
+from sync.metrics import MetricsRegistry
+
+
+def _queue(dispatcher, order, name, lane, hold=None, platforms=None):
+    """Starts a worker that records ``name`` once admitted, and waits until its ticket is queued."""
+
+    queued = sum(dispatcher.waiting().values())
+
+    def work():
+        with dispatcher.slot(lane, platforms):
+            order.append(name)
+            if hold is not None:
+                hold.wait(5)
+
+    thread = threading.Thread(target=work, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while sum(dispatcher.waiting().values()) == queued and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return thread
+
+
+def test_urgent_work_overtakes_queued_bulk_chunks():
+    metrics = MetricsRegistry()
+    dispatcher = PriorityDispatcher(metrics=metrics)
+    order = []
+
+    running = dispatcher.acquire(Lane.BULK)
+    # Nested slots on the admitted thread do not queue.
+    with dispatcher.slot(Lane.URGENT):
+        pass
+    threads = [
+        _queue(dispatcher, order, "bulk-2", Lane.BULK),
+        _queue(dispatcher, order, "pause", Lane.URGENT),
+    ]
+    assert dispatcher.waiting() == {Lane.URGENT: 1, Lane.NORMAL: 0, Lane.BULK: 1}
+    dispatcher.release(running)
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["pause", "bulk-2"]
+    text = metrics.render()
+    assert 'baedal_dispatch_wait_seconds_count{lane="urgent"} 1' in text
+    assert 'baedal_dispatch_wait_seconds_count{lane="bulk"} 2' in text
+
+
+def test_work_on_other_platforms_overlaps_and_same_platform_waits():
+    dispatcher = PriorityDispatcher()
+    order = []
+    baemin, yogiyo = models.Platform.BAEMIN, models.Platform.YOGIYO
+
+    running = dispatcher.acquire(Lane.BULK, [baemin])
+    waiting = _queue(dispatcher, order, "pause-baemin", Lane.URGENT, platforms=[baemin, yogiyo])
+    # The queued urgent ticket reserves yogiyo, so later bulk work cannot take it first.
+    bulk = _queue(dispatcher, order, "bulk-yogiyo", Lane.BULK, platforms=[yogiyo])
+    with dispatcher.slot(Lane.URGENT, [models.Platform.CEATS]):
+        order.append("soldout-ceats")
+    assert dispatcher.waiting() == {Lane.URGENT: 1, Lane.NORMAL: 0, Lane.BULK: 1}
+    dispatcher.release(running)
+    for thread in (waiting, bulk):
+        thread.join(5)
+
+    assert order == ["soldout-ceats", "pause-baemin", "bulk-yogiyo"]
+
+
+def test_bulk_chunk_is_promoted_after_max_skips():
+    dispatcher = PriorityDispatcher(max_skips=1)
+    order = []
+    finish_first = threading.Event()
+
+    running = dispatcher.acquire(Lane.BULK)
+    threads = [
+        _queue(dispatcher, order, "bulk", Lane.BULK),
+        _queue(dispatcher, order, "urgent-1", Lane.URGENT, hold=finish_first),
+    ]
+    dispatcher.release(running)
+    threads.append(_queue(dispatcher, order, "urgent-2", Lane.URGENT))
+    finish_first.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["urgent-1", "bulk", "urgent-2"]
+
+
+def test_change_feed_sync_is_admitted_one_store_at_a_time(connector, make_orchestrator):
+    admitted = []
+
+    @contextmanager
+    def chunk(stores):
+        # Records which shops had already been written when each admission began.
+        admitted.append(([store.id for store in stores], [shop_id for shop_id, _ in connector.deltas]))
+        yield
+
+    orchestrator = make_orchestrator(connector)
+    stores = {}
+    for store_id in ("a", "b"):
+        stores[store_id] = baemin_store(store_id)
+        item = models.Item(id="item-1", store_id=store_id, category_id="c", name="메뉴", desc="", price=1000)
+        orchestrator.catalog.save_snapshot(
+            models.PlatformSnapshot(models.Platform.BAEMIN, store_id, [item], [], models.StoreState(store_id=store_id))
+        )
+
+    orchestrator.sync_changed(stores, actor="scheduled", chunk=chunk)
+
+    assert admitted == [(["a"], []), (["b"], ["a"])]
+    assert [shop_id for shop_id, _ in connector.deltas] == ["a", "b"]
+
+
+def test_service_pause_on_one_platform_runs_while_a_sync_holds_another(make_orchestrator):
+    started, release = threading.Event(), threading.Event()
+
+    class _SlowConnector(RecordingConnector):
+        def apply_changes(self, session, delta):
+            started.set()
+            release.wait(5)
+            return super().apply_changes(session, delta)
+
+    class _PausingConnector(RecordingConnector):
+        def set_pause(self, session, command):
+            return models.ApplyResult(success=True, message="paused")
+
+    yogiyo = models.Platform.YOGIYO
+    orchestrator = make_orchestrator({models.Platform.BAEMIN: _SlowConnector(), yogiyo: _PausingConnector(yogiyo)})
+    synced = baemin_store("a")
+    paused = models.Store(id="b", name="매장", bindings=[models.CredentialBinding(platform=yogiyo, shop_id="b", cred_ref="cred")])
+    item = models.Item(id="item-1", store_id="a", category_id="c", name="메뉴", desc="", price=1000)
+    service = CommandService(orchestrator, synced, [item], priority_lanes=True)
+    service.add_stores([(paused, [])])
+
+    sync = threading.Thread(target=service.execute, args=("sync", {"store_ids": ["a"]}))
+    sync.start()
+    assert started.wait(5)
+    try:
+        response = service.execute("pause", {"paused": True, "store_ids": ["b"]})
+        assert sync.is_alive()
+    finally:
+        release.set()
+        sync.join(5)
+
+    assert [result["success"] for result in response["results"]] == [True]
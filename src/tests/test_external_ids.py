@@ -0,0 +1,76 @@
+from conftest import baemin_store
+from domain import models
+from domain.external_ids import index_items
+from infrastructure.catalog_repository import CatalogRepository
+from sync import diff
+
+
+class _PortalConnector:
+    """Lists items under its own ids, like a real portal."""
+
+    def __init__(self, platform, items):
+        self.platform = platform
+        self.items = {item.id: item for item in items}
+        self.deltas = []
+
+    def login(self, credential, username, password):
+        return models.AuthSession(platform=self.platform, shop_id=credential.shop_id, token="t", selector_version="v")
+
+    def fetch_snapshot(self, session):
+        return models.PlatformSnapshot(self.platform, session.shop_id, list(self.items.values()), [], models.StoreState(store_id=session.shop_id))
+
+    def apply_changes(self, session, delta):
+        self.deltas.append(delta)
+        for item in delta.updated_items:
+            self.items[item.id] = item
+        return models.ApplyResult(success=True, message="ok")
+
+
+def _item(n, price=1000, **external):
+    mappings = [models.ItemMapping(platform=models.Platform(name), external_id=value) for name, value in external.items()]
+    return models.Item(id=f"item-{n}", store_id="s", category_id="c", name=f"메뉴 {n}", desc="", price=price, external_mappings=mappings)
+
+
+def test_repository_keeps_bidirectional_index_in_step_with_items(tmp_path):
+    catalog = CatalogRepository(tmp_path / "catalog.db")
+
+    def save(items):
+        catalog.save_snapshot(models.PlatformSnapshot(models.Platform.BAEMIN, "s", items, [], models.StoreState(store_id="s")))
+
+    save([_item(1, BAEMIN="bm-1", YOGIYO="yg-1"), _item(2, BAEMIN="bm-2"), _item(3)])
+    ids = catalog.external_ids("s")
+    assert ids == index_items(catalog.load_snapshot("s").items)
+    assert ids[models.Platform.BAEMIN].item_id("bm-2") == "item-2"
+    assert ids[models.Platform.YOGIYO].external_id("item-1") == "yg-1"
+    assert ids[models.Platform.BAEMIN].external_id("item-3") == "item-3"
+
+    save([_item(1, BAEMIN="bm-1b"), _item(2, BAEMIN="bm-2"), _item(3)])
+    baemin = catalog.external_ids("s")[models.Platform.BAEMIN]
+    assert baemin.to_item == {"bm-1b": "item-1", "bm-2": "item-2"}
+    assert models.Platform.YOGIYO not in catalog.external_ids("s")
+
+
+def test_sync_diffs_and_applies_through_portal_ids(make_orchestrator):
+    remote = [
+        models.Item(id="bm-1", store_id="s", category_id="c", name="메뉴 1", desc="", price=1000),
+        models.Item(id="bm-2", store_id="s", category_id="c", name="메뉴 2", desc="", price=1000),
+    ]
+    connector = _PortalConnector(models.Platform.BAEMIN, remote)
+    orchestrator = make_orchestrator(connector)
+    store = baemin_store("s", "shop")
+    items = [_item(1, BAEMIN="bm-1"), _item(2, price=1500, BAEMIN="bm-2"), _item(3)]
+
+    (outcome,) = orchestrator.sync_store(store, items, actor="tester")
+
+    assert outcome.applied
+    assert outcome.summary.price_changed == [("item-2", 1000, 1500)]
+    assert outcome.summary.updated == ["item-3"]
+    (delta,) = connector.deltas
+    assert delta.price_updates == {"bm-2": 1500}
+    assert [item.id for item in delta.updated_items] == ["item-3"]
+    orchestrator.set_sold_out(store, ["item-1"], sold_out=True, actor="tester")
+    assert connector.deltas[-1].sold_out_items == {"bm-1": True}
+
+    # Matching on catalog ids alone would re-create every item under a second id.
+    unmatched, _ = diff.calculate_delta(items, remote)
+    assert len(unmatched.updated_items) == 3
@@ -0,0 +1,141 @@
+import socket
+import threading
+
+import pytest
+
+from connectors.base import FileBackedConnector, SelectorMap
+from connectors.http_connector import ConnectionPool, HttpCall, HttpConnector
+from connectors.mock_portal import MockPortalServer
+from domain import models
+
+
+def _item(item_id: str, price: int) -> models.Item:
+    return models.Item(id=item_id, store_id="store-1", category_id="cat-1", name=item_id, desc="", price=price)
+
+
+@pytest.fixture
+def portal(tmp_path):
+    selectors = SelectorMap(platform=models.Platform.BAEMIN, version="v-test", payload={})
+    backend = FileBackedConnector(models.Platform.BAEMIN, selectors, tmp_path / "state")
+    backend.register_credentials("shop-1", "owner")
+    with MockPortalServer({models.Platform.BAEMIN: backend}) as server:
+        yield server
+
+
+def _binding(shop_id: str) -> models.CredentialBinding:
+    return models.CredentialBinding(platform=models.Platform.BAEMIN, shop_id=shop_id, cred_ref="cred")
+
+
+def test_http_connector_round_trip_reuses_one_connection(portal):
+    pool = ConnectionPool(*portal.address)
+    connector = HttpConnector(models.Platform.BAEMIN, pool)
+    session = connector.login(_binding("shop-1"), "owner", "pw")
+
+    result = connector.apply_changes(session, models.UnifiedDelta(updated_items=[_item("item-1", 9000)]))
+    assert result.success
+    connector.apply_changes(session, models.UnifiedDelta(sold_out_items={"item-1": True}))
+    snapshot = connector.fetch_snapshot(session)
+
+    assert [(item.id, item.available) for item in snapshot.items] == [("item-1", False)]
+    assert pool.connections_opened == 1
+    assert portal.connections_accepted == 1
+
+
+def test_http_connector_rejects_wrong_username(portal):
+    connector = HttpConnector(models.Platform.BAEMIN, ConnectionPool(*portal.address))
+    with pytest.raises(ValueError, match="AUTH_INVALID"):
+        connector.login(_binding("shop-1"), "intruder", "pw")
+
+
+def test_pipelined_fetch_and_batch_apply(portal):
+    pool = ConnectionPool(*portal.address)
+    connector = HttpConnector(models.Platform.BAEMIN, pool)
+    sessions = [connector.login(_binding(f"shop-{i}"), "owner", "pw") for i in range(1, 4)]
+
+    results = connector.apply_changes_batch([(s, models.UnifiedDelta(updated_items=[_item("item-1", 1000)])) for s in sessions])
+    snapshots = connector.fetch_snapshots(sessions)
+
+    assert all(result.success for result in results)
+    assert [snapshot.store_id for snapshot in snapshots] == ["shop-1", "shop-2", "shop-3"]
+    assert pool.connections_opened == 1
+
+
+def test_bad_call_in_a_batch_fails_alone(portal):
+    pool = ConnectionPool(*portal.address)
+    connector = HttpConnector(models.Platform.BAEMIN, pool)
+    session = connector.login(_binding("shop-1"), "owner", "pw")
+    changes = {"method": "POST", "path": "/BAEMIN/shops/shop-1/changes", "token": session.token}
+    requests = [
+        {**changes, "body": {"updated_items": [{"id": "item-1"}]}},
+        {**changes, "body": {"sold_out_items": {"item-1": True}}},
+        {"path": "/BAEMIN/shops/shop-1/snapshot"},
+    ]
+
+    (response,) = pool.exchange([HttpCall("POST", "/batch", {"requests": requests})])
+
+    assert response.status == 200
+    # A payload the portal chokes on is a 500 and a call missing its method a 400, each for that call only.
+    assert [entry["status"] for entry in response.body["responses"]] == [500, 200, 400]
+
+
+def test_pool_without_keep_alive_opens_connection_per_request(portal):
+    pool = ConnectionPool(*portal.address, keep_alive=False)
+    connector = HttpConnector(models.Platform.BAEMIN, pool)
+    session = connector.login(_binding("shop-1"), "owner", "pw")
+    connector.fetch_snapshot(session)
+    connector.fetch_snapshot(session)
+    assert pool.connections_opened == 3
+
+
+class _DroppingPortal:
+    """Answers the first request on every connection and drops the connection after reading the next one."""
+
+    def __init__(self):
+        self.requests = []
+        self._server = socket.create_server(("127.0.0.1", 0))
+        self.address = self._server.getsockname()
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                sock, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(sock,), daemon=True).start()
+
+    def _handle(self, sock):
+        reader = sock.makefile("rb")
+        with sock, reader:
+            for answered in (True, False):
+                method = reader.readline().split(b" ")[0].decode()
+                length = 0
+                while (line := reader.readline()) not in (b"\r\n", b""):
+                    if line.lower().startswith(b"content-length"):
+                        length = int(line.split(b":")[1])
+                reader.read(length)
+                self.requests.append(method)
+                if not answered:
+                    return
+                sock.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+
+    def close(self):
+        self._server.close()
+
+
+def test_pool_retries_dropped_reads_only_for_idempotent_calls():
+    portal = _DroppingPortal()
+    pool = ConnectionPool(*portal.address)
+    try:
+        pool.exchange([HttpCall("POST", "/changes", {})])
+        with pytest.raises(ConnectionError):
+            pool.exchange([HttpCall("POST", "/changes", {})])
+        assert portal.requests == ["POST", "POST"]
+
+        pool.exchange([HttpCall("GET", "/snapshot")])
+        (response,) = pool.exchange([HttpCall("GET", "/snapshot")])
+        assert response.status == 200
+        assert portal.requests == ["POST", "POST", "GET", "GET", "GET"]
+    finally:
+        pool.close()
+        portal.close()
@@ -0,0 +1,62 @@
+import struct
+from pathlib import Path
+
+from domain import models
+from sync.images import read_image_header
+from sync.preview import PreviewRuleEngine
+
+RULES = Path(__file__).resolve().parents[1] / "data" / "rules" / "preview.rules.json"
+
+
+def _png(width, height):
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I4sII", 13, b"IHDR", width, height) + b"\x08\x02\x00\x00\x00" + b"\x00" * 16
+
+
+def _jpeg(width, height):
+    exif = b"\xff\xe1" + struct.pack(">H", 2 + 5000) + b"\x00" * 5000
+    sof = b"\xff\xc2" + struct.pack(">HBHHB", 11, 8, height, width, 1) + b"\x01\x11\x00"
+    return b"\xff\xd8" + exif + sof + b"\xff\xd9"
+
+
+def _webp_lossless(width, height):
+    bits = (width - 1) | ((height - 1) << 14)
+    payload = b"\x2f" + struct.pack("<I", bits)
+    return b"RIFF" + struct.pack("<I", 4 + 8 + len(payload)) + b"WEBP" + b"VP8L" + struct.pack("<I", len(payload)) + payload
+
+
+def test_headers_give_dimensions_without_decoding(tmp_path):
+    for name, data, expected in [
+        ("a.png", _png(800, 600), ("png", 800, 600)),
+        ("b.jpg", _jpeg(1024, 1024), ("jpeg", 1024, 1024)),
+        ("c.webp", _webp_lossless(700, 700), ("webp", 700, 700)),
+    ]:
+        (tmp_path / name).write_bytes(data)
+        probe = read_image_header(tmp_path / name)
+        assert (probe.format, probe.width, probe.height) == expected
+        assert probe.size == len(data)
+
+
+def test_rule_engine_reports_upload_fail_and_caches_probes(tmp_path):
+    (tmp_path / "square.png").write_bytes(_png(600, 600))
+    (tmp_path / "small.png").write_bytes(_png(550, 550))
+    (tmp_path / "broken.png").write_bytes(b"not an image")
+    items = [
+        models.Item(id=f"item-{n}", store_id="s", category_id="c", name="메뉴", desc="", price=6000, image_url=url)
+        for n, url in enumerate(["square.png", "small.png", "broken.png", "missing.png", "https://cdn.example/x.png"])
+    ]
+    engine = PreviewRuleEngine(RULES, image_root=tmp_path)
+    platforms = [models.Platform.BAEMIN, models.Platform.YOGIYO]
+
+    issues = engine.validate_all(platforms, items)
+
+    assert sorted({issue.item_id for issue in issues[models.Platform.BAEMIN]}) == ["item-1", "item-2", "item-3"]
+    assert sorted({issue.item_id for issue in issues[models.Platform.YOGIYO]}) == ["item-2", "item-3"]
+    assert all(issue.message.startswith("UPLOAD_FAIL: ") for issue in issues[models.Platform.BAEMIN])
+    assert (engine.images.hits, engine.images.misses) == (0, 3)
+
+    engine.validate_all(platforms, items)
+    assert (engine.images.hits, engine.images.misses) == (3, 3)
+
+    (tmp_path / "small.png").write_bytes(_png(640, 640) + b"\x00")
+    assert engine.validate(models.Platform.BAEMIN, items[1:2]) == []
+    assert engine.images.misses == 4
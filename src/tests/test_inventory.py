@@ -0,0 +1,93 @@
+import dataclasses
+
+from app.service import CommandService
+from conftest import baemin_store
+from domain import models
+from infrastructure.inventory_store import InventoryStore
+from sync.coalescer import DeltaCoalescer
+from sync.inventory import InventoryService, StockEvent
+
+STORE = models.Store(
+    id="store-1",
+    name="테스트 매장",
+    bindings=[
+        models.CredentialBinding(platform=models.Platform.BAEMIN, shop_id="b-1", cred_ref="cred-b"),
+        models.CredentialBinding(platform=models.Platform.CEATS, shop_id="c-1", cred_ref="cred-c"),
+    ],
+)
+
+
+def _service(tmp_path, sent):
+    coalescer = DeltaCoalescer(lambda store, platform, delta: sent.append((platform, delta)), window=5, clock=lambda: 0.0)
+    return InventoryService(InventoryStore(tmp_path / "inventory.db"), {STORE.id: STORE}.get, coalescer)
+
+
+def test_order_burst_sends_one_batched_sold_out_delta_per_platform(tmp_path):
+    sent = []
+    service = _service(tmp_path, sent)
+    service.record(
+        [
+            StockEvent(STORE.id, "gimbap", qty=3, low=1),
+            StockEvent(STORE.id, "ramen", qty=2),
+            StockEvent(STORE.id, "untracked", delta=-1),
+        ]
+    )
+    orders = [StockEvent(STORE.id, "gimbap", delta=-1), StockEvent(STORE.id, "ramen", delta=-1)] * 3
+    transitions = service.record(orders)
+
+    assert transitions == 2
+    assert sent == []
+    assert service.flush() == 2
+    assert [platform for platform, _ in sent] == [models.Platform.BAEMIN, models.Platform.CEATS]
+    assert sent[0][1].sold_out_items == {"gimbap": True, "ramen": True}
+    assert service.sold_out(STORE.id) == ["gimbap", "ramen"]
+
+
+def test_counts_are_persisted_and_restock_reopens_item(tmp_path):
+    sent = []
+    service = _service(tmp_path, sent)
+    service.record([StockEvent(STORE.id, "gimbap", qty=1), StockEvent(STORE.id, "gimbap", delta=-1)])
+    service.flush()
+
+    restarted = _service(tmp_path, sent)
+    assert restarted.sold_out(STORE.id) == ["gimbap"]
+    assert restarted.record([StockEvent(STORE.id, "gimbap", qty=10)]) == 1
+    restarted.flush()
+    assert sent[-1][1].sold_out_items == {"gimbap": False}
+    assert [inv.qty for inv in restarted.levels(STORE.id)] == [10]
+
+
+def test_depleted_item_stays_sold_out_through_the_next_sync(tmp_path, connector, make_orchestrator):
+    orchestrator = make_orchestrator(connector)
+    store = baemin_store("store-1")
+    items = [
+        models.Item(id=item_id, store_id=store.id, category_id="c", name="메뉴", desc="", price=1000) for item_id in ("gimbap", "ramen")
+    ]
+    service = CommandService(orchestrator, store, items, inventory=InventoryStore(tmp_path / "inventory.db"))
+    service.execute("sync", {})
+    connector.items[store.id] = items
+
+    response = service.execute("stock", {"events": [{"item_id": "gimbap", "qty": 1}, {"item_id": "gimbap", "delta": -1}]})
+    assert response["sent"] == 1
+    (_, depleted) = connector.deltas[-1]
+    assert depleted.sold_out_items == {"gimbap": True}
+    connector.items[store.id] = [dataclasses.replace(items[0], available=False), items[1]]
+    connector.deltas.clear()
+
+    service.execute("sync", {})
+
+    assert all(not delta.sold_out_items for _, delta in connector.deltas)
+    assert [item.available for item in orchestrator.catalog.load_snapshot(store.id).items] == [False, True]
+
+
+def test_sold_out_restocked_within_the_window_sends_nothing(tmp_path):
+    sent = []
+    service = _service(tmp_path, sent)
+    service.record([StockEvent(STORE.id, "gimbap", qty=1)])
+
+    assert service.record([StockEvent(STORE.id, "gimbap", delta=-1)]) == 1
+    assert service.record([StockEvent(STORE.id, "gimbap", qty=5)]) == 1
+
+    service.flush()
+    assert sent == []
+    assert service.sold_out(STORE.id) == []
@@ -0,0 +1,38 @@
+from domain import models
+from sync.diff import DiffSummary
+from sync.metrics import MetricsRegistry, StageTimer
+from sync.outcome import SyncOutcome
+
+
+def test_stage_timer_accumulates_repeated_spans():
+    timer = StageTimer()
+    with timer.span("fetch"):
+        pass
+    with timer.span("fetch"):
+        pass
+    with timer.span("apply"):
+        pass
+
+    assert list(timer.stages) == ["fetch", "apply"]
+    assert all(seconds >= 0 for seconds in timer.stages.values())
+
+
+def test_outcomes_render_as_prometheus_counters_and_histograms():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    summary = DiffSummary([], [], [])
+    for seconds in (0.05, 0.5, 3.0):
+        registry.record_outcome(
+            "sync",
+            SyncOutcome(
+                models.Platform.BAEMIN, True, summary, models.ApplyResult(True, "ok"), [], timings={"fetch": seconds}
+            ),
+        )
+
+    text = registry.render()
+    assert 'baedal_sync_outcomes_total{operation="sync",platform="BAEMIN",result="applied"} 3' in text
+    assert '# TYPE baedal_sync_stage_seconds histogram' in text
+    labels = 'operation="sync",platform="BAEMIN",stage="fetch"'
+    assert f'baedal_sync_stage_seconds_bucket{{{labels},le="0.1"}} 1' in text
+    assert f'baedal_sync_stage_seconds_bucket{{{labels},le="1"}} 2' in text
+    assert f'baedal_sync_stage_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+    assert f"baedal_sync_stage_seconds_sum{{{labels}}} 3.550000" in text
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from domain import models
+from sync.normalize import PriceNormalizer, make_rounder
+from sync.preview import PreviewRuleEngine
+
+RULES = Path(__file__).resolve().parents[1] / "data" / "rules" / "preview.rules.json"
+
+
+def _item(item_id: str, price: int, delta: int = 0) -> models.Item:
+    option = models.Option(id=f"{item_id}-opt", group_id=f"{item_id}-grp", name="추가", price_delta=delta)
+    group = models.OptionGroup(id=f"{item_id}-grp", item_id=item_id, name="옵션", options=[option])
+    return models.Item(id=item_id, store_id="store-1", category_id="cat-1", name=item_id, desc="", price=price, options=[group])
+
+
+def test_rounding_modes():
+    nearest = make_rounder("nearest-step", 50, 100)
+    ceil = make_rounder("ceil-step", 100, 100)
+    assert [nearest(v) for v in (6024, 6025, 6050, 40)] == [6000, 6050, 6050, 100]
+    assert [ceil(v) for v in (6001, 6000, 40)] == [6100, 6000, 100]
+
+
+def test_normalize_all_adjusts_per_platform_and_reports_changes():
+    engine = PreviewRuleEngine(RULES)
+    normalizer = PriceNormalizer(engine)
+    items = [_item("item-1", 6030, delta=520), _item("item-2", 6000)]
+
+    result = normalizer.normalize_all([models.Platform.BAEMIN, models.Platform.YOGIYO], items)
+
+    baemin_items, baemin_report = result[models.Platform.BAEMIN]
+    yogiyo_items, yogiyo_report = result[models.Platform.YOGIYO]
+    assert [(a.item_id, a.field, a.before, a.after) for a in baemin_report.adjustments] == [
+        ("item-1", "price", 6030, 6050),
+        ("item-1", "option:item-1-opt", 520, 500),
+    ]
+    assert [(a.field, a.after) for a in yogiyo_report.adjustments] == [("price", 6100), ("option:item-1-opt", 600)]
+    assert baemin_items[1] is items[1]
+    assert items[0].price == 6030 and items[0].options[0].options[0].price_delta == 520
+    assert engine.validate(models.Platform.BAEMIN, baemin_items) == []
+    assert engine.validate(models.Platform.YOGIYO, yogiyo_items) == []
@@ -0,0 +1,72 @@
+import json
+from datetime import time
+
+from domain import models
+
+
+class _CountingPortal:
+    def __init__(self, platform):
+        self.platform = platform
+        self.state = models.StoreState(store_id="shop")
+        self.hours = []
+        self.fetches = 0
+        self.writes = 0
+
+    def login(self, credential, username, password):
+        return models.AuthSession(platform=self.platform, shop_id=credential.shop_id, token="t", selector_version="v")
+
+    def fetch_snapshot(self, session):
+        self.fetches += 1
+        return models.PlatformSnapshot(self.platform, session.shop_id, [], list(self.hours), self.state)
+
+    def set_pause(self, session, command):
+        self.writes += 1
+        self.state = models.StoreState(store_id="shop", paused=command.paused, reason=command.reason, until=command.until)
+        return models.ApplyResult(success=True, message="Updated pause state")
+
+    def set_operating_hours(self, session, command):
+        self.writes += 1
+        self.hours = list(command.hours)
+        return models.ApplyResult(success=True, message="Updated operating hours")
+
+
+def _orchestrator(make_orchestrator, snapshot_ttl=0.0):
+    portals = {p: _CountingPortal(p) for p in (models.Platform.BAEMIN, models.Platform.YOGIYO)}
+    store = models.Store(
+        id="store-1",
+        name="테스트 매장",
+        bindings=[models.CredentialBinding(platform=p, shop_id=f"{p.value}-1", cred_ref="cred") for p in portals],
+    )
+    orchestrator = make_orchestrator(portals, snapshot_ttl=snapshot_ttl)
+    return orchestrator, store, portals
+
+
+def test_pause_skips_platforms_already_in_target_state_and_audits_real_before(tmp_path, make_orchestrator):
+    orchestrator, store, portals = _orchestrator(make_orchestrator)
+    portals[models.Platform.YOGIYO].state = models.StoreState(store_id="shop", paused=True, reason="점검")
+
+    results = orchestrator.toggle_pause(store, models.PauseCommand(store_id=store.id, paused=True, reason="점검"), actor="t")
+
+    assert [result.skipped for result in results] == [False, True]
+    assert results[1].message == "YOGIYO:YOGIYO-1 already paused"
+    assert [portal.writes for portal in portals.values()] == [1, 0]
+    (entry,) = [json.loads(line) for line in (tmp_path / "audit.log").read_text(encoding="utf-8").splitlines()]
+    assert entry["before"]["paused"] is False
+    assert entry["after"] == {"store_id": "shop", "paused": True, "reason": "점검", "until": None}
+
+
+def test_repeated_standard_hours_write_once_and_reuse_cached_state(make_orchestrator):
+    orchestrator, store, portals = _orchestrator(make_orchestrator, snapshot_ttl=60)
+    hours = [models.OperatingHours(store_id=store.id, dow=dow, open=time(10), close=time(22)) for dow in range(1, 8)]
+    command = models.HoursCommand(store_id=store.id, hours=hours)
+
+    first = orchestrator.update_hours(store, command, actor="nightly")
+    second = orchestrator.update_hours(store, command, actor="nightly")
+
+    assert not any(result.skipped for result in first)
+    assert all(result.skipped for result in second)
+    assert [result.message for result in second] == [
+        "BAEMIN:BAEMIN-1 hours already up to date",
+        "YOGIYO:YOGIYO-1 hours already up to date",
+    ]
+    assert all(portal.writes == 1 and portal.fetches == 1 for portal in portals.values())
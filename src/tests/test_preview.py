@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from domain import models
+from sync.preview import PreviewRuleEngine
+
+RULES = Path(__file__).resolve().parents[1] / "data" / "rules" / "preview.rules.json"
+
+
+def _item(item_id: str, price: int, delta: int = 0) -> models.Item:
+    option = models.Option(id=f"{item_id}-opt", group_id=f"{item_id}-grp", name="추가", price_delta=delta)
+    group = models.OptionGroup(id=f"{item_id}-grp", item_id=item_id, name="옵션", options=[option])
+    return models.Item(id=item_id, store_id="store-1", category_id="cat-1", name=item_id, desc="", price=price, options=[group])
+
+
+def test_validate_all_reports_each_platform_in_one_pass():
+    engine = PreviewRuleEngine(RULES)
+    items = [_item("item-1", 6050, delta=50), _item("item-2", 6000), _item("item-3", 6005)]
+
+    issues = engine.validate_all([models.Platform.BAEMIN, models.Platform.YOGIYO, models.Platform.CEATS], items)
+
+    assert [(i.item_id, i.field) for i in issues[models.Platform.BAEMIN]] == [("item-3", "price")]
+    assert [(i.item_id, i.field) for i in issues[models.Platform.YOGIYO]] == [
+        ("item-1", "price"),
+        ("item-1", "option:item-1-opt"),
+        ("item-3", "price"),
+    ]
+    assert [(i.item_id, i.field) for i in issues[models.Platform.CEATS]] == [("item-3", "price")]
+    assert engine.validate(models.Platform.YOGIYO, items) == issues[models.Platform.YOGIYO]
+
+
+def test_memoised_results_follow_item_content():
+    engine = PreviewRuleEngine(RULES)
+    item = _item("item-1", 6000)
+    assert engine.validate(models.Platform.BAEMIN, [item]) == []
+    item.price = 6001
+    assert [i.message for i in engine.validate(models.Platform.BAEMIN, [item])] == ["가격 단위(50)에 맞지 않습니다"]
+
+
+def test_validate_delta_checks_price_only_updates():
+    engine = PreviewRuleEngine(RULES)
+    delta = models.UnifiedDelta(updated_items=[_item("item-1", 6000)], price_updates={"item-2": 6005}, sold_out_items={"item-3": True})
+
+    issues = engine.validate_delta(models.Platform.BAEMIN, delta)
+
+    assert [(i.item_id, i.field) for i in issues] == [("item-2", "price")]
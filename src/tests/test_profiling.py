@@ -0,0 +1,45 @@
+import tracemalloc
+
+from app.profiling import MemoryStageObserver, cpu_profile, memory_profile
+from sync.metrics import StageTimer, observed_stage
+
+
+def test_memory_profile_reports_each_observed_stage(tmp_path):
+    timer = StageTimer()
+    with memory_profile(tmp_path, "sync"):
+        with observed_stage("load"):
+            rows = [{"id": index} for index in range(5000)]
+        with timer.span("diff"):
+            changed = [row for row in rows if row["id"] % 2]
+
+    (report,) = tmp_path.glob("sync-*.mem.txt")
+    text = report.read_text(encoding="utf-8")
+    assert "[load] calls=1" in text
+    assert "[diff] calls=1" in text
+    assert "test_profiling.py" in text
+    assert changed and "diff" in timer.stages
+
+
+def test_outer_stage_keeps_the_peak_reached_before_a_nested_stage():
+    observer = MemoryStageObserver()
+    tracemalloc.start()
+    try:
+        observer.enter("sync")
+        block = bytearray(4_000_000)
+        del block
+        observer.enter("diff")
+        observer.exit("diff")
+        observer.exit("sync")
+    finally:
+        tracemalloc.stop()
+
+    assert observer.stages["sync"].peak >= 4_000_000 > observer.stages["diff"].peak
+
+
+def test_cpu_profile_writes_raw_and_sorted_stats(tmp_path):
+    with cpu_profile(tmp_path, "preview"):
+        sorted(range(10000), key=lambda value: -value)
+
+    assert len(list(tmp_path.glob("preview-*.prof"))) == 1
+    (report,) = tmp_path.glob("preview-*.cpu.txt")
+    assert "cumulative" in report.read_text(encoding="utf-8")
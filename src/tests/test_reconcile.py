@@ -0,0 +1,112 @@
+import dataclasses
+
+from conftest import baemin_store
+from domain import models
+from sync.reconcile import ReconcileQueue
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _LaggingConnector:
+    """Acknowledges every write but silently drops price updates while ``drop_prices`` is set."""
+
+    def __init__(self, platform):
+        self.platform = platform
+        self.items = {}
+        self.fetches = 0
+        self.drop_prices = False
+
+    def login(self, credential, username, password):
+        return models.AuthSession(platform=self.platform, shop_id=credential.shop_id, token="t", selector_version="v")
+
+    def fetch_snapshot(self, session):
+        self.fetches += 1
+        return models.PlatformSnapshot(self.platform, session.shop_id, list(self.items.values()), [], models.StoreState(store_id=session.shop_id))
+
+    def apply_changes(self, session, delta):
+        for item in delta.updated_items:
+            self.items[item.id] = dataclasses.replace(item)
+        for item_id, sold_out in delta.sold_out_items.items():
+            self.items[item_id].available = not sold_out
+        if not self.drop_prices:
+            for item_id, price in delta.price_updates.items():
+                self.items[item_id].price = price
+        return models.ApplyResult(success=True, message="ok")
+
+
+def _setup(make_orchestrator, max_attempts=3):
+    clock = _Clock()
+    connector = _LaggingConnector(models.Platform.BAEMIN)
+    orchestrator = make_orchestrator(
+        connector, reconciler=ReconcileQueue(settle_delay=10, max_attempts=max_attempts, clock=clock)
+    )
+    store = baemin_store("s", "shop")
+    items = [models.Item(id=f"item-{n}", store_id="s", category_id="c", name=f"메뉴 {n}", desc="", price=1000) for n in range(3)]
+    orchestrator.sync_store(store, items, actor="seed")
+    return clock, connector, orchestrator, store, items
+
+
+def test_applies_to_one_shop_are_verified_with_a_single_delayed_fetch(make_orchestrator):
+    clock, connector, orchestrator, store, items = _setup(make_orchestrator)
+    connector.drop_prices = True
+    items[1].price = 1500
+    clock.now = 5
+    orchestrator.sync_store(store, items, actor="console")
+    orchestrator.set_sold_out(store, ["item-2"], sold_out=True, actor="console")
+    fetches = connector.fetches
+
+    clock.now = 14
+    assert orchestrator.reconcile() == []
+    clock.now = 15
+    (result,) = orchestrator.reconcile()
+
+    assert connector.fetches == fetches + 1
+    assert [(m.item_id, m.field, m.expected, m.actual) for m in result.mismatches] == [("item-1", "price", 1500, 1000)]
+    assert result.requeued and result.error is None
+    assert len(orchestrator.reconciler) == 1
+
+    connector.items["item-1"].price = 1500
+    clock.now = 25
+    (result,) = orchestrator.reconcile()
+    assert result.ok and result.checked == 1
+    assert len(orchestrator.reconciler) == 0
+
+
+def test_persistent_mismatch_is_reported_as_snapshot_mismatch(make_orchestrator):
+    clock, connector, orchestrator, store, items = _setup(make_orchestrator, max_attempts=2)
+    orchestrator.reconcile(force=True)
+    connector.drop_prices = True
+    items[0].price = 2000
+    orchestrator.sync_store(store, items, actor="console")
+
+    first = orchestrator.reconcile(force=True)
+    second = orchestrator.reconcile(force=True)
+
+    assert first[0].requeued
+    assert not second[0].requeued
+    assert second[0].error.startswith("SNAPSHOT_MISMATCH: 1 field(s) on BAEMIN:shop")
+    assert orchestrator.reconcile(force=True) == []
+
+
+def test_check_that_raises_is_requeued_not_lost(make_orchestrator):
+    clock, connector, orchestrator, store, items = _setup(make_orchestrator)
+    orchestrator.reconcile(force=True)
+    items[0].price = 2000
+    orchestrator.sync_store(store, items, actor="console")
+    fetch = connector.fetch_snapshot
+    # A malformed listing makes the comparison itself blow up.
+    connector.fetch_snapshot = lambda session: dataclasses.replace(fetch(session), items=None)
+
+    (result,) = orchestrator.reconcile(force=True)
+
+    assert result.error and result.requeued
+    assert len(orchestrator.reconciler) == 1
+    connector.fetch_snapshot = fetch
+    (result,) = orchestrator.reconcile(force=True)
+    assert result.ok
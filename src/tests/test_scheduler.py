@@ -0,0 +1,157 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from domain import models
+from infrastructure.job_store import JobStore
+from sync.diff import DiffSummary
+from sync.outcome import SyncOutcome
+from sync.scheduler import Scheduler, TimerHeap
+
+STORE = models.Store(
+    id="store-1",
+    name="테스트 매장",
+    bindings=[
+        models.CredentialBinding(platform=models.Platform.BAEMIN, shop_id="b-1", cred_ref="cred-b"),
+        models.CredentialBinding(platform=models.Platform.YOGIYO, shop_id="y-1", cred_ref="cred-y"),
+    ],
+)
+
+
+class _Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _RecordingOrchestrator:
+    def __init__(self) -> None:
+        self.deltas = []
+        self.pauses = []
+
+    def set_availability(self, store, availability, actor):
+        delta = models.UnifiedDelta(
+            toggled_items=dict(availability),
+            sold_out_items={item_id: not available for item_id, available in availability.items()},
+        )
+        result = models.ApplyResult(success=True, message="ok")
+        outcomes = []
+        for binding in store.bindings:
+            self.deltas.append((binding.platform, delta))
+            outcomes.append(SyncOutcome(binding.platform, True, DiffSummary([], [], []), result, []))
+        return outcomes
+
+    def toggle_pause(self, store, command, actor):
+        self.pauses.append((tuple(b.platform for b in store.bindings), command.paused))
+        return [models.ApplyResult(success=True, message="ok") for _ in store.bindings]
+
+
+def _at(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+def test_timer_heap_pops_in_deadline_order_and_skips_cancelled():
+    heap = TimerHeap()
+    heap.push("late", 30)
+    heap.push("early", 10)
+    heap.push("cancelled", 5)
+    heap.discard("cancelled")
+
+    assert heap.next_due() == 10
+    assert heap.pop_due(20) == ["early"]
+    assert heap.pop_due(40) == ["late"]
+    assert len(heap) == 0
+
+
+def test_due_toggles_are_batched_into_one_delta_per_platform(tmp_path):
+    clock = _Clock(1_000)
+    orchestrator = _RecordingOrchestrator()
+    jobs = JobStore(tmp_path / "jobs.db")
+    patched = []
+    scheduler = Scheduler(
+        jobs, orchestrator, {STORE.id: STORE}.get, clock=clock, on_availability=lambda *args: patched.append(args)
+    )
+    scheduler.schedule(STORE.id, models.JobAction.SOLD_OUT, _at(1_010), item_ids=["m1", "m2"])
+    scheduler.schedule(STORE.id, models.JobAction.RESTOCK, _at(1_020), item_ids=["m2"])
+    scheduler.schedule(STORE.id, models.JobAction.PAUSE, _at(5_000), platform=models.Platform.YOGIYO)
+
+    assert scheduler.run_due() == []
+    clock.now = 1_030
+    fired = scheduler.run_due()
+
+    assert len(fired) == 1 and fired[0].success
+    assert [platform for platform, _ in orchestrator.deltas] == [models.Platform.BAEMIN, models.Platform.YOGIYO]
+    assert orchestrator.deltas[0][1].sold_out_items == {"m1": True, "m2": False}
+    assert patched == [(STORE.id, {"m1": False, "m2": True})]
+    assert [job.action for job in jobs.pending()] == [models.JobAction.PAUSE]
+
+
+def test_pending_jobs_survive_a_restart(tmp_path):
+    clock = _Clock(1_000)
+    jobs = JobStore(tmp_path / "jobs.db")
+    Scheduler(jobs, _RecordingOrchestrator(), {STORE.id: STORE}.get, clock=clock).schedule(
+        STORE.id, models.JobAction.RESUME, _at(1_100), platform=models.Platform.BAEMIN
+    )
+
+    orchestrator = _RecordingOrchestrator()
+    restarted = Scheduler(JobStore(tmp_path / "jobs.db"), orchestrator, {STORE.id: STORE}.get, clock=clock)
+    assert restarted.recover() == 1
+    assert restarted.recover() == 0
+    clock.now = 2_000
+    restarted.run_due()
+
+    assert orchestrator.pauses == [((models.Platform.BAEMIN,), False)]
+    assert jobs.pending() == []
+
+
+def test_batch_that_raises_is_requeued_and_retried(tmp_path):
+    class _FlakyOrchestrator(_RecordingOrchestrator):
+        def toggle_pause(self, store, command, actor):
+            if not self.pauses:
+                self.pauses.append(None)
+                raise ConnectionError("portal unreachable")
+            return super().toggle_pause(store, command, actor)
+
+    clock = _Clock(1_000)
+    jobs = JobStore(tmp_path / "jobs.db")
+    orchestrator = _FlakyOrchestrator()
+    scheduler = Scheduler(jobs, orchestrator, {STORE.id: STORE}.get, clock=clock, retry_delay=60)
+    scheduler.schedule(STORE.id, models.JobAction.PAUSE, _at(1_000))
+    scheduler.schedule(STORE.id, models.JobAction.SOLD_OUT, _at(1_000), item_ids=["m1"])
+
+    fired = scheduler.run_due()
+
+    assert [batch.success for batch in fired] == [False, True]
+    assert [job.action for job in jobs.pending()] == [models.JobAction.PAUSE]
+    assert scheduler.next_due() == 1_060
+    clock.now = 1_060
+    (retried,) = scheduler.run_due()
+    assert retried.success and jobs.pending() == []
+
+
+def test_claimed_jobs_are_not_requeued_and_honour_a_cancel_made_while_waiting(tmp_path):
+    clock = _Clock(1_000)
+    jobs = JobStore(tmp_path / "jobs.db")
+    orchestrator = _RecordingOrchestrator()
+    lock = threading.Lock()
+    scheduler = Scheduler(jobs, orchestrator, {STORE.id: STORE}.get, clock=clock, execution_lock=lock)
+    job = scheduler.schedule(STORE.id, models.JobAction.RESUME, _at(1_000), reason="auto-resume")
+
+    fired = []
+    with lock:
+        # A pause command holds the lock while the scheduler thread claims the due resume.
+        worker = threading.Thread(target=lambda: fired.extend(scheduler.run_due()))
+        worker.start()
+        deadline = time.monotonic() + 5
+        while jobs.pending() and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert scheduler.recover() == 0
+        assert scheduler.cancel_pending(STORE.id, models.JobAction.RESUME) == 1
+    worker.join(5)
+
+    assert fired == [] and orchestrator.pauses == []
+    with sqlite3.connect(tmp_path / "jobs.db") as conn:
+        assert conn.execute("SELECT status FROM scheduled_jobs WHERE id=?", (job.id,)).fetchone() == ("cancelled",)
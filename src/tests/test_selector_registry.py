@@ -0,0 +1,56 @@
+import json
+import os
+
+from connectors.registry import ConnectorRegistry
+from connectors.selectors import SelectorRegistry
+from domain import models
+
+
+def _write_selectors(directory, name, version, row="div[data-dow='{{dow}}']"):
+    payload = {
+        "meta": {"platform": name.split(".")[0].upper(), "version": version},
+        "hours": {"row": row, "breakRow": ".break:nth-child({{idx}}) input"},
+    }
+    path = directory / name
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    return path
+
+
+def test_resolves_channels_and_renders_compiled_templates(tmp_path):
+    _write_selectors(tmp_path, "baemin.v2025-10-08.json", "v2025-10-08")
+    _write_selectors(tmp_path, "baemin.v2025-11-01.experimental.json", "v2025-11-01")
+    _write_selectors(tmp_path, "yogiyo.v2025-10-08.json", "v2025-10-08")
+
+    stable = SelectorRegistry(tmp_path, check_interval=0)
+    experimental = SelectorRegistry(tmp_path, channel="experimental", check_interval=0)
+
+    assert stable.get(models.Platform.BAEMIN).version == "v2025-10-08"
+    assert experimental.get(models.Platform.BAEMIN).version == "v2025-11-01"
+    assert stable.platforms() == [models.Platform.BAEMIN, models.Platform.YOGIYO]
+    selectors = stable.get(models.Platform.YOGIYO)
+    assert selectors.selector("hours.row", dow=3) == "div[data-dow='3']"
+    assert selectors.selector("hours.breakRow", idx=2) == ".break:nth-child(2) input"
+
+
+def test_connectors_are_lazy_and_hot_swap_selector_versions(tmp_path):
+    selectors_dir = tmp_path / "selectors"
+    selectors_dir.mkdir()
+    path = _write_selectors(selectors_dir, "baemin.v2025-10-08.json", "v2025-10-08")
+    _write_selectors(selectors_dir, "ceats.v2025-10-08.json", "v2025-10-08")
+    registry = SelectorRegistry(selectors_dir, check_interval=0)
+    connectors = ConnectorRegistry(registry, tmp_path / "state", platforms=[models.Platform.BAEMIN])
+
+    assert list(connectors) == [models.Platform.BAEMIN]
+    assert connectors.get(models.Platform.CEATS) is None
+    connector = connectors[models.Platform.BAEMIN]
+    assert list(connectors.built) == [models.Platform.BAEMIN]
+
+    _write_selectors(selectors_dir, "baemin.v2025-10-08.json", "v2025-10-08", row="li[data-day='{{dow}}']")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert connectors[models.Platform.BAEMIN] is connector
+    assert connector.selectors.selector("hours.row", dow=1) == "li[data-day='1']"
+
+    _write_selectors(selectors_dir, "baemin.v2025-10-15.json", "v2025-10-15")
+    assert registry.refresh() == [models.Platform.BAEMIN]
+    assert connectors[models.Platform.BAEMIN].selectors.version == "v2025-10-15"
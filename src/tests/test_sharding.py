@@ -0,0 +1,76 @@
+import os
+from functools import partial
+
+from conftest import RecordingConnector, baemin_store, build_orchestrator
+from domain import models
+from sync.metrics import MetricsRegistry
+from sync.sharding import ShardedSyncRunner, shard_for
+
+
+class _CrashingConnector(RecordingConnector):
+    def fetch_snapshot(self, session):
+        if session.shop_id == "shop-crash":
+            os._exit(1)
+        return super().fetch_snapshot(session)
+
+
+def _shard_orchestrator(shard, root):
+    connector = _CrashingConnector(broken={"shop-broken"})
+    return build_orchestrator(root / f"shard-{shard}", {connector.platform: connector}, metrics=MetricsRegistry())
+
+
+def test_sharded_sync_keeps_order_and_merges_worker_metrics(tmp_path):
+    fleet = []
+    for n in range(6):
+        store = baemin_store(f"store-{n}", f"shop-{n}")
+        items = [models.Item(id="item-1", store_id=store.id, category_id="c", name="메뉴", desc="", price=1000)]
+        fleet.append((store, items))
+    metrics = MetricsRegistry()
+
+    with ShardedSyncRunner(2, partial(_shard_orchestrator, root=tmp_path), metrics=metrics) as runner:
+        results, reports = runner.sync(fleet, actor="tester")
+
+    assert [store_id for store_id, _ in results] == [store.id for store, _ in fleet]
+    assert all(len(outcomes) == 1 and outcomes[0].applied for _, outcomes in results)
+    assert len({report.pid for report in reports}) == len(reports) == 2
+    for report in reports:
+        assert all(shard_for(store_id, 2) == report.shard for store_id, _ in report.outcomes)
+        assert (tmp_path / f"shard-{report.shard}" / "audit.log").exists()
+    assert 'baedal_sync_outcomes_total{operation="sync",platform="BAEMIN",result="applied"} 6' in metrics.render()
+
+
+def test_store_that_raises_fails_alone_and_other_outcomes_are_kept(tmp_path):
+    fleet = []
+    for shop_id in ("shop-0", "shop-broken", "shop-2", "shop-3"):
+        store = baemin_store(f"store-{shop_id}", shop_id)
+        fleet.append((store, [models.Item(id="item-1", store_id=store.id, category_id="c", name="메뉴", desc="", price=1000)]))
+    metrics = MetricsRegistry()
+
+    with ShardedSyncRunner(2, partial(_shard_orchestrator, root=tmp_path), metrics=metrics) as runner:
+        results, _ = runner.sync(fleet, actor="tester")
+
+    applied = {store_id: [outcome.applied for outcome in outcomes] for store_id, outcomes in results}
+    assert applied == {"store-shop-0": [True], "store-shop-broken": [False], "store-shop-2": [True], "store-shop-3": [True]}
+    assert "RuntimeError: portal layout changed" in dict(results)["store-shop-broken"][0].result.message
+    assert 'result="applied"} 3' in metrics.render()
+
+
+def test_dead_worker_fails_its_shard_and_is_replaced(tmp_path):
+    def fleet(shop_ids):
+        entries = []
+        for shop_id in shop_ids:
+            store = baemin_store(f"store-{shop_id}", shop_id)
+            entries.append((store, [models.Item(id="item-1", store_id=store.id, category_id="c", name="메뉴", desc="", price=1000)]))
+        return entries
+
+    shop_ids = ["shop-0", "shop-4", "shop-5", "shop-crash"]
+    with ShardedSyncRunner(2, partial(_shard_orchestrator, root=tmp_path)) as runner:
+        crashed, _ = runner.sync(fleet(shop_ids), actor="tester")
+        again, _ = runner.sync(fleet(shop_ids[:-1]), actor="tester")
+
+    dead_shard = shard_for("store-shop-crash", 2)
+    applied = {store_id: outcomes[0].applied for store_id, outcomes in crashed}
+    assert applied == {store_id: shard_for(store_id, 2) != dead_shard for store_id in applied}
+    assert set(applied.values()) == {True, False}
+    assert "BrokenProcessPool" in dict(crashed)["store-shop-crash"][0].result.message
+    assert all(outcomes[0].applied for _, outcomes in again)
@@ -0,0 +1,38 @@
+import dataclasses
+
+from conftest import baemin_store
+from connectors.base import FileBackedConnector, SelectorMap
+from domain import models
+
+
+class _CountingConnector(FileBackedConnector):
+    fetches = 0
+
+    def fetch_snapshot(self, session):
+        self.fetches += 1
+        return super().fetch_snapshot(session)
+
+
+def test_back_to_back_syncs_reuse_snapshot_until_portal_changes(tmp_path, make_orchestrator):
+    selectors = SelectorMap(platform=models.Platform.BAEMIN, version="v-test", payload={})
+    connector = _CountingConnector(models.Platform.BAEMIN, selectors, tmp_path / "state")
+    orchestrator = make_orchestrator(connector, snapshot_ttl=600)
+    store = baemin_store("store-1", "shop-1")
+    items = [models.Item(id=f"item-{n}", store_id=store.id, category_id="c", name=f"메뉴 {n}", desc="", price=1000) for n in range(3)]
+
+    orchestrator.sync_store(store, items, actor="t")
+    items[1] = dataclasses.replace(items[1], price=1500)
+    (second,) = orchestrator.sync_store(store, items, actor="t")
+    (third,) = orchestrator.sync_store(store, items, actor="t")
+
+    assert connector.fetches == 1
+    assert second.summary.price_changed == [("item-1", 1000, 1500)]
+    assert third.summary.price_changed == [] and third.summary.updated == []
+
+    # An edit made outside this orchestrator changes the version stamp and forces a re-read.
+    session = connector.login(store.bindings[0], "owner", "pw")
+    connector.apply_changes(session, models.UnifiedDelta(price_updates={"item-2": 500}))
+    (fourth,) = orchestrator.sync_store(store, items, actor="t")
+
+    assert connector.fetches == 2
+    assert fourth.summary.price_changed == [("item-2", 500, 1000)]
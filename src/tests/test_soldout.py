@@ -0,0 +1,54 @@
+import threading
+
+from domain import models
+
+PLATFORMS = [models.Platform.BAEMIN, models.Platform.YOGIYO, models.Platform.CEATS]
+
+
+class _SlowConnector:
+    """Applies deltas only once every platform is in flight, proving they run concurrently."""
+
+    def __init__(self, platform, barrier):
+        self.platform = platform
+        self.barrier = barrier
+        self.deltas = []
+
+    def login(self, credential, username, password):
+        return models.AuthSession(platform=self.platform, shop_id=credential.shop_id, token="t", selector_version="v")
+
+    def fetch_snapshot(self, session):
+        raise AssertionError("the sold-out fast path must not fetch remote snapshots")
+
+    def apply_changes(self, session, delta):
+        self.barrier.wait(timeout=5)
+        self.deltas.append(delta)
+        return models.ApplyResult(success=True, message="ok")
+
+
+def test_sold_out_patches_catalog_rows_and_updates_platforms_in_parallel(make_orchestrator):
+    store = models.Store(
+        id="store-1",
+        name="테스트 매장",
+        bindings=[models.CredentialBinding(platform=p, shop_id=f"{p.value}-1", cred_ref="cred") for p in PLATFORMS],
+    )
+    items = [models.Item(id=f"item-{i}", store_id=store.id, category_id="c", name="메뉴", desc="", price=1000) for i in range(50)]
+    barrier = threading.Barrier(len(PLATFORMS))
+    connectors = {platform: _SlowConnector(platform, barrier) for platform in PLATFORMS}
+    orchestrator = make_orchestrator(connectors)
+    catalog = orchestrator.catalog
+    catalog.save_snapshot(
+        models.PlatformSnapshot(
+            platform=models.Platform.BAEMIN, store_id=store.id, items=items, hours=[], state=models.StoreState(store_id=store.id)
+        )
+    )
+
+    outcomes = orchestrator.set_sold_out(store, ["item-3", "item-7"], True, actor="tester")
+
+    assert [outcome.platform for outcome in outcomes] == PLATFORMS
+    assert all(outcome.applied for outcome in outcomes)
+    assert all(set(outcome.timings) == {"login", "apply", "audit"} for outcome in outcomes)
+    assert connectors[models.Platform.CEATS].deltas[0].sold_out_items == {"item-3": True, "item-7": True}
+    stored = catalog.load_snapshot(store.id)
+    assert stored is not None
+    assert [item.id for item in stored.items if not item.available] == ["item-3", "item-7"]
+    assert [item.id for item in stored.items][:3] == ["item-0", "item-1", "item-2"]
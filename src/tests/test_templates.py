@@ -0,0 +1,90 @@
+import dataclasses
+
+from app.bootstrap import Fleet, seed_fleet
+from conftest import baemin_store
+from domain import models
+from domain.templates import ResolvedCatalog
+from infrastructure.catalog_repository import CatalogRepository
+
+
+def _item(n, price=1000, store_id="franchise"):
+    return models.Item(id=f"item-{n}", store_id=store_id, category_id="c", name=f"메뉴 {n}", desc="", price=price)
+
+
+def _snapshot(store_id, items):
+    return models.PlatformSnapshot(models.Platform.BAEMIN, store_id, items, [], models.StoreState(store_id=store_id))
+
+
+def test_linked_store_saves_only_overrides(tmp_path):
+    catalog = CatalogRepository(tmp_path / "catalog.db")
+    catalog.save_template(models.CatalogTemplate(id="franchise", name="본사 메뉴", items=[_item(n) for n in range(3)]))
+    catalog.link_store(models.StoreOverrides(store_id="s", template_id="franchise"))
+
+    edited = [_item(0, store_id="s"), _item(1, price=1500, store_id="s"), _item(9, store_id="s")]
+    catalog.save_snapshot(_snapshot("s", edited))
+
+    overrides = catalog.load_overrides("s")
+    assert overrides.overrides == {"item-1": models.ItemOverride(price=1500)}
+    assert [item.id for item in overrides.extra_items] == ["item-9"]
+    assert overrides.removed == ["item-2"]
+    assert [(item.id, item.price) for item in catalog.load_snapshot("s").items] == [
+        ("item-0", 1000),
+        ("item-1", 1500),
+        ("item-9", 1000),
+    ]
+
+
+def test_propagate_template_diffs_once_per_override_group(connector, make_orchestrator):
+    orchestrator = make_orchestrator(connector)
+    catalog = orchestrator.catalog
+    catalog.save_template(models.CatalogTemplate(id="franchise", name="본사 메뉴", items=[_item(n) for n in range(3)]))
+    links = [
+        models.StoreOverrides(store_id="plain-a", template_id="franchise"),
+        models.StoreOverrides(store_id="plain-b", template_id="franchise"),
+        models.StoreOverrides(store_id="pricey", template_id="franchise", overrides={"item-1": models.ItemOverride(price=1200)}),
+        models.StoreOverrides(store_id="extra", template_id="franchise", extra_items=[_item(9, store_id="extra")]),
+    ]
+    stores = {}
+    for overrides in links:
+        catalog.link_store(overrides)
+        stores[overrides.store_id] = baemin_store(overrides.store_id)
+
+    edited = [_item(0), _item(1, price=1100), _item(2)]
+    rollout = orchestrator.propagate_template(
+        models.CatalogTemplate(id="franchise", name="본사 메뉴", items=edited), stores, actor="hq"
+    )
+
+    # Propagation diffs against the catalog, never against portal snapshots.
+    assert connector.fetches == 0
+    assert rollout.changed_items == ["item-1"]
+    assert (rollout.groups, rollout.diffs) == (3, 3)
+    deltas = dict(connector.deltas)
+    assert deltas["plain-a"].price_updates == {"item-1": 1100}
+    assert deltas["extra"].price_updates == {"item-1": 1100}
+    # The store-level price override still wins, so there is nothing to push there.
+    assert "pricey" not in deltas
+    assert [item.price for item in rollout.resolved["pricey"]] == [1000, 1200, 1000]
+    assert catalog.pending("scheduled").stores.keys() == {"plain-a", "plain-b", "pricey", "extra"}
+    assert dataclasses.replace(catalog.load_snapshot("plain-b").items[1], store_id="franchise") == edited[1]
+
+
+def test_reseeding_fleet_keeps_catalog_rollouts_and_edits(tmp_path):
+    catalog = CatalogRepository(tmp_path / "catalog.db")
+    template = models.CatalogTemplate(id="franchise", name="본사 메뉴", items=[_item(0)])
+    link = models.StoreOverrides(store_id="s", template_id="franchise")
+    store = models.Store(id="s", name="매장")
+
+    def fleet():
+        return Fleet(stores=[(store, ResolvedCatalog(template, link))], templates=[template], links=[link])
+
+    seed_fleet(catalog, fleet())
+    catalog.save_template(models.CatalogTemplate(id="franchise", name="본사 메뉴", items=[_item(0, price=2000)]))
+    catalog.set_availability("s", {"item-0": False})
+    catalog.advance("console", catalog.pending("console").until)
+
+    restarted = fleet()
+    seed_fleet(catalog, restarted)
+
+    assert [(item.price, item.available) for item in catalog.load_snapshot("s").items] == [(2000, False)]
+    assert [(item.price, item.available) for item in restarted.stores[0][1]] == [(2000, False)]
+    assert catalog.pending("console").stores == {}